@@ -7,14 +7,20 @@ from pathlib import Path
 BASE_DIR = Path(__file__).resolve().parent.parent
 sys.path.append(str(BASE_DIR))
 
-# Устанавливаем настройки Django
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings.production')
+# Устанавливаем настройки Django (облегченный профиль для холодного старта)
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings.serverless')
 
 import django
+from django.conf import settings
 from django.core.wsgi import get_wsgi_application
 
 # Инициализируем Django
 django.setup()
 
 # Получаем WSGI приложение
-app = get_wsgi_application()
\ No newline at end of file
+app = get_wsgi_application()
+
+# Прогрев маршрутов на загрузке функции, а не на первом запросе
+if getattr(settings, 'PRECOMPILE_URLS', False):
+    from config.boot import warm_up
+    warm_up()
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-18 16:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="userprofile",
+            name="avatar_renditions",
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
@@ -22,6 +22,7 @@ class UserProfile(TimeStampedModel):
     ], verbose_name=_('Language'))
     
     avatar = models.ImageField(upload_to=get_image_upload_path, blank=True, null=True, verbose_name=_('Avatar'))
+    avatar_renditions = models.JSONField(default=dict, blank=True, editable=False)
     phone = models.CharField(max_length=20, blank=True, verbose_name=_('Phone'))
     website = models.URLField(blank=True, verbose_name=_('Website'))
     
@@ -1,7 +1,10 @@
 from rest_framework import serializers
+from apps.core.images import ImageRenditionsField
 from .models import UserProfile
 
 class UserProfileSerializer(serializers.ModelSerializer):
+    avatar_renditions = ImageRenditionsField()
+
     class Meta:
         model = UserProfile
         fields = '__all__'
@@ -0,0 +1,257 @@
+import json
+import logging
+import threading
+import time
+import uuid
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import PageView, Event, Visitor, VisitorSession
+
+logger = logging.getLogger(__name__)
+
+PAGE_VIEW_FIELDS = [
+    'path', 'query_params', 'ip_address', 'user_agent', 'referrer', 'language',
+    'session_id', 'visitor_id', 'duration', 'is_bot', 'is_mobile', 'country', 'city',
+]
+EVENT_FIELDS = [
+    'name', 'category', 'data', 'ip_address', 'user_agent', 'session_id', 'visitor_id', 'path',
+]
+
+
+class MemoryQueue:
+    """Очередь записей в памяти процесса"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._records = []
+
+    def push(self, records):
+        with self._lock:
+            self._records.extend(records)
+            return len(self._records)
+
+    def drain(self):
+        """Забрать накопленное: (метка для ack/restore, записи)"""
+        with self._lock:
+            records, self._records = self._records, []
+        return None, records
+
+    def ack(self, token):
+        """Пачка записана в БД - в памяти держать нечего"""
+
+    def restore(self, token, records):
+        """Запись не удалась - возвращаем пачку в очередь"""
+        with self._lock:
+            self._records[:0] = records
+
+
+class RedisQueue:
+    """Очередь записей в Redis (общая для всех воркеров)"""
+    LIST_KEY = 'analytics:queue'
+
+    def __init__(self, url):
+        import redis
+        self._redis = redis.Redis.from_url(url)
+
+    def push(self, records):
+        return int(self._redis.rpush(self.LIST_KEY, *[json.dumps(record) for record in records]))
+
+    def drain(self):
+        """Забранный список удаляется только после коммита (ack), при ошибке - возвращается (restore)"""
+        import redis
+        flushing_key = f'{self.LIST_KEY}:flushing:{uuid.uuid4().hex}'
+        try:
+            self._redis.rename(self.LIST_KEY, flushing_key)
+        except redis.ResponseError:
+            return None, []
+        records = self._redis.lrange(flushing_key, 0, -1)
+        return flushing_key, [json.loads(record) for record in records]
+
+    def ack(self, token):
+        if token:
+            self._redis.delete(token)
+
+    def restore(self, token, records):
+        pipe = self._redis.pipeline()
+        pipe.lpush(self.LIST_KEY, *[json.dumps(record) for record in reversed(records)])
+        if token:
+            pipe.delete(token)
+        pipe.execute()
+
+
+class AnalyticsIngestor:
+    """
+    Принимает пачки просмотров и событий, копит их в очереди
+    и записывает через bulk_create по порогу размера или времени.
+    ANALYTICS_QUEUE_BACKEND: redis - общая очередь воркеров; direct - запись пачки
+    запроса сразу (без Redis: очередь в памяти serverless-функции теряется при ее
+    остановке, а flush_analytics из другого процесса ее не видит); memory - только разработка
+    """
+
+    def __init__(self):
+        self._queue = None
+        self._last_flush = time.monotonic()
+
+    @property
+    def backend(self):
+        return getattr(settings, 'ANALYTICS_QUEUE_BACKEND', 'direct')
+
+    @property
+    def queue(self):
+        if self._queue is None:
+            if self.backend == 'redis':
+                self._queue = RedisQueue(settings.ANALYTICS_QUEUE_REDIS_URL)
+            else:
+                self._queue = MemoryQueue()
+        return self._queue
+
+    def enqueue(self, page_views=(), events=()):
+        """Поставить записи в очередь; при достижении порога - сразу записать"""
+        received_at = timezone.now().isoformat()
+        records = [
+            {**record, 'kind': 'page_view', 'received_at': received_at} for record in page_views
+        ] + [
+            {**record, 'kind': 'event', 'received_at': received_at} for record in events
+        ]
+        if not records:
+            return 0
+        if self.backend == 'direct':
+            self.write(records)
+            return len(records)
+
+        queued = self.queue.push(records)
+        interval = getattr(settings, 'ANALYTICS_FLUSH_INTERVAL', 10)
+        if queued >= settings.ANALYTICS_BATCH_SIZE or time.monotonic() - self._last_flush >= interval:
+            self.flush()
+        return len(records)
+
+    def flush(self):
+        """
+        Записать все накопленное. Очередь подтверждается только после коммита;
+        ошибка БД возвращает пачку в очередь - следующий сброс повторит ее
+        """
+        self._last_flush = time.monotonic()
+        if self.backend == 'direct':
+            return 0
+        token, records = self.queue.drain()
+        if not records:
+            return 0
+        try:
+            self.write(records)
+        except Exception:
+            self.queue.restore(token, records)
+            raise
+        self.queue.ack(token)
+        return len(records)
+
+    def write(self, records):
+        """bulk_create просмотров и событий + пакетный upsert посетителей и сессий, одной транзакцией"""
+        page_views = [record for record in records if record['kind'] == 'page_view']
+        events = [record for record in records if record['kind'] == 'event']
+        batch_size = settings.ANALYTICS_BATCH_SIZE
+        with transaction.atomic():
+            PageView.objects.bulk_create(
+                [PageView(**{field: record[field] for field in PAGE_VIEW_FIELDS if field in record}) for record in page_views],
+                batch_size=batch_size,
+            )
+            Event.objects.bulk_create(
+                [Event(**{field: record[field] for field in EVENT_FIELDS if field in record}) for record in events],
+                batch_size=batch_size,
+            )
+            self.upsert_visitors(page_views)
+
+        logger.info(f"Flushed analytics batch: {len(page_views)} page views, {len(events)} events")
+
+    def upsert_visitors(self, page_views):
+        """Обновить счетчики Visitor/VisitorSession пачкой, а не по строке на каждый просмотр"""
+        sessions = defaultdict(list)
+        for record in page_views:
+            if record.get('visitor_id') and record.get('session_id'):
+                sessions[record['session_id']].append(record)
+        if not sessions:
+            return
+
+        now = timezone.now()
+        existing_sessions = VisitorSession.objects.in_bulk(list(sessions), field_name='session_id')
+        new_sessions = {key: views for key, views in sessions.items() if key not in existing_sessions}
+
+        # Посетители: новые создаем, у существующих добавляем визиты (по числу новых сессий)
+        new_visits = defaultdict(int)
+        first_views = {}
+        for views in new_sessions.values():
+            new_visits[views[0]['visitor_id']] += 1
+        for views in sessions.values():
+            first_views.setdefault(views[0]['visitor_id'], views[0])
+
+        visitors = Visitor.objects.in_bulk(list(first_views), field_name='visitor_id')
+        to_create = []
+        for visitor_id, view in first_views.items():
+            if visitor_id not in visitors:
+                to_create.append(Visitor(
+                    visitor_id=visitor_id,
+                    visits_count=max(new_visits[visitor_id], 1),
+                    ip_address=view.get('ip_address'),
+                    user_agent=view.get('user_agent', ''),
+                    country=view.get('country', ''),
+                    city=view.get('city', ''),
+                    language=view.get('language', ''),
+                    referrer=view.get('referrer', ''),
+                    is_bot=view.get('is_bot', False),
+                ))
+        Visitor.objects.bulk_create(to_create, ignore_conflicts=True)
+
+        to_update = []
+        for visitor_id, visitor in visitors.items():
+            visitor.visits_count = F('visits_count') + new_visits[visitor_id]
+            visitor.last_visit_at = now
+            to_update.append(visitor)
+        Visitor.objects.bulk_update(to_update, ['visits_count', 'last_visit_at'])
+
+        # Сессии: новые создаем целиком, у существующих двигаем счетчики и страницу выхода
+        if new_sessions:
+            visitor_pks = dict(
+                Visitor.objects.filter(visitor_id__in=list(first_views)).values_list('visitor_id', 'pk')
+            )
+            VisitorSession.objects.bulk_create([
+                VisitorSession(
+                    visitor_id=visitor_pks[views[0]['visitor_id']],
+                    session_id=session_id,
+                    end_time=self._viewed_at(views[-1]),
+                    ip_address=views[0].get('ip_address'),
+                    user_agent=views[0].get('user_agent', ''),
+                    entry_page=views[0].get('path', ''),
+                    exit_page=views[-1].get('path', ''),
+                    pages_viewed=len(views),
+                    referrer=views[0].get('referrer', ''),
+                    is_bounce=len(views) <= 1,
+                    duration=sum(view.get('duration', 0) for view in views),
+                )
+                for session_id, views in new_sessions.items()
+                if views[0]['visitor_id'] in visitor_pks
+            ], ignore_conflicts=True)
+
+        to_update = []
+        for session_id, session in existing_sessions.items():
+            views = sessions[session_id]
+            session.pages_viewed = F('pages_viewed') + len(views)
+            session.exit_page = views[-1].get('path', '')
+            session.end_time = self._viewed_at(views[-1])
+            session.duration = F('duration') + sum(view.get('duration', 0) for view in views)
+            session.is_bounce = False
+            to_update.append(session)
+        VisitorSession.objects.bulk_update(
+            to_update, ['pages_viewed', 'exit_page', 'end_time', 'duration', 'is_bounce']
+        )
+
+    @staticmethod
+    def _viewed_at(record):
+        return parse_datetime(record['received_at'])
+
+
+ingestor = AnalyticsIngestor()
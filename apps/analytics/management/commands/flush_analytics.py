@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from apps.analytics.ingestion import ingestor
+
+
+class Command(BaseCommand):
+    help = 'Записывает очередь просмотров и событий в БД через bulk_create'
+
+    def handle(self, *args, **options):
+        flushed = ingestor.flush()
+        self.stdout.write(self.style.SUCCESS(f'✅ Записано: {flushed}'))
@@ -0,0 +1,27 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from apps.analytics.rollup import rollup_range
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает DailyStatistics за дни из PageView и VisitorSession (идемпотентно)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--date', help='Последний день (YYYY-MM-DD), по умолчанию сегодня')
+        parser.add_argument('--days', type=int, default=1, help='Сколько дней назад от --date включить')
+
+    def handle(self, *args, **options):
+        last_day = parse_date(options['date']) if options['date'] else timezone.localdate()
+        if last_day is None:
+            raise CommandError('Неверный формат даты, ожидается YYYY-MM-DD')
+        first_day = last_day - timedelta(days=max(options['days'], 1) - 1)
+
+        for stats in rollup_range(first_day, last_day):
+            self.stdout.write(
+                f'📊 {stats.date}: {stats.page_views} просмотров, '
+                f'{stats.unique_visitors} уникальных, bounce {stats.bounce_rate}%'
+            )
+        self.stdout.write(self.style.SUCCESS('✅ Статистика обновлена'))
@@ -0,0 +1,64 @@
+# Generated by Django 4.2.7 on 2026-10-18 15:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("analytics", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(
+                fields=["-created_at"], name="analytics_event_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(
+                fields=["name", "-created_at"], name="analytics_event_name_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(
+                fields=["category", "-created_at"], name="analytics_event_category_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="pageview",
+            index=models.Index(fields=["-created_at"], name="analytics_pv_created_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="pageview",
+            index=models.Index(
+                fields=["path", "-created_at"], name="analytics_pv_path_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="pageview",
+            index=models.Index(
+                fields=["country", "-created_at"], name="analytics_pv_country_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="visitor",
+            index=models.Index(
+                fields=["-last_visit_at"], name="analytics_visitor_last_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="visitor",
+            index=models.Index(
+                fields=["first_visit_at"], name="analytics_visitor_first_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="visitorsession",
+            index=models.Index(
+                fields=["-start_time"], name="analytics_session_start_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 4.2.7 on 2026-10-18 16:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("analytics", "0003_hot_path_indexes"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="event",
+            name="analytics_event_created_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="pageview",
+            name="analytics_pv_created_idx",
+        ),
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="analytics_event_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="pageview",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="analytics_pv_created_idx"
+            ),
+        ),
+    ]
@@ -29,6 +29,11 @@ class PageView(TimeStampedModel):
         verbose_name = _('Page View')
         verbose_name_plural = _('Page Views')
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='analytics_pv_created_idx'),
+            models.Index(fields=['path', '-created_at'], name='analytics_pv_path_idx'),
+            models.Index(fields=['country', '-created_at'], name='analytics_pv_country_idx'),
+        ]
 
     def __str__(self):
         return f"View of {self.path} at {self.created_at}"
@@ -53,6 +58,11 @@ class Event(TimeStampedModel):
         verbose_name = _('Event')
         verbose_name_plural = _('Events')
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='analytics_event_created_idx'),
+            models.Index(fields=['name', '-created_at'], name='analytics_event_name_idx'),
+            models.Index(fields=['category', '-created_at'], name='analytics_event_category_idx'),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.category}) at {self.created_at}"
@@ -87,6 +97,10 @@ class Visitor(TimeStampedModel):
         verbose_name = _('Visitor')
         verbose_name_plural = _('Visitors')
         ordering = ['-last_visit_at']
+        indexes = [
+            models.Index(fields=['-last_visit_at'], name='analytics_visitor_last_idx'),
+            models.Index(fields=['first_visit_at'], name='analytics_visitor_first_idx'),
+        ]
 
     def __str__(self):
         return f"Visitor {self.visitor_id} ({self.visits_count} visits)"
@@ -118,6 +132,9 @@ class VisitorSession(TimeStampedModel):
         verbose_name = _('Visitor Session')
         verbose_name_plural = _('Visitor Sessions')
         ordering = ['-start_time']
+        indexes = [
+            models.Index(fields=['-start_time'], name='analytics_session_start_idx'),
+        ]
 
     def __str__(self):
         return f"Session {self.session_id} for {self.visitor}"
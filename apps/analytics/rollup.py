@@ -0,0 +1,103 @@
+import logging
+import re
+from collections import Counter
+from datetime import datetime, time, timedelta
+
+from django.db import transaction
+from django.db.models import Avg, Count, Q
+from django.utils import timezone
+
+from .models import PageView, Visitor, VisitorSession, DailyStatistics
+
+logger = logging.getLogger(__name__)
+
+# Сколько позиций хранить в top_*
+TOP_LIMIT = 50
+
+BROWSERS = [
+    ('Edge', re.compile(r'Edg/')),
+    ('Opera', re.compile(r'OPR/|Opera')),
+    ('Chrome', re.compile(r'Chrome/|CriOS/')),
+    ('Firefox', re.compile(r'Firefox/|FxiOS/')),
+    ('Safari', re.compile(r'Safari/')),
+]
+
+
+def detect_browser(user_agent):
+    for name, pattern in BROWSERS:
+        if pattern.search(user_agent or ''):
+            return name
+    return 'Other'
+
+
+def day_bounds(day):
+    start = timezone.make_aware(datetime.combine(day, time.min))
+    return start, start + timedelta(days=1)
+
+
+def top_counts(grouped, key, limit=None):
+    """Результат GROUP BY -> {значение: количество}; пустые значения - 'unknown'"""
+    counts = Counter()
+    for row in grouped:
+        counts[row[key] or 'unknown'] += row['total']
+    return dict(counts.most_common(limit))
+
+
+def top_rows(views, key):
+    """TOP_LIMIT самых частых значений колонки - сортировка и срез в SQL"""
+    grouped = views.values(key).annotate(total=Count('id')).order_by('-total', key)[:TOP_LIMIT]
+    return top_counts(grouped, key, TOP_LIMIT)
+
+
+@transaction.atomic
+def rollup_day(day):
+    """
+    Пересчитывает DailyStatistics за день целиком, агрегатами в БД. Повторный запуск
+    идемпотентен: пачка PageView, закоммиченная позже (с меньшими id), попадет в следующий
+    пересчет, а top_* всегда считаются по всему дню, а не склеиваются из усеченных списков.
+    Вместо слияния с водяным знаком по id (как было в запросе) - ограниченный пересчет
+    каждого затронутого дня: работа не больше одного дня PageView
+    """
+    start, end = day_bounds(day)
+    # Блокируем строку дня: параллельные пересчеты не перезапишут друг друга вперемешку
+    stats, _ = DailyStatistics.objects.select_for_update().get_or_create(date=day)
+
+    views = PageView.objects.filter(created_at__gte=start, created_at__lt=end, is_bot=False).order_by()
+    stats.page_views = views.count()
+    stats.unique_visitors = views.exclude(visitor_id='').values('visitor_id').distinct().count()
+    stats.top_pages = top_rows(views, 'path')
+    stats.top_referrers = top_rows(views.exclude(referrer=''), 'referrer')
+    stats.countries = top_rows(views, 'country')
+
+    devices = Counter()
+    for row in views.values('is_mobile').annotate(total=Count('id')):
+        devices['mobile' if row['is_mobile'] else 'desktop'] += row['total']
+    stats.devices = dict(devices)
+
+    browsers = Counter()
+    for row in views.values('user_agent').annotate(total=Count('id')):
+        browsers[detect_browser(row['user_agent'])] += row['total']
+    stats.browsers = dict(browsers)
+
+    sessions = VisitorSession.objects.filter(start_time__gte=start, start_time__lt=end).aggregate(
+        total=Count('id'),
+        bounces=Count('id', filter=Q(is_bounce=True)),
+        avg_duration=Avg('duration'),
+    )
+    stats.avg_session_duration = int(sessions['avg_duration'] or 0)
+    stats.bounce_rate = round(sessions['bounces'] / sessions['total'] * 100, 2) if sessions['total'] else 0.0
+    stats.new_visitors = Visitor.objects.filter(first_visit_at__gte=start, first_visit_at__lt=end).count()
+
+    stats.save()
+    logger.info(f"Daily statistics for {day} rolled up: {stats.page_views} page views")
+    return stats
+
+
+def rollup_range(first_day, last_day):
+    """Пересчитать дни включительно"""
+    day = first_day
+    results = []
+    while day <= last_day:
+        results.append(rollup_day(day))
+        day += timedelta(days=1)
+    return results
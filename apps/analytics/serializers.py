@@ -25,3 +25,26 @@ class DailyStatisticsSerializer(serializers.ModelSerializer):
     class Meta:
         model = DailyStatistics
         fields = '__all__'
+
+
+class PageViewIngestSerializer(serializers.ModelSerializer):
+    """Просмотр страницы от фронтенда (IP, User-Agent и геоданные берутся из запроса)"""
+    class Meta:
+        model = PageView
+        fields = [
+            'path', 'query_params', 'referrer', 'language', 'session_id', 'visitor_id',
+            'duration', 'is_mobile',
+        ]
+
+
+class EventIngestSerializer(serializers.ModelSerializer):
+    """Событие от фронтенда"""
+    class Meta:
+        model = Event
+        fields = ['name', 'category', 'data', 'session_id', 'visitor_id', 'path']
+
+
+class CollectSerializer(serializers.Serializer):
+    """Пачка просмотров и событий в одном запросе"""
+    page_views = PageViewIngestSerializer(many=True, required=False, max_length=100)
+    events = EventIngestSerializer(many=True, required=False, max_length=100)
@@ -0,0 +1,20 @@
+from datetime import timedelta
+
+from celery import shared_task
+from django.utils import timezone
+
+from .ingestion import ingestor
+from .rollup import rollup_range
+
+
+@shared_task
+def flush_analytics():
+    """Периодически записывает очередь аналитики в БД"""
+    return ingestor.flush()
+
+
+@shared_task
+def rollup_daily_statistics():
+    """Пересчитывает статистику за сегодня и вчера (поздние записи попадают во вчерашний день)"""
+    today = timezone.localdate()
+    rollup_range(today - timedelta(days=1), today)
@@ -1,3 +1,150 @@
-from django.test import TestCase
+import base64
+import json
+from datetime import timedelta
+from unittest.mock import patch
 
-# Create your tests here.
+from django.core.cache import cache
+from django.db import DatabaseError, connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+from apps.core.site_config import refresh_site_config
+from .ingestion import AnalyticsIngestor
+from .rollup import rollup_day
+from .models import DailyStatistics, Event, PageView, Visitor, VisitorSession
+from .views import CollectRateThrottle
+
+
+class KeysetPaginationTest(TestCase):
+    """Страницы просмотров идут по курсору (created_at, id) без COUNT и OFFSET"""
+
+    def setUp(self):
+        self.client = APIClient(HTTP_HOST='localhost')
+        PageView.objects.bulk_create([PageView(path=f'/page-{number}') for number in range(7)])
+        # Одинаковое время у части строк: порядок должен держаться на id
+        same_time = timezone.now() - timedelta(hours=1)
+        PageView.objects.filter(path__in=['/page-2', '/page-3', '/page-4']).update(created_at=same_time)
+        # Снимок настроек процесса (режим обслуживания) - заранее, вне подсчета запросов
+        refresh_site_config()
+
+    def get(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_pages_cover_all_rows_once(self):
+        expected = list(PageView.objects.order_by('-created_at', '-id').values_list('id', flat=True))
+        url, seen = '/api/analytics/page-views/?page_size=3', []
+        while url:
+            with CaptureQueriesContext(connection) as queries:
+                page = self.get(url)
+            self.assertEqual(len(queries), 1)
+            self.assertNotIn('count', page)
+            seen += [row['id'] for row in page['results']]
+            url = page['next']
+        self.assertEqual(seen, expected)
+
+    def test_previous_returns_same_rows(self):
+        first = self.get('/api/analytics/page-views/?page_size=3')
+        second = self.get(first['next'])
+        back = self.get(second['previous'])
+        self.assertEqual(back['results'], first['results'])
+        self.assertIsNone(back['previous'])
+
+    def test_count_is_opt_in(self):
+        page = self.get('/api/analytics/page-views/?with_count=true')
+        self.assertEqual(page['count'], 7)
+
+    def test_invalid_cursor(self):
+        response = self.client.get('/api/analytics/page-views/?cursor=garbage')
+        self.assertEqual(response.status_code, 404)
+
+    def test_cursor_with_wrong_value_types(self):
+        for position in ([123, 1], [{}, 1], ['2024-01-01T00:00:00', 'x']):
+            cursor = base64.urlsafe_b64encode(json.dumps({'p': position, 'r': 0}).encode()).decode()
+            response = self.client.get(f'/api/analytics/page-views/?cursor={cursor}')
+            self.assertEqual(response.status_code, 404, position)
+
+
+class CollectTest(TestCase):
+    """Прием пачек: upsert посетителей и сессий, геоданные от прокси, ограничение частоты"""
+
+    def setUp(self):
+        self.client = APIClient(HTTP_HOST='localhost')
+        cache.clear()
+        refresh_site_config()
+
+    def collect(self, views, events=(), **headers):
+        return self.client.post('/api/analytics/collect/', {'page_views': views, 'events': list(events)},
+                                format='json', **headers)
+
+    def view(self, path, session='s1', visitor='v1'):
+        return {'path': path, 'session_id': session, 'visitor_id': visitor, 'duration': 5, 'country': 'XX'}
+
+    @override_settings(ANALYTICS_QUEUE_BACKEND='direct')
+    def test_batches_upsert_visitors_and_sessions(self):
+        response = self.collect([self.view('/'), self.view('/blog/')], [{'name': 'click', 'session_id': 's1'}],
+                                HTTP_X_VERCEL_IP_COUNTRY='IL', HTTP_X_VERCEL_IP_CITY='Tel%20Aviv')
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(PageView.objects.count(), 2)
+        self.assertEqual(Event.objects.count(), 1)
+        # Страна - из заголовка прокси, а не из тела
+        self.assertEqual(set(PageView.objects.values_list('country', 'city')), {('IL', 'Tel Aviv')})
+        session = VisitorSession.objects.get()
+        self.assertEqual((session.pages_viewed, session.entry_page, session.exit_page), (2, '/', '/blog/'))
+        self.assertTrue(Visitor.objects.filter(visitor_id='v1', visits_count=1).exists())
+
+        self.collect([self.view('/projects/')])
+        self.collect([self.view('/', session='s2')])
+        session.refresh_from_db()
+        self.assertEqual((session.pages_viewed, session.exit_page, session.is_bounce), (3, '/projects/', False))
+        self.assertEqual(Visitor.objects.get().visits_count, 2)
+        self.assertTrue(VisitorSession.objects.get(session_id='s2').is_bounce)
+
+    @override_settings(ANALYTICS_QUEUE_BACKEND='memory', ANALYTICS_FLUSH_INTERVAL=3600, ANALYTICS_BATCH_SIZE=100)
+    def test_failed_flush_requeues_batch(self):
+        ingestor = AnalyticsIngestor()
+        ingestor.enqueue(page_views=[self.view('/')])
+        with patch.object(AnalyticsIngestor, 'upsert_visitors', side_effect=DatabaseError), \
+                self.assertRaises(DatabaseError):
+            ingestor.flush()
+        self.assertEqual(PageView.objects.count(), 0)
+        self.assertEqual(ingestor.flush(), 1)
+        self.assertEqual(PageView.objects.count(), 1)
+
+    @override_settings(ANALYTICS_QUEUE_BACKEND='direct')
+    def test_collect_is_throttled(self):
+        with patch.object(CollectRateThrottle, 'THROTTLE_RATES', {'analytics_collect': '2/min'}):
+            statuses = [self.collect([self.view('/')]).status_code for _ in range(3)]
+        self.assertEqual(statuses, [202, 202, 429])
+
+
+class RollupTest(TestCase):
+    """Пересчет дня идемпотентен и учитывает строки, закоммиченные после предыдущего запуска"""
+
+    def views(self, *paths, visitor='v1'):
+        PageView.objects.bulk_create([PageView(path=path, visitor_id=visitor) for path in paths])
+
+    def test_rerun_counts_late_rows_without_double_counting(self):
+        today = timezone.localdate()
+        self.views('/', '/', '/blog/')
+        rollup_day(today)
+        # Пачка, закоммиченная после первого пересчета (в т.ч. с меньшими id), и бот
+        self.views('/blog/', '/blog/', '/projects/', visitor='v2')
+        PageView.objects.bulk_create([PageView(path='/', is_bot=True)])
+        rollup_day(today)
+        stats = rollup_day(today)
+
+        self.assertEqual(DailyStatistics.objects.count(), 1)
+        self.assertEqual((stats.page_views, stats.unique_visitors), (6, 2))
+        self.assertEqual(stats.top_pages, {'/blog/': 3, '/': 2, '/projects/': 1})
+        self.assertEqual(stats.devices, {'desktop': 6})
+
+    @patch('apps.analytics.rollup.TOP_LIMIT', 1)
+    def test_top_lists_are_not_merged_from_truncated_runs(self):
+        today = timezone.localdate()
+        self.views('/', '/')
+        rollup_day(today)
+        self.views('/blog/', '/blog/', '/blog/')
+        self.assertEqual(rollup_day(today).top_pages, {'/blog/': 3})
@@ -10,5 +10,6 @@ router.register(r'sessions', views.VisitorSessionViewSet)
 router.register(r'daily-stats', views.DailyStatisticsViewSet)
 
 urlpatterns = [
+    path('collect/', views.collect, name='analytics-collect'),
     path('', include(router.urls)),
 ]
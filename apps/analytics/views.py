@@ -1,12 +1,72 @@
-from rest_framework import viewsets
+import re
+from urllib.parse import unquote
+from django.conf import settings
+from rest_framework import viewsets, status
+from rest_framework.decorators import api_view, authentication_classes, permission_classes, throttle_classes
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.throttling import AnonRateThrottle
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import OrderingFilter
+from apps.core.pagination import KeysetPagination
+from .ingestion import ingestor
 from .models import PageView, Event, Visitor, VisitorSession, DailyStatistics
-from .serializers import PageViewSerializer, EventSerializer, VisitorSerializer, VisitorSessionSerializer, DailyStatisticsSerializer
+from .serializers import (
+    PageViewSerializer, EventSerializer, VisitorSerializer, VisitorSessionSerializer,
+    DailyStatisticsSerializer, CollectSerializer
+)
+
+BOT_RE = re.compile(r'bot|crawl|spider|slurp|preview|headless', re.IGNORECASE)
+
+
+def get_client_ip(request):
+    forwarded = request.META.get('HTTP_X_FORWARDED_FOR')
+    if forwarded:
+        return forwarded.split(',')[0].strip()
+    return request.META.get('REMOTE_ADDR')
+
+
+def get_client_location(request):
+    """Страна и город от прокси (Vercel кодирует город в URL-формате); клиентским значениям не верим"""
+    return {
+        'country': unquote(request.META.get(settings.ANALYTICS_COUNTRY_HEADER, ''))[:100],
+        'city': unquote(request.META.get(settings.ANALYTICS_CITY_HEADER, ''))[:100],
+    }
+
+
+class CollectRateThrottle(AnonRateThrottle):
+    scope = 'analytics_collect'
+
+
+@api_view(['POST'])
+@authentication_classes([])
+@permission_classes([AllowAny])
+@throttle_classes([CollectRateThrottle])
+def collect(request):
+    """Прием пачки просмотров и событий; запись в БД - пакетами из очереди"""
+    serializer = CollectSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+
+    user_agent = request.META.get('HTTP_USER_AGENT', '')[:500]
+    client = {
+        'ip_address': get_client_ip(request),
+        'user_agent': user_agent,
+        **get_client_location(request),
+    }
+    page_views = [
+        {**view, **client, 'is_bot': bool(BOT_RE.search(user_agent))}
+        for view in serializer.validated_data.get('page_views', [])
+    ]
+    events = [{**event, **client} for event in serializer.validated_data.get('events', [])]
+
+    accepted = ingestor.enqueue(page_views=page_views, events=events)
+    return Response({'accepted': accepted}, status=status.HTTP_202_ACCEPTED)
+
 
 class PageViewViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = PageView.objects.all()
     serializer_class = PageViewSerializer
+    pagination_class = KeysetPagination
     filter_backends = [DjangoFilterBackend, OrderingFilter]
     filterset_fields = ['path', 'is_bot', 'is_mobile', 'country']
     ordering = ['-created_at']
@@ -14,6 +74,7 @@ class PageViewViewSet(viewsets.ReadOnlyModelViewSet):
 class EventViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = Event.objects.all()
     serializer_class = EventSerializer
+    pagination_class = KeysetPagination
     filter_backends = [DjangoFilterBackend, OrderingFilter]
     filterset_fields = ['name', 'category']
     ordering = ['-created_at']
@@ -0,0 +1,46 @@
+# Generated by Django 4.2.7 on 2026-10-18 15:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("blog", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(
+                condition=models.Q(("is_active", True), ("is_approved", True)),
+                fields=["post", "-created_at"],
+                name="blog_comment_approved_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(
+                condition=models.Q(("is_active", True), ("status", "published")),
+                fields=["-published_at"],
+                name="blog_post_published_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(
+                condition=models.Q(
+                    ("is_active", True), ("is_featured", True), ("status", "published")
+                ),
+                fields=["-published_at"],
+                name="blog_post_featured_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="subscription",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["language"],
+                name="blog_sub_active_lang_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 4.2.7 on 2026-10-18 16:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("blog", "0003_search_vectors"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="comment",
+            name="blog_comment_approved_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="post",
+            name="blog_post_published_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="post",
+            name="blog_post_featured_idx",
+        ),
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(
+                condition=models.Q(("is_active", True), ("is_approved", True)),
+                fields=["post", "-created_at", "-id"],
+                name="blog_comment_approved_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(
+                condition=models.Q(("is_active", True), ("status", "published")),
+                fields=["-published_at", "-id"],
+                name="blog_post_published_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(
+                condition=models.Q(
+                    ("is_active", True), ("is_featured", True), ("status", "published")
+                ),
+                fields=["-published_at", "-id"],
+                name="blog_post_featured_idx",
+            ),
+        ),
+    ]
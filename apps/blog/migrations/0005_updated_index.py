@@ -0,0 +1,20 @@
+# Generated by Django 4.2.7 on 2026-10-18 16:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("blog", "0004_keyset_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(
+                condition=models.Q(("is_active", True), ("status", "published")),
+                fields=["updated_at"],
+                name="blog_post_updated_idx",
+            ),
+        ),
+    ]
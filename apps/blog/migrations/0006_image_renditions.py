@@ -0,0 +1,22 @@
+# Generated by Django 4.2.7 on 2026-10-18 16:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("blog", "0005_updated_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="cover_image_renditions",
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="thumbnail_renditions",
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
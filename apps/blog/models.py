@@ -1,4 +1,8 @@
 from django.db import models
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
+from django.db.models import F, Func, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
 from django.contrib.auth.models import User
 from django.utils.translation import gettext_lazy as _
 from django.utils import timezone
@@ -10,11 +14,26 @@ from apps.core.models import (
     PublishableModel, 
     ViewableModel, 
     FeaturedModel,
+    MultiLanguageModel,
     get_image_upload_path
 )
 
 
-class Category(TimeStampedModel, SlugModel, ActiveModel):
+class PostsCountQuerySet(models.QuerySet):
+    """QuerySet с аннотацией количества опубликованных постов"""
+
+    def with_posts_count(self):
+        """Добавить posts_count одним коррелированным подзапросом вместо COUNT на каждую строку"""
+        lookup = self.model._meta.get_field('posts').field.name
+        posts = Post.objects.filter(
+            status='published', is_active=True, **{lookup: OuterRef('pk')}
+        ).order_by().annotate(
+            total=Func(F('pk'), function='COUNT')
+        ).values('total')
+        return self.annotate(posts_count=Coalesce(Subquery(posts), 0))
+
+
+class Category(TimeStampedModel, SlugModel, ActiveModel, MultiLanguageModel):
     """Категория блога"""
     name_en = models.CharField(max_length=100, verbose_name=_('Name (EN)'))
     name_ru = models.CharField(max_length=100, blank=True, verbose_name=_('Name (RU)'))
@@ -30,6 +49,8 @@ class Category(TimeStampedModel, SlugModel, ActiveModel):
     parent = models.ForeignKey('self', on_delete=models.SET_NULL, null=True, blank=True, related_name='children', verbose_name=_('Parent Category'))
     order = models.PositiveIntegerField(default=0, verbose_name=_('Order'))
 
+    objects = PostsCountQuerySet.as_manager()
+
     class Meta:
         verbose_name = _('Category')
         verbose_name_plural = _('Categories')
@@ -39,7 +60,7 @@ class Category(TimeStampedModel, SlugModel, ActiveModel):
         return self.name_en
 
 
-class Tag(TimeStampedModel, SlugModel, ActiveModel):
+class Tag(TimeStampedModel, SlugModel, ActiveModel, MultiLanguageModel):
     """Тег для статей блога"""
     name_en = models.CharField(max_length=100, verbose_name=_('Name (EN)'))
     name_ru = models.CharField(max_length=100, blank=True, verbose_name=_('Name (RU)'))
@@ -51,6 +72,8 @@ class Tag(TimeStampedModel, SlugModel, ActiveModel):
     
     color = models.CharField(max_length=20, blank=True, verbose_name=_('Color'))
 
+    objects = PostsCountQuerySet.as_manager()
+
     class Meta:
         verbose_name = _('Tag')
         verbose_name_plural = _('Tags')
@@ -60,7 +83,7 @@ class Tag(TimeStampedModel, SlugModel, ActiveModel):
         return self.name_en
 
 
-class Post(TimeStampedModel, SlugModel, SEOModel, PublishableModel, ViewableModel, FeaturedModel):
+class Post(TimeStampedModel, SlugModel, SEOModel, PublishableModel, ViewableModel, FeaturedModel, MultiLanguageModel):
     """Статья блога"""
     author = models.ForeignKey(User, on_delete=models.CASCADE, related_name='posts', verbose_name=_('Author'))
     
@@ -82,6 +105,9 @@ class Post(TimeStampedModel, SlugModel, SEOModel, PublishableModel, ViewableMode
     
     thumbnail = models.ImageField(upload_to=get_image_upload_path, verbose_name=_('Thumbnail'))
     cover_image = models.ImageField(upload_to=get_image_upload_path, blank=True, null=True, verbose_name=_('Cover Image'))
+    # Варианты WebP/JPEG по ширинам и LQIP, заполняются сигналом apps.core.signals
+    thumbnail_renditions = models.JSONField(default=dict, blank=True, editable=False)
+    cover_image_renditions = models.JSONField(default=dict, blank=True, editable=False)
     
     categories = models.ManyToManyField(Category, related_name='posts', verbose_name=_('Categories'))
     tags = models.ManyToManyField(Tag, related_name='posts', verbose_name=_('Tags'))
@@ -90,11 +116,35 @@ class Post(TimeStampedModel, SlugModel, SEOModel, PublishableModel, ViewableMode
     allow_comments = models.BooleanField(default=True, verbose_name=_('Allow Comments'))
     
     is_active = models.BooleanField(default=True, verbose_name=_('Is Active'))
+    
+    # Полнотекстовый поиск (PostgreSQL), обновляется сигналом apps.core.signals
+    search_en = SearchVectorField(null=True, editable=False)
+    search_ru = SearchVectorField(null=True, editable=False)
+    search_he = SearchVectorField(null=True, editable=False)
 
     class Meta:
         verbose_name = _('Post')
         verbose_name_plural = _('Posts')
         ordering = ['-published_at', '-created_at']
+        indexes = [
+            # Частичные индексы: публичные списки читают только опубликованные посты
+            models.Index(
+                fields=['-published_at', '-id'], name='blog_post_published_idx',
+                condition=Q(status='published', is_active=True),
+            ),
+            models.Index(
+                fields=['-published_at', '-id'], name='blog_post_featured_idx',
+                condition=Q(status='published', is_active=True, is_featured=True),
+            ),
+            # ETag списка: max(updated_at) + COUNT по индексу (apps.core.conditional)
+            models.Index(
+                fields=['updated_at'], name='blog_post_updated_idx',
+                condition=Q(status='published', is_active=True),
+            ),
+            GinIndex(fields=['search_en'], name='blog_post_search_en_idx'),
+            GinIndex(fields=['search_ru'], name='blog_post_search_ru_idx'),
+            GinIndex(fields=['search_he'], name='blog_post_search_he_idx'),
+        ]
 
     def __str__(self):
         return self.title_en
@@ -124,6 +174,12 @@ class Comment(TimeStampedModel, ActiveModel):
         verbose_name = _('Comment')
         verbose_name_plural = _('Comments')
         ordering = ['-created_at']
+        indexes = [
+            models.Index(
+                fields=['post', '-created_at', '-id'], name='blog_comment_approved_idx',
+                condition=Q(is_active=True, is_approved=True),
+            ),
+        ]
 
     def __str__(self):
         return f"Comment by {self.author_name} on {self.post.title_en}"
@@ -150,6 +206,9 @@ class Subscription(TimeStampedModel):
         verbose_name = _('Subscription')
         verbose_name_plural = _('Subscriptions')
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['language'], name='blog_sub_active_lang_idx', condition=Q(is_active=True)),
+        ]
 
     def __str__(self):
         return self.email
\ No newline at end of file
@@ -1,5 +1,8 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
+from apps.core.fieldsets import SparseFieldsetSerializerMixin
+from apps.core.images import ImageRenditionsField
+from apps.core.localization import LocalizedSerializerMixin
 from .models import Category, Tag, Post, Comment, Subscription
 
 
@@ -10,7 +13,7 @@ class AuthorSerializer(serializers.ModelSerializer):
         fields = ['id', 'username', 'first_name', 'last_name', 'email']
 
 
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(SparseFieldsetSerializerMixin, LocalizedSerializerMixin, serializers.ModelSerializer):
     """Сериализатор для категорий"""
     posts_count = serializers.SerializerMethodField()
     
@@ -21,12 +24,17 @@ class CategorySerializer(serializers.ModelSerializer):
             'description_en', 'description_ru', 'description_he',
             'icon', 'color', 'order', 'posts_count'
         ]
+        localized_fields = ['name', 'description']
     
     def get_posts_count(self, obj):
-        return obj.posts.filter(status='published', is_active=True).count()
+        # ✅ Берем аннотацию из queryset (with_posts_count), COUNT только как запасной вариант
+        posts_count = getattr(obj, 'posts_count', None)
+        if posts_count is None:
+            posts_count = obj.posts.filter(status='published', is_active=True).count()
+        return posts_count
 
 
-class TagSerializer(serializers.ModelSerializer):
+class TagSerializer(SparseFieldsetSerializerMixin, LocalizedSerializerMixin, serializers.ModelSerializer):
     """Сериализатор для тегов"""
     posts_count = serializers.SerializerMethodField()
     
@@ -37,16 +45,23 @@ class TagSerializer(serializers.ModelSerializer):
             'description_en', 'description_ru', 'description_he',
             'color', 'posts_count'
         ]
+        localized_fields = ['name', 'description']
     
     def get_posts_count(self, obj):
-        return obj.posts.filter(status='published', is_active=True).count()
+        # ✅ Берем аннотацию из queryset (with_posts_count), COUNT только как запасной вариант
+        posts_count = getattr(obj, 'posts_count', None)
+        if posts_count is None:
+            posts_count = obj.posts.filter(status='published', is_active=True).count()
+        return posts_count
 
 
-class PostListSerializer(serializers.ModelSerializer):
+class PostListSerializer(SparseFieldsetSerializerMixin, LocalizedSerializerMixin, serializers.ModelSerializer):
     """Сериализатор для списка постов"""
     author = AuthorSerializer(read_only=True)
     categories = CategorySerializer(many=True, read_only=True)
     tags = TagSerializer(many=True, read_only=True)
+    thumbnail_renditions = ImageRenditionsField()
+    cover_image_renditions = ImageRenditionsField()
     
     class Meta:
         model = Post
@@ -54,16 +69,21 @@ class PostListSerializer(serializers.ModelSerializer):
             'id', 'slug', 'title_en', 'title_ru', 'title_he',
             'subtitle_en', 'subtitle_ru', 'subtitle_he',
             'excerpt_en', 'excerpt_ru', 'excerpt_he',
-            'thumbnail', 'cover_image', 'author', 'categories', 'tags',
+            'thumbnail', 'cover_image', 'thumbnail_renditions', 'cover_image_renditions',
+            'author', 'categories', 'tags',
             'read_time', 'is_featured', 'published_at', 'views_count'
         ]
+        localized_fields = ['title', 'subtitle', 'excerpt']
+        expandable_fields = ['author', 'categories', 'tags']
 
 
-class PostDetailSerializer(serializers.ModelSerializer):
+class PostDetailSerializer(SparseFieldsetSerializerMixin, LocalizedSerializerMixin, serializers.ModelSerializer):
     """Сериализатор для детального просмотра поста"""
     author = AuthorSerializer(read_only=True)
     categories = CategorySerializer(many=True, read_only=True)
     tags = TagSerializer(many=True, read_only=True)
+    thumbnail_renditions = ImageRenditionsField()
+    cover_image_renditions = ImageRenditionsField()
     
     class Meta:
         model = Post
@@ -72,10 +92,13 @@ class PostDetailSerializer(serializers.ModelSerializer):
             'subtitle_en', 'subtitle_ru', 'subtitle_he',
             'excerpt_en', 'excerpt_ru', 'excerpt_he',
             'content_en', 'content_ru', 'content_he',
-            'thumbnail', 'cover_image', 'author', 'categories', 'tags',
+            'thumbnail', 'cover_image', 'thumbnail_renditions', 'cover_image_renditions',
+            'author', 'categories', 'tags',
             'read_time', 'is_featured', 'published_at', 'views_count',
             'allow_comments', 'meta_title', 'meta_description', 'meta_keywords'
         ]
+        localized_fields = ['title', 'subtitle', 'excerpt', 'content']
+        expandable_fields = ['author', 'categories', 'tags']
 
 
 class CommentSerializer(serializers.ModelSerializer):
@@ -94,9 +117,11 @@ class CommentSerializer(serializers.ModelSerializer):
         }
     
     def get_replies(self, obj):
-        if obj.replies.exists():
-            return CommentSerializer(obj.replies.filter(is_active=True, is_approved=True), many=True).data
-        return []
+        # ✅ Дерево собрано в памяти (apps.blog.utils.load_comment_tree) - без запросов на каждый уровень
+        replies = getattr(obj, 'tree_replies', None)
+        if replies is None:
+            replies = obj.replies.filter(is_active=True, is_approved=True)
+        return CommentSerializer(replies, many=True, context=self.context).data
 
 
 class SubscriptionSerializer(serializers.ModelSerializer):
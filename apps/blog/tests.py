@@ -1,3 +1,172 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from apps.core.site_config import refresh_site_config
+from .models import Category, Post, Comment, Tag
 
-# Create your tests here.
+
+class CommentTreeQueriesTest(TestCase):
+    """Дерево комментариев строится фиксированным числом запросов"""
+
+    def setUp(self):
+        self.client = APIClient(HTTP_HOST='localhost')
+        author = User.objects.create(username='author')
+        self.post = Post.objects.create(
+            author=author, slug='post', title_en='Post', content_en='Content',
+            status='published', thumbnail='post.png',
+        )
+        # Снимок настроек процесса (режим обслуживания) - заранее, вне подсчета запросов
+        refresh_site_config()
+
+    def add_thread(self, depth):
+        parent = None
+        for level in range(depth):
+            parent = Comment.objects.create(
+                post=self.post, parent=parent, author_name=f'User {level}',
+                author_email='user@example.com', content='Reply', is_approved=True,
+            )
+
+    def get_comments(self):
+        response = self.client.get(f'/api/blog/posts/{self.post.slug}/comments/')
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_post_comments_query_count_does_not_depend_on_depth(self):
+        self.add_thread(depth=2)
+        # пост + категории + теги + все комментарии
+        with self.assertNumQueries(4):
+            self.get_comments()
+
+        self.add_thread(depth=6)
+        with self.assertNumQueries(4):
+            data = self.get_comments()
+
+        self.assertEqual(len(data['results']), 2)
+        node, depth = data['results'][0], 1
+        while node['replies']:
+            node, depth = node['replies'][0], depth + 1
+        self.assertEqual(depth, 6)
+
+    def test_unapproved_replies_are_hidden(self):
+        self.add_thread(depth=1)
+        root = Comment.objects.get()
+        Comment.objects.create(
+            post=self.post, parent=root, author_name='Spam',
+            author_email='spam@example.com', content='Spam', is_approved=False,
+        )
+        data = self.get_comments()
+        self.assertEqual(data['results'][0]['replies'], [])
+
+    def test_comment_list_loads_replies_in_one_query(self):
+        self.add_thread(depth=5)
+        # фильтр post + COUNT + страница + все комментарии постов страницы
+        with self.assertNumQueries(4):
+            response = self.client.get('/api/blog/comments/', {'post': self.post.pk})
+        self.assertEqual(response.status_code, 200)
+
+
+class TaxonomyListQueriesTest(TestCase):
+    """Списки категорий и тегов с числом постов - постоянное число запросов, без N+1"""
+
+    def setUp(self):
+        self.client = APIClient(HTTP_HOST='localhost')
+        cache.clear()
+        self.author = User.objects.create(username='author')
+        refresh_site_config()
+
+    def add_rows(self, model, relation, count):
+        start = model.objects.count()
+        for i in range(start, start + count):
+            item = model.objects.create(slug=f'item-{i}', name_en=f'Item {i}')
+            post = Post.objects.create(
+                author=self.author, slug=f'{model.__name__.lower()}-post-{i}', title_en='Post',
+                content_en='Content', status='published',
+            )
+            getattr(post, relation).add(item)
+
+    def assert_constant_queries(self, model, relation, path):
+        for count in (2, 5):
+            self.add_rows(model, relation, count)
+            cache.clear()
+            # валидатор ETag + COUNT + страница с числом постов в аннотации
+            with self.assertNumQueries(3):
+                response = self.client.get(path)
+            self.assertEqual(response.status_code, 200)
+        results = response.json()['results']
+        self.assertEqual(len(results), 7)
+        self.assertEqual({row['posts_count'] for row in results}, {1})
+
+    def test_categories(self):
+        self.assert_constant_queries(Category, 'categories', '/api/blog/categories/')
+
+    def test_tags(self):
+        self.assert_constant_queries(Tag, 'tags', '/api/blog/tags/')
+
+
+class LocalizedSerializationTest(TestCase):
+    """?lang= отдает одно поле на язык и не читает колонки других языков"""
+
+    def setUp(self):
+        self.client = APIClient(HTTP_HOST='localhost')
+        author = User.objects.create(username='author')
+        self.post = Post.objects.create(
+            author=author, slug='post', title_en='Post', title_ru='Пост', content_en='Content',
+            content_ru='Текст', content_he='תוכן', status='published', thumbnail='post.png',
+        )
+
+    def test_selected_language_with_english_fallback(self):
+        data = self.client.get('/api/blog/posts/post/', {'lang': 'ru'}).json()
+        self.assertEqual((data['title'], data['content']), ('Пост', 'Текст'))
+        self.assertEqual(data['subtitle'], '')
+        self.assertNotIn('title_en', data)
+
+        data = self.client.get('/api/blog/posts/post/', {'lang': 'auto'}, HTTP_ACCEPT_LANGUAGE='he').json()
+        self.assertEqual((data['title'], data['content']), ('Post', 'תוכן'))
+
+    def test_other_language_columns_are_deferred(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get('/api/blog/posts/post/', {'lang': 'ru'})
+        post_query = next(query['sql'] for query in queries if '"blog_post"."title_en"' in query['sql'])
+        self.assertIn('"content_ru"', post_query)
+        self.assertNotIn('"content_he"', post_query)
+
+    def test_without_lang_all_variants_are_returned(self):
+        data = self.client.get('/api/blog/posts/post/').json()
+        self.assertEqual((data['title_en'], data['title_ru']), ('Post', 'Пост'))
+
+
+class SparseFieldsetTest(TestCase):
+    """?fields=/?expand= сужают и ответ, и SQL"""
+
+    def setUp(self):
+        self.client = APIClient(HTTP_HOST='localhost')
+        author = User.objects.create(username='author')
+        self.post = Post.objects.create(
+            author=author, slug='post', title_en='Post', title_ru='Пост', content_en='Content',
+            status='published', thumbnail='post.png',
+        )
+        self.post.categories.add(Category.objects.create(slug='django', name_en='Django'))
+        # Снимок настроек процесса (режим обслуживания) - заранее, вне подсчета запросов
+        refresh_site_config()
+
+    def test_fields_prune_response_and_columns(self):
+        with CaptureQueriesContext(connection) as queries:
+            data = self.client.get('/api/blog/posts/post/', {'fields': 'slug,title', 'lang': 'ru'}).json()
+        self.assertEqual(data, {'id': self.post.pk, 'slug': 'post', 'title': 'Пост'})
+        # Без связей: валидатор ETag и сам пост - ни JOIN автора, ни prefetch категорий и тегов
+        # (UPDATE счетчика просмотров не в счет)
+        sql = [query['sql'] for query in queries
+               if query['sql'].startswith('SELECT') and ('blog_' in query['sql'] or 'auth_user' in query['sql'])]
+        self.assertEqual(len(sql), 2)
+        self.assertNotIn('"content_en"', sql[1])
+        self.assertNotIn('auth_user', sql[1])
+
+    def test_nested_fields_and_collapsed_relations(self):
+        data = self.client.get('/api/blog/posts/', {'fields': 'categories.slug,author', 'expand': 'categories'}).json()
+        post = data['results'][0]
+        self.assertEqual(post['categories'], [{'id': self.post.categories.get().pk, 'slug': 'django'}])
+        self.assertEqual(post['author'], self.post.author_id)
+        self.assertEqual(set(post), {'id', 'categories', 'author'})
@@ -0,0 +1,49 @@
+from .models import Comment
+
+
+def approved_comments():
+    """Одобренные активные комментарии"""
+    return Comment.objects.filter(is_active=True, is_approved=True)
+
+
+def build_comment_tree(comments):
+    """
+    Собирает дерево из плоского списка комментариев в памяти.
+    Ответы кладутся в атрибут tree_replies, возвращаются корневые комментарии
+    """
+    by_id = {comment.pk: comment for comment in comments}
+    for comment in comments:
+        comment.tree_replies = []
+
+    roots = []
+    for comment in comments:
+        if comment.parent_id is None:
+            roots.append(comment)
+        elif comment.parent_id in by_id:
+            by_id[comment.parent_id].tree_replies.append(comment)
+    return roots
+
+
+def load_comment_tree(post):
+    """
+    Загружает все одобренные комментарии поста одним запросом
+    и возвращает корневые с вложенными ответами
+    """
+    return build_comment_tree(list(approved_comments().filter(post=post)))
+
+
+def attach_comment_replies(comments):
+    """
+    Подгружает ответы для произвольной страницы комментариев одним запросом
+    (все одобренные комментарии постов этой страницы)
+    """
+    post_ids = {comment.post_id for comment in comments}
+    if not post_ids:
+        return comments
+
+    tree = list(approved_comments().filter(post_id__in=post_ids))
+    build_comment_tree(tree)
+    replies = {comment.pk: comment.tree_replies for comment in tree}
+    for comment in comments:
+        comment.tree_replies = replies.get(comment.pk, [])
+    return comments
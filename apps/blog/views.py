@@ -10,29 +10,51 @@ from .serializers import (
     CategorySerializer, TagSerializer, PostListSerializer,
     PostDetailSerializer, CommentSerializer, SubscriptionSerializer
 )
+from .utils import approved_comments, attach_comment_replies, load_comment_tree
+from apps.core.cache import CachedResponseMixin, cache_response
+from apps.core.counters import ViewCountingMixin
+from apps.core.fieldsets import SparseFieldsetMixin
+from apps.core.localization import LocalizedQuerysetMixin
+from apps.core.pagination import CommentPagination, PublishedPagination
+from apps.core.search import FullTextSearchFilter, RankedOrderingFilter
 
-class CategoryViewSet(viewsets.ReadOnlyModelViewSet):
+class CategoryViewSet(SparseFieldsetMixin, LocalizedQuerysetMixin, CachedResponseMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet для категорий"""
-    queryset = Category.objects.filter(is_active=True).order_by('order')
+    cache_dependencies = ('blog.post',)
+    edge_cache = {'s_maxage': 300, 'stale_while_revalidate': 3600}
+    queryset = Category.objects.filter(is_active=True).with_posts_count().order_by('order')
     serializer_class = CategorySerializer
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     search_fields = ['name_en', 'name_ru', 'name_he']
     ordering = ['order']
 
-class TagViewSet(viewsets.ReadOnlyModelViewSet):
+class TagViewSet(SparseFieldsetMixin, LocalizedQuerysetMixin, CachedResponseMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet для тегов"""
-    queryset = Tag.objects.filter(is_active=True).order_by('name_en')
+    cache_dependencies = ('blog.post',)
+    edge_cache = {'s_maxage': 300, 'stale_while_revalidate': 3600}
+    queryset = Tag.objects.filter(is_active=True).with_posts_count().order_by('name_en')
     serializer_class = TagSerializer
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
     search_fields = ['name_en', 'name_ru', 'name_he']
     ordering = ['name_en']
 
-class PostViewSet(viewsets.ReadOnlyModelViewSet):
+class PostViewSet(ViewCountingMixin, SparseFieldsetMixin, LocalizedQuerysetMixin, CachedResponseMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet для постов"""
+    cache_dependencies = ('blog.category', 'blog.tag', 'auth.user')
+    edge_cache = {'s_maxage': 60, 'stale_while_revalidate': 600}
     lookup_field = 'slug'
-    queryset = Post.objects.filter(status='published', is_active=True).select_related('author').prefetch_related('categories', 'tags')
+    # Как подгружать связи; с ?fields=/?expand= - только те, что попали в ответ
+    relation_loaders = {
+        'author': 'author',
+        'categories': Prefetch('categories', queryset=Category.objects.with_posts_count()),
+        'tags': Prefetch('tags', queryset=Tag.objects.with_posts_count()),
+    }
+    queryset = Post.objects.filter(status='published', is_active=True).select_related('author').prefetch_related(
+        relation_loaders['categories'], relation_loaders['tags'],
+    )
     serializer_class = PostListSerializer
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    pagination_class = PublishedPagination
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter, RankedOrderingFilter]
     filterset_fields = ['categories__slug', 'tags__slug', 'is_featured', 'author']
     search_fields = ['title_en', 'title_ru', 'title_he', 'excerpt_en', 'excerpt_ru', 'excerpt_he']
     ordering_fields = ['published_at', 'views_count', 'created_at']
@@ -44,20 +66,11 @@ class PostViewSet(viewsets.ReadOnlyModelViewSet):
             return PostDetailSerializer
         return PostListSerializer
 
-    def retrieve(self, request, *args, **kwargs):
-        """Увеличиваем счетчик просмотров при детальном просмотре"""
-        instance = self.get_object()
-        # Увеличиваем счетчик просмотров
-        Post.objects.filter(pk=instance.pk).update(views_count=F('views_count') + 1)
-        # Обновляем объект для корректного отображения
-        instance.refresh_from_db()
-        serializer = self.get_serializer(instance)
-        return Response(serializer.data)
-
     @action(detail=False, methods=['get'])
+    @cache_response
     def featured(self, request):
         """Получить рекомендуемые посты"""
-        featured_posts = self.queryset.filter(is_featured=True)
+        featured_posts = self.get_queryset().filter(is_featured=True)
         page = self.paginate_queryset(featured_posts)
         if page is not None:
             serializer = self.get_serializer(page, many=True)
@@ -70,12 +83,8 @@ class PostViewSet(viewsets.ReadOnlyModelViewSet):
     def comments(self, request, slug=None):
         """Получить комментарии к посту"""
         post = self.get_object()
-        comments = Comment.objects.filter(
-            post=post, 
-            is_active=True, 
-            is_approved=True,
-            parent=None
-        ).select_related('post').prefetch_related('replies')
+        # Все одобренные комментарии поста одним запросом, дерево собирается в памяти
+        comments = load_comment_tree(post)
         
         page = self.paginate_queryset(comments)
         if page is not None:
@@ -87,8 +96,9 @@ class PostViewSet(viewsets.ReadOnlyModelViewSet):
 
 class CommentViewSet(viewsets.ModelViewSet):  # ✅ ИЗМЕНЕНО: ModelViewSet вместо ReadOnlyModelViewSet
     """ViewSet для комментариев"""
-    queryset = Comment.objects.filter(is_active=True, is_approved=True).select_related('post').prefetch_related('replies')
+    queryset = Comment.objects.filter(is_active=True, is_approved=True)
     serializer_class = CommentSerializer
+    pagination_class = CommentPagination
     permission_classes = [AllowAny]  # ✅ ДОБАВЛЕНО: Разрешить анонимные комментарии
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
     filterset_fields = ['post', 'post__slug']
@@ -97,8 +107,23 @@ class CommentViewSet(viewsets.ModelViewSet):  # ✅ ИЗМЕНЕНО: ModelViewS
     def get_queryset(self):
         """Показываем только одобренные комментарии в списке"""
         if self.action in ['list', 'retrieve']:
-            return Comment.objects.filter(is_active=True, is_approved=True).select_related('post').prefetch_related('replies')
+            return approved_comments()
         return Comment.objects.all()
+
+    def list(self, request, *args, **kwargs):
+        """Ответы для всей страницы подгружаются одним запросом"""
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        comments = attach_comment_replies(page if page is not None else list(queryset))
+        serializer = self.get_serializer(comments, many=True)
+        if page is not None:
+            return self.get_paginated_response(serializer.data)
+        return Response(serializer.data)
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = attach_comment_replies([self.get_object()])[0]
+        serializer = self.get_serializer(instance)
+        return Response(serializer.data)
     
     def perform_create(self, serializer):
         """Создание комментария с дополнительными данными"""
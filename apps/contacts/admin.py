@@ -1,6 +1,8 @@
 from django.contrib import admin
-from .models import ContactMessage, ContactResponse, Newsletter
+from .models import ContactMessage, ContactNotification, ContactResponse, Newsletter, NewsletterDelivery
 
 admin.site.register(ContactMessage)
+admin.site.register(ContactNotification)
 admin.site.register(ContactResponse)
-admin.site.register(Newsletter)
\ No newline at end of file
+admin.site.register(Newsletter)
+admin.site.register(NewsletterDelivery)
\ No newline at end of file
@@ -0,0 +1,22 @@
+import time
+
+from django.core.management.base import BaseCommand
+from apps.contacts.notifications import deliver_due
+
+
+class Command(BaseCommand):
+    help = 'Отправляет уведомления о сообщениях из outbox (с повторами по расписанию)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=50, help='Строк outbox за проход')
+        parser.add_argument('--loop', type=int, default=0, help='Повторять проход каждые N секунд')
+
+    def handle(self, *args, **options):
+        while True:
+            results = deliver_due(options['limit'])
+            self.stdout.write(
+                f"✅ Отправлено: {results['sent']}, к повтору: {results['pending']}, ошибок: {results['failed']}"
+            )
+            if not options['loop']:
+                return
+            time.sleep(options['loop'])
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from apps.contacts.models import Newsletter
+from apps.contacts.newsletters import SMTPUnavailableError, send_newsletter, start_newsletter
+
+
+class Command(BaseCommand):
+    help = 'Отправляет рассылку активным подписчикам (пачками, с возобновлением после сбоя)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('newsletter_id', type=int)
+        parser.add_argument('--batch-size', type=int, help='Писем в пачке (по умолчанию NEWSLETTER_BATCH_SIZE)')
+        parser.add_argument('--connections', type=int, help='SMTP-соединений в пуле')
+        parser.add_argument('--resume', action='store_true', help='Продолжить рассылку в статусе sending')
+
+    def handle(self, *args, **options):
+        try:
+            newsletter = Newsletter.objects.get(pk=options['newsletter_id'])
+        except Newsletter.DoesNotExist:
+            raise CommandError(f"Рассылка #{options['newsletter_id']} не найдена")
+
+        stale_before = timezone.now() if options['resume'] else None
+        if not start_newsletter(newsletter.pk, stale_before=stale_before):
+            raise CommandError(f'Рассылку в статусе {newsletter.status} нельзя отправить (для sending - --resume)')
+
+        try:
+            report = send_newsletter(newsletter, options['batch_size'], options['connections'])
+        except SMTPUnavailableError as e:
+            raise CommandError(f'SMTP недоступен: {e}')
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Отправлено: {report['sent']}, ошибок: {report['failed']}, "
+            f"за {report['seconds']} с ({report['messages_per_second']} писем/с)"
+        ))
+        if report['interrupted']:
+            self.stdout.write(self.style.WARNING(
+                f"⚠️ {report['interrupted']} писем прерванной пачки не отправлялись повторно"
+            ))
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-18 15:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("contacts", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="contactmessage",
+            index=models.Index(
+                fields=["status", "-created_at"], name="contacts_message_status_idx"
+            ),
+        ),
+    ]
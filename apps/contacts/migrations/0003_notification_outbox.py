@@ -0,0 +1,102 @@
+# Generated by Django 4.2.7 on 2026-10-18 16:02
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("contacts", "0002_hot_path_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ContactNotification",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="Created at"),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(auto_now=True, verbose_name="Updated at"),
+                ),
+                (
+                    "channel",
+                    models.CharField(
+                        choices=[("email", "Email"), ("telegram", "Telegram")],
+                        max_length=20,
+                        verbose_name="Channel",
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pending"),
+                            ("sending", "Sending"),
+                            ("sent", "Sent"),
+                            ("failed", "Failed"),
+                        ],
+                        default="pending",
+                        max_length=20,
+                        verbose_name="Status",
+                    ),
+                ),
+                (
+                    "attempts",
+                    models.PositiveIntegerField(default=0, verbose_name="Attempts"),
+                ),
+                (
+                    "next_attempt_at",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now,
+                        verbose_name="Next Attempt At",
+                    ),
+                ),
+                (
+                    "sent_at",
+                    models.DateTimeField(blank=True, null=True, verbose_name="Sent At"),
+                ),
+                ("last_error", models.TextField(blank=True, verbose_name="Last Error")),
+                (
+                    "contact_message",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="notifications",
+                        to="contacts.contactmessage",
+                        verbose_name="Contact Message",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Contact Notification",
+                "verbose_name_plural": "Contact Notifications",
+                "ordering": ["next_attempt_at"],
+                "indexes": [
+                    models.Index(
+                        condition=models.Q(("status__in", ["pending", "sending"])),
+                        fields=["next_attempt_at"],
+                        name="contacts_notification_due_idx",
+                    )
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="contactnotification",
+            constraint=models.UniqueConstraint(
+                fields=("contact_message", "channel"),
+                name="contacts_notification_channel_uniq",
+            ),
+        ),
+    ]
@@ -0,0 +1,99 @@
+# Generated by Django 4.2.7 on 2026-10-18 16:03
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("blog", "0004_keyset_indexes"),
+        ("contacts", "0003_notification_outbox"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="NewsletterDelivery",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="Created at"),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(auto_now=True, verbose_name="Updated at"),
+                ),
+                ("email", models.EmailField(max_length=254, verbose_name="Email")),
+                (
+                    "language",
+                    models.CharField(
+                        default="en", max_length=10, verbose_name="Language"
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pending"),
+                            ("sending", "Sending"),
+                            ("sent", "Sent"),
+                            ("failed", "Failed"),
+                        ],
+                        default="pending",
+                        max_length=20,
+                        verbose_name="Status",
+                    ),
+                ),
+                (
+                    "sent_at",
+                    models.DateTimeField(blank=True, null=True, verbose_name="Sent At"),
+                ),
+                ("error", models.TextField(blank=True, verbose_name="Error")),
+                (
+                    "newsletter",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="deliveries",
+                        to="contacts.newsletter",
+                        verbose_name="Newsletter",
+                    ),
+                ),
+                (
+                    "subscription",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="newsletter_deliveries",
+                        to="blog.subscription",
+                        verbose_name="Subscription",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Newsletter Delivery",
+                "verbose_name_plural": "Newsletter Deliveries",
+                "ordering": ["id"],
+                "indexes": [
+                    models.Index(
+                        fields=["newsletter", "status", "language", "id"],
+                        name="contacts_delivery_status_idx",
+                    )
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="newsletterdelivery",
+            constraint=models.UniqueConstraint(
+                fields=("newsletter", "email"), name="contacts_delivery_email_uniq"
+            ),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 4.2.7 on 2026-10-18 16:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("contacts", "0004_newsletter_deliveries"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="newsletter",
+            name="attempts",
+            field=models.PositiveIntegerField(default=0, verbose_name="Attempts"),
+        ),
+        migrations.AddField(
+            model_name="newsletter",
+            name="last_error",
+            field=models.TextField(blank=True, verbose_name="Last Error"),
+        ),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from apps.core.models import TimeStampedModel, ActiveModel
 
@@ -29,11 +30,54 @@ class ContactMessage(TimeStampedModel):
         verbose_name = _('Contact Message')
         verbose_name_plural = _('Contact Messages')
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', '-created_at'], name='contacts_message_status_idx'),
+        ]
 
     def __str__(self):
         return f"Message from {self.name}: {self.subject}"
 
 
+class ContactNotification(TimeStampedModel):
+    """Исходящее уведомление о сообщении (outbox): одна строка на канал доставки"""
+    CHANNEL_CHOICES = [
+        ('email', _('Email')),
+        ('telegram', _('Telegram')),
+    ]
+    STATUS_CHOICES = [
+        ('pending', _('Pending')),
+        ('sending', _('Sending')),
+        ('sent', _('Sent')),
+        ('failed', _('Failed')),
+    ]
+    contact_message = models.ForeignKey(ContactMessage, on_delete=models.CASCADE, related_name='notifications', verbose_name=_('Contact Message'))
+    channel = models.CharField(max_length=20, choices=CHANNEL_CHOICES, verbose_name=_('Channel'))
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending', verbose_name=_('Status'))
+
+    attempts = models.PositiveIntegerField(default=0, verbose_name=_('Attempts'))
+    next_attempt_at = models.DateTimeField(default=timezone.now, verbose_name=_('Next Attempt At'))
+    sent_at = models.DateTimeField(blank=True, null=True, verbose_name=_('Sent At'))
+    last_error = models.TextField(blank=True, verbose_name=_('Last Error'))
+
+    class Meta:
+        verbose_name = _('Contact Notification')
+        verbose_name_plural = _('Contact Notifications')
+        ordering = ['next_attempt_at']
+        constraints = [
+            models.UniqueConstraint(fields=['contact_message', 'channel'], name='contacts_notification_channel_uniq'),
+        ]
+        indexes = [
+            # Воркер выбирает только ожидающие доставки строки
+            models.Index(
+                fields=['next_attempt_at'], name='contacts_notification_due_idx',
+                condition=models.Q(status__in=['pending', 'sending']),
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.get_channel_display()} for message #{self.contact_message_id}: {self.status}"
+
+
 class ContactResponse(TimeStampedModel):
     """Ответ на сообщение из контактной формы"""
     contact_message = models.ForeignKey(ContactMessage, on_delete=models.CASCADE, related_name='responses', verbose_name=_('Contact Message'))
@@ -79,6 +123,9 @@ class Newsletter(TimeStampedModel, ActiveModel):
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='draft', verbose_name=_('Status'))
     
     scheduled_for = models.DateTimeField(blank=True, null=True, verbose_name=_('Scheduled For'))
+    # Неудачные попытки открыть SMTP: после NEWSLETTER_MAX_ATTEMPTS рассылка - failed
+    attempts = models.PositiveIntegerField(default=0, verbose_name=_('Attempts'))
+    last_error = models.TextField(blank=True, verbose_name=_('Last Error'))
 
     class Meta:
         verbose_name = _('Newsletter')
@@ -86,4 +133,36 @@ class Newsletter(TimeStampedModel, ActiveModel):
         ordering = ['-created_at']
 
     def __str__(self):
-        return self.subject_en
\ No newline at end of file
+        return self.subject_en
+
+
+class NewsletterDelivery(TimeStampedModel):
+    """Получатель рассылки; строка - это контрольная точка, отправленным повторно не шлем"""
+    STATUS_CHOICES = [
+        ('pending', _('Pending')),
+        ('sending', _('Sending')),
+        ('sent', _('Sent')),
+        ('failed', _('Failed')),
+    ]
+    newsletter = models.ForeignKey(Newsletter, on_delete=models.CASCADE, related_name='deliveries', verbose_name=_('Newsletter'))
+    subscription = models.ForeignKey('blog.Subscription', on_delete=models.SET_NULL, blank=True, null=True, related_name='newsletter_deliveries', verbose_name=_('Subscription'))
+    email = models.EmailField(verbose_name=_('Email'))
+    language = models.CharField(max_length=10, default='en', verbose_name=_('Language'))
+
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending', verbose_name=_('Status'))
+    sent_at = models.DateTimeField(blank=True, null=True, verbose_name=_('Sent At'))
+    error = models.TextField(blank=True, verbose_name=_('Error'))
+
+    class Meta:
+        verbose_name = _('Newsletter Delivery')
+        verbose_name_plural = _('Newsletter Deliveries')
+        ordering = ['id']
+        constraints = [
+            models.UniqueConstraint(fields=['newsletter', 'email'], name='contacts_delivery_email_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['newsletter', 'status', 'language', 'id'], name='contacts_delivery_status_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.newsletter} -> {self.email}: {self.status}"
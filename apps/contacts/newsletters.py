@@ -0,0 +1,256 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.utils import timezone
+from django.utils.html import strip_tags
+
+from apps.blog.models import Subscription
+from .models import Newsletter, NewsletterDelivery
+
+logger = logging.getLogger(__name__)
+
+LANGUAGES = ('en', 'ru', 'he')
+INTERRUPTED_ERROR = 'Interrupted while sending; not resent to avoid a duplicate'
+
+
+class SMTPUnavailableError(Exception):
+    """Пул SMTP-соединений не открылся (сервер недоступен, неверный логин)"""
+
+
+def render_variants(newsletter):
+    """Каждая языковая версия рендерится один раз на всю рассылку"""
+    variants = {}
+    for language in LANGUAGES:
+        subject = getattr(newsletter, f'subject_{language}') or newsletter.subject_en
+        html = getattr(newsletter, f'content_{language}') or newsletter.content_en
+        variants[language] = {'subject': subject, 'html': html, 'text': strip_tags(html)}
+    return variants
+
+
+class SMTPConnectionPool:
+    """Несколько постоянных SMTP-соединений: connect/STARTTLS/login один раз на рассылку"""
+
+    def __init__(self, size):
+        self.connections = [get_connection(fail_silently=False) for _ in range(size)]
+
+    def open(self):
+        """Открыть все соединения; если одно не открылось - закрыть уже открытые"""
+        try:
+            for connection in self.connections:
+                connection.open()
+        except Exception:
+            self.__exit__()
+            raise
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        for connection in self.connections:
+            connection.close()
+
+    def __len__(self):
+        return len(self.connections)
+
+
+def send_chunk(connection, deliveries, variants):
+    """Отправить часть пачки по одному соединению; ошибка письма не останавливает остальные"""
+    from_email = getattr(settings, 'NEWSLETTER_FROM_EMAIL', settings.DEFAULT_FROM_EMAIL)
+    results = []
+    for delivery in deliveries:
+        variant = variants.get(delivery.language, variants['en'])
+        message = EmailMultiAlternatives(
+            variant['subject'], variant['text'], from_email, [delivery.email], connection=connection,
+        )
+        message.attach_alternative(variant['html'], 'text/html')
+        try:
+            connection.send_messages([message])
+        except Exception as e:
+            results.append((delivery, str(e) or e.__class__.__name__))
+            reopen(connection)
+        else:
+            results.append((delivery, None))
+    return results
+
+
+def reopen(connection):
+    """
+    Соединение после ошибки могло оборваться - открыть заново явно. Закрытое
+    соединение send_messages открывал бы и закрывал на каждое письмо
+    """
+    connection.close()
+    try:
+        connection.open()
+    except Exception as e:
+        logger.warning(f"SMTP reconnect failed, next message will retry: {str(e)}")
+
+
+def queue_recipients(newsletter):
+    """Зафиксировать получателей: активные подписчики с их языком (повторный вызов ничего не дублирует)"""
+    subscribers = Subscription.objects.filter(is_active=True).values_list('id', 'email', 'language')
+    batch = []
+    for subscription_id, email, language in subscribers.iterator(chunk_size=2000):
+        batch.append(NewsletterDelivery(
+            newsletter=newsletter, subscription_id=subscription_id, email=email,
+            language=language if language in LANGUAGES else 'en',
+        ))
+        if len(batch) >= 2000:
+            NewsletterDelivery.objects.bulk_create(batch, ignore_conflicts=True)
+            batch = []
+    NewsletterDelivery.objects.bulk_create(batch, ignore_conflicts=True)
+
+
+def recover_interrupted(newsletter):
+    """
+    Письма пачки, на которой упал прошлый запуск, могли уже уйти.
+    Не шлем их повторно, а помечаем как failed, чтобы не было дублей
+    """
+    return newsletter.deliveries.filter(status='sending').update(
+        status='failed', error=INTERRUPTED_ERROR, updated_at=timezone.now(),
+    )
+
+
+def claim_batch(newsletter, size):
+    """Следующая пачка получателей (по языку, чтобы пачки были однородными)"""
+    with transaction.atomic():
+        batch = list(
+            newsletter.deliveries.select_for_update(skip_locked=True)
+            .filter(status='pending').order_by('language', 'id')[:size]
+        )
+        NewsletterDelivery.objects.filter(pk__in=[delivery.pk for delivery in batch]).update(
+            status='sending', updated_at=timezone.now(),
+        )
+    return batch
+
+
+def record_batch(results):
+    """Контрольная точка после пачки: отправленные больше никогда не попадут в отправку"""
+    now = timezone.now()
+    sent = [delivery.pk for delivery, error in results if error is None]
+    failed = []
+    for delivery, error in results:
+        if error is not None:
+            delivery.status, delivery.error, delivery.updated_at = 'failed', error, now
+            failed.append(delivery)
+    NewsletterDelivery.objects.filter(pk__in=sent).update(status='sent', sent_at=now, updated_at=now)
+    NewsletterDelivery.objects.bulk_update(failed, ['status', 'error', 'updated_at'])
+    return len(sent), len(failed)
+
+
+def start_newsletter(newsletter_id, stale_before=None):
+    """
+    Атомарно перевести рассылку в sending; False - ее уже отправляет другой процесс.
+    stale_before - также забрать sending-рассылку без прогресса с этого момента
+    """
+    condition = Q(status__in=['draft', 'scheduled'])
+    if stale_before is not None:
+        condition |= Q(status='sending', updated_at__lt=stale_before)
+    return bool(Newsletter.objects.filter(condition, pk=newsletter_id, is_active=True).update(
+        status='sending', updated_at=timezone.now(),
+    ))
+
+
+def send_newsletter(newsletter, batch_size=None, connections=None):
+    """
+    Рассылка пачками фиксированного размера по пулу SMTP-соединений.
+    Прогресс сохраняется после каждой пачки, повторный запуск продолжает с места падения
+    """
+    batch_size = batch_size or settings.NEWSLETTER_BATCH_SIZE
+    connections = connections or settings.NEWSLETTER_SMTP_CONNECTIONS
+
+    interrupted = recover_interrupted(newsletter)
+    queue_recipients(newsletter)
+    variants = render_variants(newsletter)
+
+    try:
+        pool = SMTPConnectionPool(connections).open()
+    except Exception as e:
+        record_pool_failure(newsletter, e)
+        raise SMTPUnavailableError(str(e) or e.__class__.__name__) from e
+
+    sent = failed = 0
+    started = time.monotonic()
+    with pool, ThreadPoolExecutor(max_workers=len(pool)) as executor:
+        while True:
+            batch = claim_batch(newsletter, batch_size)
+            if not batch:
+                break
+            chunks = [batch[index::len(pool)] for index in range(len(pool))]
+            results = [
+                result
+                for chunk_results in executor.map(send_chunk, pool.connections, chunks, [variants] * len(pool))
+                for result in chunk_results
+            ]
+            batch_sent, batch_failed = record_batch(results)
+            sent += batch_sent
+            failed += batch_failed
+            # updated_at - признак жизни: зависшую рассылку периодическая задача возобновит
+            Newsletter.objects.filter(pk=newsletter.pk).update(updated_at=timezone.now())
+            logger.info(f"Newsletter #{newsletter.pk}: {sent} sent, {failed} failed, {throughput(sent, started):.1f} msg/s")
+
+    elapsed = time.monotonic() - started
+    totals = newsletter.deliveries.aggregate(
+        total=Count('id'), sent=Count('id', filter=Q(status='sent')),
+    )
+    newsletter.recipients_count = totals['total']
+    newsletter.status = 'sent' if totals['sent'] or not totals['total'] else 'failed'
+    newsletter.is_sent = newsletter.status == 'sent'
+    newsletter.sent_at = timezone.now()
+    newsletter.save(update_fields=['recipients_count', 'status', 'is_sent', 'sent_at', 'updated_at'])
+
+    report = {
+        'sent': sent,
+        'failed': failed,
+        'interrupted': interrupted,
+        'seconds': round(elapsed, 2),
+        'messages_per_second': round(throughput(sent, started), 1),
+        'languages': dict(newsletter.deliveries.values_list('language').annotate(total=Count('id')).order_by()),
+    }
+    logger.info(f"Newsletter #{newsletter.pk} finished: {report}")
+    return report
+
+
+def record_pool_failure(newsletter, error):
+    """
+    SMTP не открылся: рассылка остается в sending и возобновится через NEWSLETTER_STALE_AFTER,
+    после NEWSLETTER_MAX_ATTEMPTS таких попыток - failed, чтобы не повторять бесконечно
+    """
+    Newsletter.objects.filter(pk=newsletter.pk).update(
+        attempts=F('attempts') + 1, last_error=str(error) or error.__class__.__name__,
+    )
+    newsletter.refresh_from_db(fields=['attempts', 'last_error'])
+    if newsletter.attempts >= settings.NEWSLETTER_MAX_ATTEMPTS:
+        Newsletter.objects.filter(pk=newsletter.pk).update(status='failed', updated_at=timezone.now())
+        newsletter.status = 'failed'
+    logger.error(f"Newsletter #{newsletter.pk}: SMTP pool failed to open "
+                 f"(attempt {newsletter.attempts}): {newsletter.last_error}")
+
+
+def throughput(sent, started):
+    elapsed = time.monotonic() - started
+    return sent / elapsed if elapsed else 0.0
+
+
+def send_due_newsletters():
+    """Запустить запланированные рассылки и возобновить зависшие (процесс упал посреди отправки)"""
+    now = timezone.now()
+    stale = now - timedelta(seconds=settings.NEWSLETTER_STALE_AFTER)
+    due = Newsletter.objects.filter(is_active=True).filter(
+        Q(status='scheduled', scheduled_for__lte=now) | Q(status='sending', updated_at__lt=stale)
+    )
+    reports = {}
+    for newsletter in due:
+        if not start_newsletter(newsletter.pk, stale_before=stale):
+            continue
+        try:
+            reports[newsletter.pk] = send_newsletter(newsletter)
+        except SMTPUnavailableError as e:
+            reports[newsletter.pk] = {'error': str(e)}
+    return reports
@@ -0,0 +1,127 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from functools import partial
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from apps.core import timing
+from .models import ContactNotification
+from .utils import send_email_notification, send_telegram_notification
+
+logger = logging.getLogger(__name__)
+
+# Канал outbox -> функция отправки (ошибка пробрасывается и сохраняется в строке)
+CHANNELS = {
+    'email': partial(send_email_notification, raise_errors=True),
+    'telegram': partial(send_telegram_notification, raise_errors=True),
+}
+
+MAX_SENDERS = 8
+
+
+def enabled_channels():
+    """Каналы, для которых заданы учетные данные"""
+    channels = []
+    if settings.GMAIL_USER and settings.GMAIL_APP_PASSWORD:
+        channels.append('email')
+    if settings.TELEGRAM_BOT_TOKEN and settings.TELEGRAM_CHAT_ID:
+        channels.append('telegram')
+    return channels
+
+
+def enqueue_contact_notifications(contact_message):
+    """
+    Записывает уведомления в outbox в той же транзакции, что и сообщение;
+    отправка - воркером после коммита, запрос формы ее не ждет
+    """
+    ContactNotification.objects.bulk_create([
+        ContactNotification(contact_message=contact_message, channel=channel)
+        for channel in enabled_channels()
+    ], ignore_conflicts=True)
+    transaction.on_commit(schedule_delivery)
+
+
+def schedule_delivery():
+    """Разбудить Celery-воркер; если брокер недоступен - строки заберет периодический проход"""
+    if getattr(settings, 'CONTACT_NOTIFICATIONS_DISPATCH', 'celery') != 'celery':
+        return
+    from .tasks import deliver_contact_notifications
+    try:
+        deliver_contact_notifications.apply_async(retry=False)
+    except Exception as e:
+        logger.warning(f"Notification worker is unavailable, outbox will be delivered later: {str(e)}")
+
+
+def retry_delay(attempts):
+    """Экспоненциальная задержка: base, 2*base, 4*base... но не больше RETRY_MAX"""
+    delay = settings.CONTACT_NOTIFICATION_RETRY_BASE * 2 ** (attempts - 1)
+    return timedelta(seconds=min(delay, settings.CONTACT_NOTIFICATION_RETRY_MAX))
+
+
+def claim_due(limit):
+    """
+    Забрать строки, которым пора отправляться. Строки, зависшие в sending
+    (воркер упал посреди отправки), возвращаются в работу по таймауту
+    """
+    now = timezone.now()
+    stale = now - timedelta(seconds=settings.CONTACT_NOTIFICATION_SENDING_TIMEOUT)
+    with transaction.atomic():
+        due = list(
+            ContactNotification.objects.select_for_update(skip_locked=True, of=('self',))
+            .filter(Q(status='pending', next_attempt_at__lte=now) | Q(status='sending', updated_at__lt=stale))
+            .select_related('contact_message')
+            .order_by('next_attempt_at')[:limit]
+        )
+        ContactNotification.objects.filter(pk__in=[notification.pk for notification in due]).update(
+            status='sending', updated_at=now
+        )
+    return due
+
+
+def send(notification):
+    """Выполняется в потоке пула: только сеть, без обращений к БД"""
+    try:
+        CHANNELS[notification.channel](notification.contact_message)
+    except Exception as e:
+        return str(e) or e.__class__.__name__
+    return None
+
+
+def record_result(notification, error):
+    now = timezone.now()
+    notification.attempts += 1
+    if error is None:
+        notification.status = 'sent'
+        notification.sent_at = now
+        notification.last_error = ''
+    elif notification.attempts >= settings.CONTACT_NOTIFICATION_MAX_ATTEMPTS:
+        notification.status = 'failed'
+        notification.last_error = error
+    else:
+        notification.status = 'pending'
+        notification.next_attempt_at = now + retry_delay(notification.attempts)
+        notification.last_error = error
+    notification.save(update_fields=['status', 'attempts', 'sent_at', 'next_attempt_at', 'last_error', 'updated_at'])
+    return notification.status
+
+
+def deliver_due(limit=50):
+    """Отправить все созревшие уведомления; каналы и сообщения отправляются параллельно"""
+    due = claim_due(limit)
+    results = {'sent': 0, 'pending': 0, 'failed': 0}
+    if not due:
+        return results
+
+    with ThreadPoolExecutor(max_workers=min(len(due), MAX_SENDERS)) as pool:
+        # В копии контекста запроса: внешние вызовы попадают в Server-Timing
+        futures = [timing.submit(pool, send, notification) for notification in due]
+        errors = [future.result() for future in futures]
+
+    for notification, error in zip(due, errors):
+        results[record_result(notification, error)] += 1
+    logger.info(f"Contact notifications delivered: {results}")
+    return results
@@ -1,8 +1,7 @@
 from django.db.models.signals import post_save
 from django.dispatch import receiver
-from django.conf import settings
 from .models import ContactMessage
-from .utils import send_contact_notification
+from .notifications import enqueue_contact_notifications
 import logging
 
 logger = logging.getLogger(__name__)
@@ -10,12 +9,9 @@ logger = logging.getLogger(__name__)
 @receiver(post_save, sender=ContactMessage)
 def contact_message_created(sender, instance, created, **kwargs):
     """
-    Автоматически отправляем уведомления при создании нового сообщения
+    Автоматически ставим уведомления в очередь при создании нового сообщения
     """
     if created:  # Только для новых сообщений
-        try:
-            # Отправляем уведомления (Email + Telegram)
-            send_contact_notification(instance)
-            logger.info(f"Notifications sent for contact message: {instance.id}")
-        except Exception as e:
-            logger.error(f"Failed to send notifications for contact message {instance.id}: {str(e)}")
+        # Email + Telegram ставятся в outbox и отправляются воркером после коммита
+        enqueue_contact_notifications(instance)
+        logger.info(f"Notifications queued for contact message: {instance.id}")
@@ -0,0 +1,16 @@
+from celery import shared_task
+
+from . import newsletters
+from .notifications import deliver_due
+
+
+@shared_task
+def deliver_contact_notifications():
+    """Отправляет уведомления из outbox (по сигналу и периодически - для повторов)"""
+    return deliver_due()
+
+
+@shared_task
+def send_due_newsletters():
+    """Запускает запланированные рассылки и возобновляет прерванные"""
+    return newsletters.send_due_newsletters()
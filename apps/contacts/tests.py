@@ -1,3 +1,127 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+from django.core import mail
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from apps.blog.models import Subscription
+from . import newsletters, notifications
+from .models import ContactMessage, ContactNotification, Newsletter
+
+
+@override_settings(GMAIL_USER='me@example.com', GMAIL_APP_PASSWORD='secret', TELEGRAM_BOT_TOKEN='token', TELEGRAM_CHAT_ID='1')
+class ContactNotificationOutboxTest(TestCase):
+    """Уведомления о сообщении идут через outbox, а не внутри запроса формы"""
+
+    def create_message(self):
+        return ContactMessage.objects.create(
+            name='Guest', email='guest@example.com', subject='Hello', message='Hi there',
+        )
+
+    def test_post_only_queues_notifications(self):
+        client = APIClient(HTTP_HOST='localhost')
+        email = mock.Mock()
+        with mock.patch.dict(notifications.CHANNELS, {'email': email, 'telegram': mock.Mock()}):
+            response = client.post('/api/contacts/messages/', {
+                'name': 'Guest', 'email': 'guest@example.com', 'subject': 'Hello', 'message': 'Hi there',
+            }, format='json')
+        self.assertEqual(response.status_code, 201)
+        email.assert_not_called()
+        self.assertEqual(
+            set(ContactNotification.objects.values_list('channel', 'status')),
+            {('email', 'pending'), ('telegram', 'pending')},
+        )
+
+    def test_failed_channel_is_retried_with_backoff(self):
+        message = self.create_message()
+        failing = mock.Mock(side_effect=ConnectionError('SMTP is down'))
+        with mock.patch.dict(notifications.CHANNELS, {'email': failing, 'telegram': mock.Mock()}):
+            results = notifications.deliver_due()
+        self.assertEqual(results, {'sent': 1, 'pending': 1, 'failed': 0})
+
+        email = message.notifications.get(channel='email')
+        self.assertEqual((email.status, email.attempts, email.last_error), ('pending', 1, 'SMTP is down'))
+        self.assertGreater(email.next_attempt_at, timezone.now())
+        self.assertEqual(message.notifications.get(channel='telegram').status, 'sent')
+
+        # Пока задержка не вышла, повторной отправки нет
+        with mock.patch.dict(notifications.CHANNELS, {'email': failing}):
+            self.assertEqual(notifications.deliver_due(), {'sent': 0, 'pending': 0, 'failed': 0})
+
+    @override_settings(CONTACT_NOTIFICATION_MAX_ATTEMPTS=1)
+    def test_gives_up_after_max_attempts(self):
+        message = self.create_message()
+        failing = mock.Mock(side_effect=ConnectionError('SMTP is down'))
+        with mock.patch.dict(notifications.CHANNELS, {'email': failing, 'telegram': failing}):
+            notifications.deliver_due()
+        self.assertEqual(set(message.notifications.values_list('status', flat=True)), {'failed'})
+
+
+class NewsletterDeliveryTest(TestCase):
+    """Рассылка уходит пачками по языкам и после сбоя не дублирует письма"""
+
+    def setUp(self):
+        for number, language in enumerate(['en', 'en', 'ru', 'he', 'ru']):
+            Subscription.objects.create(email=f'reader{number}@example.com', language=language)
+        Subscription.objects.create(email='gone@example.com', is_active=False)
+        self.newsletter = Newsletter.objects.create(
+            subject_en='News', subject_ru='Новости', content_en='<p>Hello</p>', content_ru='<p>Привет</p>',
+        )
+
+    def send(self):
+        self.assertTrue(newsletters.start_newsletter(self.newsletter.pk, stale_before=timezone.now()))
+        return newsletters.send_newsletter(self.newsletter, batch_size=2, connections=2)
+
+    def test_sends_language_variants_once_per_subscriber(self):
+        report = self.send()
+        self.assertEqual(report['sent'], 5)
+        self.assertEqual(report['languages'], {'en': 2, 'ru': 2, 'he': 1})
+        subjects = {message.to[0]: message.subject for message in mail.outbox}
+        self.assertEqual(subjects['reader2@example.com'], 'Новости')
+        self.assertEqual(subjects['reader3@example.com'], 'News')  # нет иврита - английская версия
+        self.assertNotIn('gone@example.com', subjects)
+
+        self.newsletter.refresh_from_db()
+        self.assertEqual((self.newsletter.status, self.newsletter.recipients_count), ('sent', 5))
+
+    def test_resume_does_not_resend(self):
+        newsletters.queue_recipients(self.newsletter)
+        deliveries = list(self.newsletter.deliveries.order_by('id'))
+        # Прошлый запуск упал: два письма записаны, одно было в полете
+        self.newsletter.deliveries.filter(pk__in=[deliveries[0].pk, deliveries[1].pk]).update(status='sent')
+        self.newsletter.deliveries.filter(pk=deliveries[2].pk).update(status='sending')
+        Newsletter.objects.filter(pk=self.newsletter.pk).update(status='sending')
+
+        report = self.send()
+        self.assertEqual((report['sent'], report['interrupted']), (2, 1))
+        self.assertEqual(
+            sorted(message.to[0] for message in mail.outbox),
+            sorted(delivery.email for delivery in deliveries[3:]),
+        )
+
+    def test_connection_is_reopened_after_send_error(self):
+        newsletters.queue_recipients(self.newsletter)
+        deliveries = list(self.newsletter.deliveries.order_by('id')[:3])
+        connection = mock.Mock()
+        connection.send_messages.side_effect = [ConnectionError('dropped'), 1, 1]
+        results = newsletters.send_chunk(connection, deliveries, newsletters.render_variants(self.newsletter))
+        self.assertEqual([error for _, error in results], ['dropped', None, None])
+        # Закрыли и сразу открыли: остальные письма идут по одному постоянному соединению
+        self.assertEqual(connection.close.call_count, 1)
+        self.assertEqual(connection.open.call_count, 1)
+
+    def test_pool_failure_is_retried_then_marked_failed(self):
+        opened, broken = mock.Mock(), mock.Mock()
+        broken.open.side_effect = OSError('535 Authentication failed')
+        with override_settings(NEWSLETTER_MAX_ATTEMPTS=2):
+            for attempt, status in ((1, 'sending'), (2, 'failed')):
+                with mock.patch.object(newsletters, 'get_connection', side_effect=[opened, broken]):
+                    with self.assertRaises(newsletters.SMTPUnavailableError):
+                        self.send()
+                self.newsletter.refresh_from_db()
+                self.assertEqual((self.newsletter.attempts, self.newsletter.status), (attempt, status))
+                self.assertEqual(self.newsletter.last_error, '535 Authentication failed')
+        opened.close.assert_called()
+        self.assertEqual(mail.outbox, [])
+        # failed больше не возобновляется
+        self.assertFalse(newsletters.start_newsletter(self.newsletter.pk, stale_before=timezone.now()))
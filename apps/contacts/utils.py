@@ -1,18 +1,21 @@
-import smtplib
-import requests
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
 from django.conf import settings
 from django.template.loader import render_to_string
 from django.utils.html import strip_tags
+from apps.core import timing
 import logging
 
 logger = logging.getLogger(__name__)
 
-def send_email_notification(contact_message):
+def send_email_notification(contact_message, raise_errors=False):
     """
     Отправка email уведомления через Gmail SMTP
+    (raise_errors=True - пробросить ошибку, чтобы outbox сохранил ее и повторил попытку)
     """
+    # smtplib и email.mime нужны только при отправке - не грузим их на холодном старте
+    import smtplib
+    from email.mime.text import MIMEText
+    from email.mime.multipart import MIMEMultipart
+
     try:
         # Создаем сообщение
         msg = MIMEMultipart('alternative')
@@ -91,7 +94,7 @@ ID: #{contact_message.id}
         msg.attach(part2)
         
         # Отправляем через Gmail SMTP
-        with smtplib.SMTP('smtp.gmail.com', 587) as server:
+        with timing.measure('http'), smtplib.SMTP('smtp.gmail.com', 587) as server:
             server.starttls()
             server.login(settings.GMAIL_USER, settings.GMAIL_APP_PASSWORD)
             server.send_message(msg)
@@ -101,12 +104,16 @@ ID: #{contact_message.id}
         
     except Exception as e:
         logger.error(f"Failed to send email notification: {str(e)}")
+        if raise_errors:
+            raise
         return False
 
-def send_telegram_notification(contact_message):
+def send_telegram_notification(contact_message, raise_errors=False):
     """
     Отправка Telegram уведомления
     """
+    import requests
+
     try:
         # Форматируем сообщение для Telegram
         message = f"""
@@ -138,7 +145,8 @@ def send_telegram_notification(contact_message):
             'disable_web_page_preview': True
         }
         
-        response = requests.post(url, json=payload, timeout=10)
+        with timing.measure('http'):
+            response = requests.post(url, json=payload, timeout=10)
         response.raise_for_status()
         
         logger.info(f"Telegram notification sent for contact message: {contact_message.id}")
@@ -146,6 +154,8 @@ def send_telegram_notification(contact_message):
         
     except Exception as e:
         logger.error(f"Failed to send Telegram notification: {str(e)}")
+        if raise_errors:
+            raise
         return False
 
 def send_contact_notification(contact_message):
@@ -3,4 +3,17 @@ from django.apps import AppConfig
 
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'apps.core'
\ No newline at end of file
+    name = 'apps.core'
+
+    def ready(self):
+        """Подключаем сигналы инвалидации кеша, поискового индекса, снимков главной и настроек, лент, изображений"""
+        from .signals import (
+            connect_cache_signals, connect_feed_signals, connect_homepage_signals,
+            connect_image_signals, connect_search_signals, connect_site_config_signals,
+        )
+        connect_cache_signals()
+        connect_search_signals()
+        connect_site_config_signals()
+        connect_homepage_signals()
+        connect_feed_signals()
+        connect_image_signals()
@@ -0,0 +1,248 @@
+import hashlib
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework.response import Response
+
+from . import conditional, edge, static_export, timing
+from .snapshots import is_snapshot_request
+
+VERSION_PREFIX = 'api:version'
+# v2: в кеше (данные, ETag, Last-Modified), а не только данные
+RESPONSE_PREFIX = 'api:response:v2'
+STATS_PREFIX = 'api:stats'
+
+# Модели, изменения которых инвалидируют кеш ответов
+CACHED_APPS = {'blog', 'portfolio', 'core'}
+CACHED_MODELS = {'auth.user'}
+# Сохранения только этих полей не попадают ни в один ответ: вход пользователя пишет лишь last_login
+IGNORED_UPDATE_FIELDS = {'auth.user': {'last_login'}}
+
+
+def is_cached_model(model):
+    return model._meta.app_label in CACHED_APPS or model._meta.label_lower in CACHED_MODELS
+
+
+def is_ignored_save(sender, update_fields):
+    """save(update_fields=...) только по IGNORED_UPDATE_FIELDS: кеш, CDN, экспорт и главную не трогаем"""
+    ignored = IGNORED_UPDATE_FIELDS.get(sender._meta.label_lower)
+    return bool(ignored and update_fields and set(update_fields) <= ignored)
+
+
+def _new_version():
+    # Версия от времени: если ключ версии вытеснен из кеша, старые ответы не оживут
+    return time.time_ns() // 1000
+
+
+def version_key(resource):
+    return f'{VERSION_PREFIX}:{resource}'
+
+
+def object_resources(instance):
+    """Ключи ресурса для конкретного объекта: по pk и по slug"""
+    label = instance._meta.label_lower
+    resources = [f'{label}:pk={instance.pk}']
+    slug = getattr(instance, 'slug', None)
+    if slug:
+        resources.append(f'{label}:slug={slug}')
+    return resources
+
+
+def get_versions(resources):
+    """Текущие версии ресурсов одним запросом к кешу"""
+    keys = [version_key(resource) for resource in resources]
+    versions = cache.get_many(keys)
+    missing = {key: _new_version() for key in keys if key not in versions}
+    if missing:
+        for key, value in missing.items():
+            cache.add(key, value, timeout=None)
+        versions.update(cache.get_many(list(missing)))
+    return [versions.get(key, 0) for key in keys]
+
+
+def bump_versions(resources):
+    """Инвалидировать все ответы, построенные из этих ресурсов"""
+    for resource in set(resources):
+        key = version_key(resource)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, _new_version(), timeout=None)
+
+
+def invalidate_resources(resources, purge_edge=True):
+    """
+    Сбросить версии после коммита транзакции, чтобы не закешировать старые данные.
+    purge_edge - заодно очистить CDN по surrogate-ключам и обновить статический экспорт
+    """
+    resources = list(resources)
+
+    def invalidate():
+        bump_versions(resources)
+        if purge_edge:
+            edge.schedule_purge(resources)
+
+    transaction.on_commit(invalidate)
+    if purge_edge:
+        static_export.queue_export(resources)
+
+
+def invalidate_instance(instance, extra_resources=()):
+    invalidate_resources([instance._meta.label_lower, *object_resources(instance), *extra_resources])
+
+
+def invalidate_objects(model, pks, purge_edge=True):
+    """Инвалидировать детальные страницы объектов по pk (и их slug)"""
+    label = model._meta.label_lower
+    resources = [f'{label}:pk={pk}' for pk in pks]
+    if any(field.name == 'slug' for field in model._meta.get_fields()):
+        slugs = model.objects.filter(pk__in=pks).values_list('slug', flat=True)
+        resources += [f'{label}:slug={slug}' for slug in slugs]
+    invalidate_resources(resources, purge_edge)
+
+
+def record_stat(name, outcome):
+    key = f'{STATS_PREFIX}:{name}:{outcome}'
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, timeout=None):
+            cache.incr(key)
+
+
+def get_stats(names):
+    """Счетчики попаданий/промахов по эндпоинтам"""
+    keys = {name: (f'{STATS_PREFIX}:{name}:hit', f'{STATS_PREFIX}:{name}:miss') for name in names}
+    values = cache.get_many([key for pair in keys.values() for key in pair])
+    stats = {}
+    for name, (hit_key, miss_key) in keys.items():
+        hits, misses = values.get(hit_key, 0), values.get(miss_key, 0)
+        total = hits + misses
+        stats[name] = {
+            'hits': hits,
+            'misses': misses,
+            'hit_ratio': round(hits / total, 4) if total else 0.0,
+        }
+    return stats
+
+
+class CachedResponseMixin(timing.TimedSerializerMixin):
+    """
+    Кеширование публичных GET-ответов ViewSet.
+    Ключ включает версии моделей из cache_dependencies (для списков)
+    или версию самого объекта (для детального просмотра).
+    Повторный запрос с валидатором получает 304 без сериализации
+    """
+    cache_dependencies = ()
+    cache_timeout = None
+    # ETag/Last-Modified и 304 на If-None-Match/If-Modified-Since
+    conditional_get = True
+    # Политика CDN: {'s_maxage': сек, 'stale_while_revalidate': сек}; None - без Cache-Control
+    edge_cache = None
+    edge_cache_actions = ('list', 'retrieve', 'featured')
+    registry = []
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        CachedResponseMixin.registry.append(cls)
+
+    @classmethod
+    def cached_labels(cls):
+        """Метки моделей всех кешируемых ViewSet (для статистики)"""
+        return sorted({
+            viewset.queryset.model._meta.label_lower
+            for viewset in cls.registry if viewset.queryset is not None
+        })
+
+    def get_cache_name(self):
+        return self.queryset.model._meta.label_lower
+
+    def get_cache_resources(self):
+        model_label = self.queryset.model._meta.label_lower
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        if lookup_url_kwarg in self.kwargs:
+            lookup = f'{self.lookup_field}={self.kwargs[lookup_url_kwarg]}'
+            others = [label for label in self.cache_dependencies if label != model_label]
+            return [f'{model_label}:{lookup}', *others]
+        return [model_label, *self.cache_dependencies]
+
+    def get_response_cache_key(self, request):
+        resources = self.get_cache_resources()
+        versions = get_versions(resources)
+        language = getattr(request, 'LANGUAGE_CODE', settings.LANGUAGE_CODE)
+        raw = f'{request.build_absolute_uri()}|{language}|{versions}'
+        digest = hashlib.md5(raw.encode()).hexdigest()
+        return f'{RESPONSE_PREFIX}:{self.get_cache_name()}:{self.action}:{digest}'
+
+    def get_validators(self):
+        """Валидатор из БД до сериализации: updated_at объекта или max(updated_at) + COUNT списка"""
+        queryset = self.filter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        if lookup_url_kwarg in self.kwargs:
+            return conditional.detail_validator(queryset, **{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        return conditional.list_validator(queryset)
+
+    def cached_response(self, request, handler, *args, **kwargs):
+        # Экспорт читает БД напрямую: версии кеша могут быть еще не сброшены
+        if request.method != 'GET' or is_snapshot_request(request):
+            return handler(request, *args, **kwargs)
+
+        name = self.get_cache_name()
+        with timing.measure('cache'):
+            key = self.get_response_cache_key(request)
+            entry = cache.get(key)
+        if entry is not None:
+            record_stat(name, 'hit')
+            timing.count('cache_hits')
+            data, etag, last_modified = entry
+            if not etag:
+                return Response(data)
+            if conditional.is_not_modified(request, etag, last_modified):
+                return conditional.not_modified_response(etag, last_modified)
+            return conditional.set_validators(Response(data), etag, last_modified)
+
+        record_stat(name, 'miss')
+        timing.count('cache_misses')
+        etag = last_modified = None
+        if self.conditional_get:
+            last_modified, total = self.get_validators()
+            # Объект не найден (total только у списков): без валидаторов, обработчик ответит 404
+            if last_modified is not None or total is not None:
+                etag = conditional.make_etag(key, last_modified, total)
+            if total is not None:
+                # Список: удаление или снятие с публикации не увеличивает max(updated_at) -
+                # If-Modified-Since дал бы ложный 304, проверяем только ETag с числом строк
+                last_modified = None
+            if conditional.is_not_modified(request, etag, last_modified):
+                return conditional.not_modified_response(etag, last_modified)
+
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            timeout = self.cache_timeout or settings.API_CACHE_TIMEOUT
+            cache.set(key, (response.data, etag, last_modified), timeout)
+            if etag:
+                conditional.set_validators(response, etag, last_modified)
+        return response
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if self.edge_cache and request.method in ('GET', 'HEAD') and self.action in self.edge_cache_actions:
+            edge.set_edge_headers(request, response, self.edge_cache, self.get_cache_resources())
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(request, super().list, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(request, super().retrieve, *args, **kwargs)
+
+
+def cache_response(method):
+    """Кеширование дополнительных @action эндпоинтов ViewSet с CachedResponseMixin"""
+    @wraps(method)
+    def wrapper(self, request, *args, **kwargs):
+        return self.cached_response(request, method.__get__(self), *args, **kwargs)
+    return wrapper
@@ -0,0 +1,69 @@
+import hashlib
+from calendar import timegm
+
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Max
+from django.utils.http import http_date, parse_etags, parse_http_date_safe, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+
+def has_updated_at(model):
+    return any(field.name == 'updated_at' for field in model._meta.concrete_fields)
+
+
+def list_validator(queryset):
+    """Список: (max updated_at, число строк) одним запросом"""
+    queryset = queryset.order_by()
+    if not has_updated_at(queryset.model):
+        return None, queryset.count()
+    result = queryset.aggregate(last_modified=Max('updated_at'), total=Count('pk'))
+    return result['last_modified'], result['total']
+
+
+def detail_validator(queryset, **lookup):
+    """Объект: его updated_at (None - объекта нет, пусть ответит обычный обработчик)"""
+    if not has_updated_at(queryset.model):
+        return None, None
+    try:
+        values = list(queryset.order_by().filter(**lookup).values_list('updated_at', flat=True)[:1])
+    except (TypeError, ValueError, ValidationError):
+        # /skills/abc/ при поиске по pk: get_object() ответит обычным 404
+        return None, None
+    return (values[0] if values else None), None
+
+
+def make_etag(key, last_modified, total):
+    """Слабый ETag: ключ ответа (URI, язык, версии ресурсов) + валидатор из БД"""
+    raw = f'{key}|{last_modified.isoformat() if last_modified else ""}|{total}'
+    return f'W/{quote_etag(hashlib.md5(raw.encode()).hexdigest())}'
+
+
+def is_not_modified(request, etag, last_modified):
+    """
+    If-None-Match важнее If-Modified-Since (RFC 9110, 13.2.2).
+    Без ETag (объекта нет) ответ никогда не "не изменился" - и для If-None-Match: *
+    """
+    if not etag:
+        return False
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+    if if_none_match:
+        # Слабое сравнение: W/ не учитывается
+        tags = {tag.removeprefix('W/') for tag in parse_etags(if_none_match)}
+        return '*' in tags or etag.removeprefix('W/') in tags
+
+    if_modified_since = parse_http_date_safe(request.META.get('HTTP_IF_MODIFIED_SINCE', ''))
+    if if_modified_since is None or last_modified is None:
+        return False
+    return timegm(last_modified.utctimetuple()) <= if_modified_since
+
+
+def set_validators(response, etag, last_modified):
+    response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(timegm(last_modified.utctimetuple()))
+    return response
+
+
+def not_modified_response(etag, last_modified):
+    return set_validators(Response(status=status.HTTP_304_NOT_MODIFIED), etag, last_modified)
@@ -0,0 +1,255 @@
+import logging
+import threading
+import time
+import uuid
+from collections import defaultdict
+
+from django.apps import apps
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+
+from .cache import invalidate_objects
+from .snapshots import is_snapshot_request
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryViewBuffer:
+    """Буфер просмотров в памяти процесса"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = defaultdict(int)
+
+    def incr(self, key):
+        with self._lock:
+            self._pending[key] += 1
+            return self._pending[key]
+
+    def drain(self):
+        """Забрать накопленное: (метка для ack/restore, {ключ: прирост})"""
+        with self._lock:
+            pending, self._pending = dict(self._pending), defaultdict(int)
+        return None, pending
+
+    def ack(self, token):
+        """Пачка записана в БД - в памяти держать нечего"""
+
+    def restore(self, token, pending):
+        """Запись не удалась - возвращаем просмотры в буфер к новым"""
+        with self._lock:
+            for key, count in pending.items():
+                self._pending[key] += count
+
+
+class RedisViewBuffer:
+    """Буфер просмотров в Redis (общий для всех воркеров)"""
+    HASH_KEY = 'views:buffer'
+    FLUSHING_PREFIX = f'{HASH_KEY}:flushing:'
+
+    def __init__(self, url, lease=300):
+        import redis
+        self._redis = redis.Redis.from_url(url)
+        self.lease = lease
+
+    def incr(self, key):
+        return int(self._redis.hincrby(self.HASH_KEY, key, 1))
+
+    def flushing_key(self):
+        """views:buffer:flushing:<unix-время>:<uuid> - по времени видно, что сброс завис"""
+        return f'{self.FLUSHING_PREFIX}{int(time.time())}:{uuid.uuid4().hex}'
+
+    def drain(self):
+        """
+        RENAME атомарен: новые просмотры пишутся уже в свежий хеш. Забранный хеш
+        удаляется только после коммита в БД (ack), при ошибке - возвращается (restore)
+        """
+        import redis
+        self.recover()
+        flushing_key = self.flushing_key()
+        try:
+            self._redis.rename(self.HASH_KEY, flushing_key)
+        except redis.ResponseError:
+            return None, {}
+        return flushing_key, self.read(flushing_key)
+
+    def read(self, key):
+        return {field.decode(): int(value) for field, value in self._redis.hgetall(key).items()}
+
+    def recover(self):
+        """
+        Процесс умер между drain и ack/restore: его хеш старше lease возвращается в буфер.
+        Сначала RENAME под свое имя - один хеш не вернут два процесса; упадем и тут -
+        новое имя подберет следующий сброс
+        """
+        import redis
+        cutoff = time.time() - self.lease
+        recovered = 0
+        for key in self._redis.scan_iter(match=f'{self.FLUSHING_PREFIX}*'):
+            key = key.decode() if isinstance(key, bytes) else key
+            started = key[len(self.FLUSHING_PREFIX):].split(':', 1)[0]
+            if not started.isdigit() or int(started) > cutoff:
+                continue
+            claim = self.flushing_key()
+            try:
+                self._redis.rename(key, claim)
+            except redis.ResponseError:
+                continue
+            self.restore(claim, self.read(claim))
+            recovered += 1
+        if recovered:
+            logger.warning(f"Recovered {recovered} abandoned view buffer flushes")
+        return recovered
+
+    def ack(self, token):
+        if token:
+            self._redis.delete(token)
+
+    def restore(self, token, pending):
+        """MULTI: просмотры возвращаются и хеш сброса удаляется вместе"""
+        pipe = self._redis.pipeline()
+        for key, count in pending.items():
+            pipe.hincrby(self.HASH_KEY, key, count)
+        if token:
+            pipe.delete(token)
+        pipe.execute()
+
+
+class ViewCounter:
+    """
+    Агрегирует просмотры в буфере и сбрасывает их в БД пакетами,
+    вместо UPDATE на каждый просмотр. VIEW_COUNTER_BACKEND: redis - общий буфер всех
+    воркеров; direct - UPDATE сразу (без Redis: буфер в памяти serverless-функции
+    теряется при ее остановке, а команда/задача сброса его не видят); memory - только разработка
+    """
+
+    def __init__(self):
+        self._buffer = None
+        self._last_flush = time.monotonic()
+
+    @property
+    def buffer(self):
+        if self._buffer is None:
+            if self.backend == 'redis':
+                self._buffer = RedisViewBuffer(
+                    settings.VIEW_COUNTER_REDIS_URL, getattr(settings, 'VIEW_COUNTER_FLUSH_LEASE', 300),
+                )
+            else:
+                self._buffer = MemoryViewBuffer()
+        return self._buffer
+
+    @property
+    def backend(self):
+        return getattr(settings, 'VIEW_COUNTER_BACKEND', 'direct')
+
+    @staticmethod
+    def make_key(model, pk):
+        return f'{model._meta.label_lower}:{pk}'
+
+    def increment_for(self, model, pk):
+        """
+        Добавить просмотр по pk, без загрузки объекта (ответ может быть из кеша),
+        и вернуть количество еще не записанных в ответ просмотров
+        """
+        if self.backend == 'direct':
+            # Незаписанных просмотров нет. Кеш ответа не сбрасываем (ETag менялся бы на каждый
+            # просмотр): закешированная страница показывает свое значение до TTL, без "+1"
+            model._base_manager.filter(pk=pk).update(views_count=F('views_count') + 1)
+            return 0
+        pending = self.buffer.incr(self.make_key(model, pk))
+        self.maybe_flush()
+        return pending
+
+    def maybe_flush(self):
+        """Сбросить буфер, если прошел интервал (для serverless без отдельного воркера)"""
+        interval = getattr(settings, 'VIEW_COUNTER_FLUSH_INTERVAL', 60)
+        if time.monotonic() - self._last_flush >= interval:
+            self.flush()
+
+    def flush(self):
+        """
+        Записать накопленные просмотры: один UPDATE на группу объектов с одинаковым приростом.
+        Буфер подтверждается только после коммита; ошибка БД возвращает просмотры в буфер
+        """
+        self._last_flush = time.monotonic()
+        if self.backend == 'direct':
+            return 0
+        token, pending = self.buffer.drain()
+        if not pending:
+            return 0
+
+        grouped = defaultdict(lambda: defaultdict(list))
+        for key, count in pending.items():
+            label, pk = key.rsplit(':', 1)
+            grouped[label][count].append(pk)
+
+        updated = 0
+        try:
+            with transaction.atomic():
+                for label, by_count in grouped.items():
+                    model = apps.get_model(label)
+                    for count, pks in by_count.items():
+                        updated += model.objects.filter(pk__in=pks).update(
+                            views_count=F('views_count') + count
+                        )
+                    # Закешированные страницы показывают сохраненное значение - сбрасываем их;
+                    # CDN не чистим: счетчик там досчитается через s-maxage, а не purge на каждый сброс
+                    invalidate_objects(model, [pk for pks in by_count.values() for pk in pks], purge_edge=False)
+        except Exception:
+            self.buffer.restore(token, pending)
+            raise
+        self.buffer.ack(token)
+        logger.info(f"Flushed {sum(pending.values())} buffered views into {updated} rows")
+        return updated
+
+
+view_counter = ViewCounter()
+
+
+class ViewCountingMixin:
+    """
+    Детальный просмотр ViewSet считается и при 200, и при 304 на условный GET:
+    повторный визит с ETag - тоже просмотр. В теле 200 - сохраненное значение + буфер.
+    Детальный ответ не кешируется CDN: попадание в CDN не дошло бы до счетчика,
+    и просмотры занижались бы на долю попаданий. Браузер перепроверяет по ETag (304 считается)
+    """
+    counted_statuses = (200, 304)
+
+    @property
+    def edge_cache_actions(self):
+        # Статический экспорт берет ресурсы файла из Surrogate-Key детального ответа
+        if is_snapshot_request(self.request):
+            return ('list', 'retrieve', 'featured')
+        return ('list', 'featured')
+
+    def retrieve(self, request, *args, **kwargs):
+        response = super().retrieve(request, *args, **kwargs)
+        if response.status_code not in self.counted_statuses or is_snapshot_request(request):
+            return response
+        data = response.data if response.status_code == 200 else None
+        pk = data.get('id') if data else None
+        if pk is None:
+            pk = self.viewed_pk()
+            if pk is None:
+                return response
+        pending = view_counter.increment_for(self.queryset.model, pk)
+        if data is not None and 'views_count' in data:
+            response.data = {**data, 'views_count': data['views_count'] + pending}
+        return response
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if self.action == 'retrieve' and 'retrieve' not in self.edge_cache_actions \
+                and response.status_code in self.counted_statuses:
+            response['Cache-Control'] = 'private, max-age=0'
+        return response
+
+    def viewed_pk(self):
+        """Тела нет (304) или в нем нет id (?fields=): pk из URL или по lookup одним индексным запросом"""
+        value = self.kwargs[self.lookup_url_kwarg or self.lookup_field]
+        if self.lookup_field == 'pk':
+            return value
+        return self.queryset.model._base_manager.filter(
+            **{self.lookup_field: value}
+        ).values_list('pk', flat=True).first()
@@ -0,0 +1,73 @@
+import logging
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+from . import timing
+
+logger = logging.getLogger(__name__)
+
+CACHEABLE_STATUSES = (200, 304)
+
+
+def cache_control(policy):
+    """Браузер всегда перепроверяет (ETag), CDN держит s-maxage и отдает устаревшее, пока обновляет"""
+    directives = ['public', 'max-age=0', f"s-maxage={policy['s_maxage']}"]
+    if policy.get('stale_while_revalidate'):
+        directives.append(f"stale-while-revalidate={policy['stale_while_revalidate']}")
+    return ', '.join(directives)
+
+
+def surrogate_keys(resources):
+    """Ключи ответа для CDN - те же ресурсы, что и в версиях кеша: blog.post, blog.post:pk=1, ..."""
+    return ' '.join(dict.fromkeys(resources))
+
+
+def set_edge_headers(request, response, policy, resources):
+    # Ответ с авторизацией не должен попасть в общий кеш
+    if response.status_code not in CACHEABLE_STATUSES or 'HTTP_AUTHORIZATION' in request.META:
+        return response
+    response['Cache-Control'] = cache_control(policy)
+    response[settings.EDGE_SURROGATE_KEY_HEADER] = surrogate_keys(resources)
+    # Язык ответа выбирается и по Accept-Language - CDN должен различать варианты
+    patch_vary_headers(response, ['Accept-Language'])
+    return response
+
+
+def purge_keys(keys):
+    """POST {"tags": [...]} на EDGE_PURGE_URL; ошибки только в лог - сохранение в админке не падает"""
+    url = getattr(settings, 'EDGE_PURGE_URL', '')
+    keys = sorted(set(keys))
+    if not url or not keys:
+        return False
+
+    import requests
+
+    headers = {}
+    if settings.EDGE_PURGE_TOKEN:
+        headers['Authorization'] = f'Bearer {settings.EDGE_PURGE_TOKEN}'
+    try:
+        with timing.measure('http'):
+            response = requests.post(url, json={'tags': keys}, headers=headers, timeout=settings.EDGE_PURGE_TIMEOUT)
+        response.raise_for_status()
+    except requests.RequestException as e:
+        logger.warning(f"Edge purge failed for {len(keys)} keys: {str(e)}")
+        return False
+    logger.info(f"Edge purge: {len(keys)} keys")
+    return True
+
+
+def schedule_purge(keys):
+    """Вызывается после коммита: сразу или через Celery (EDGE_PURGE_DISPATCH)"""
+    keys = sorted(set(keys))
+    if not keys or not getattr(settings, 'EDGE_PURGE_URL', ''):
+        return
+    if settings.EDGE_PURGE_DISPATCH != 'celery':
+        purge_keys(keys)
+        return
+    from .tasks import purge_edge_keys
+    try:
+        purge_edge_keys.apply_async(args=[keys], retry=False)
+    except Exception as e:
+        logger.warning(f"Purge worker is unavailable, purging inline: {str(e)}")
+        purge_keys(keys)
@@ -0,0 +1,268 @@
+import hashlib
+import math
+from xml.sax.saxutils import escape, quoteattr
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.feedgenerator import rfc2822_date, rfc3339_date
+
+from . import edge
+from .cache import bump_versions, get_versions
+from .localization import LANGUAGES
+from .site_config import get_site_config
+
+FEEDS_PREFIX = 'api:feeds'
+DEFAULT_LANGUAGE = LANGUAGES[0]
+EDGE_CACHE = {'s_maxage': 3600, 'stale_while_revalidate': 86400}
+SITEMAP_NS = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+XHTML_NS = 'http://www.w3.org/1999/xhtml'
+ATOM_NS = 'http://www.w3.org/2005/Atom'
+# Страницы фронтенда без объектов: главная и разделы
+STATIC_PAGES = ('/{lang}/', '/{lang}/blog/', '/{lang}/projects/')
+
+
+class Section:
+    """Публикуемая модель в sitemap и лентах: какие строки брать и куда они ведут на фронтенде"""
+
+    def __init__(self, name, label, path, summary, filters=None):
+        self.name = name
+        self.label = label
+        self.path = path
+        self.summary = summary
+        self.filters = filters or {}
+
+    @property
+    def model(self):
+        return apps.get_model(self.label)
+
+    @property
+    def resource(self):
+        # Отдельный ресурс: правка черновика не сбрасывает sitemap и ленты
+        return f'{self.label}:published'
+
+    def queryset(self):
+        return self.model._default_manager.filter(status='published', **self.filters)
+
+    def url(self, row, language):
+        return f"{settings.PUBLIC_SITE_URL}{self.path.format(lang=language, slug=row['slug'])}"
+
+
+SECTIONS = {
+    'posts': Section('posts', 'blog.post', '/{lang}/blog/{slug}/', 'excerpt', {'is_active': True}),
+    'projects': Section('projects', 'portfolio.project', '/{lang}/projects/{slug}/', 'description'),
+}
+
+
+def section_for_model(model):
+    return next((section for section in SECTIONS.values() if section.label == model._meta.label_lower), None)
+
+
+def invalidate_published(model):
+    """После коммита: новые версии sitemap/лент и очистка их в CDN"""
+    section = section_for_model(model)
+    if section is None:
+        return
+
+    def invalidate():
+        bump_versions([section.resource])
+        edge.schedule_purge([section.resource])
+
+    transaction.on_commit(invalidate)
+
+
+def translated_languages(row):
+    """Языки, на которые объект переведен (есть заголовок)"""
+    return [language for language in LANGUAGES if row.get(f'title_{language}')]
+
+
+def alternate_links(section, row, languages):
+    links = [
+        f'<xhtml:link rel="alternate" hreflang="{language}" href={quoteattr(section.url(row, language))}/>'
+        for language in languages
+    ]
+    links.append(
+        f'<xhtml:link rel="alternate" hreflang="x-default" href={quoteattr(section.url(row, DEFAULT_LANGUAGE))}/>'
+    )
+    return ''.join(links)
+
+
+# -------------------------------------------------------------------- sitemap
+
+def shard_count(section):
+    return max(1, math.ceil(section.queryset().count() / settings.SITEMAP_SHARD_SIZE))
+
+
+def sitemap_index_chunks(request):
+    yield f'<?xml version="1.0" encoding="UTF-8"?>\n<sitemapindex xmlns="{SITEMAP_NS}">'
+    yield f'<sitemap><loc>{escape(request.build_absolute_uri("/sitemap-pages.xml"))}</loc></sitemap>'
+    for section in SECTIONS.values():
+        for shard in range(1, shard_count(section) + 1):
+            location = request.build_absolute_uri(f'/sitemap-{section.name}-{shard}.xml')
+            yield f'<sitemap><loc>{escape(location)}</loc></sitemap>'
+    yield '</sitemapindex>\n'
+
+
+def urlset_open():
+    return f'<?xml version="1.0" encoding="UTF-8"?>\n<urlset xmlns="{SITEMAP_NS}" xmlns:xhtml="{XHTML_NS}">'
+
+
+def sitemap_pages_chunks():
+    yield urlset_open()
+    for path in STATIC_PAGES:
+        links = ''.join(
+            f'<xhtml:link rel="alternate" hreflang="{language}" '
+            f'href={quoteattr(settings.PUBLIC_SITE_URL + path.format(lang=language))}/>'
+            for language in LANGUAGES
+        )
+        for language in LANGUAGES:
+            yield f'<url><loc>{escape(settings.PUBLIC_SITE_URL + path.format(lang=language))}</loc>{links}</url>'
+    yield '</urlset>\n'
+
+
+def sitemap_section_chunks(section, shard):
+    """Шард - срез по pk; строки - values(), без экземпляров моделей"""
+    size = settings.SITEMAP_SHARD_SIZE
+    rows = section.queryset().order_by('pk').values(
+        'pk', 'slug', 'updated_at', *(f'title_{language}' for language in LANGUAGES),
+    )[(shard - 1) * size:shard * size]
+    yield urlset_open()
+    for row in rows.iterator(chunk_size=1000):
+        languages = translated_languages(row)
+        links = alternate_links(section, row, languages)
+        lastmod = row['updated_at'].date().isoformat()
+        for language in languages:
+            yield (f'<url><loc>{escape(section.url(row, language))}</loc>'
+                   f'<lastmod>{lastmod}</lastmod>{links}</url>')
+    yield '</urlset>\n'
+
+
+# ---------------------------------------------------------------------- feeds
+
+def feed_rows(section, language):
+    """Последние FEED_ITEMS объектов, переведенных на язык ленты"""
+    return section.queryset().exclude(**{f'title_{language}': ''}).order_by('-published_at', '-pk').values(
+        'pk', 'slug', 'published_at', 'updated_at',
+        f'{section.summary}_{language}', *(f'title_{other}' for other in LANGUAGES),
+    )[:settings.FEED_ITEMS].iterator(chunk_size=settings.FEED_ITEMS)
+
+
+def feed_title(section, language):
+    site = get_site_config().current
+    name = (getattr(site, f'site_name_{language}', '') or getattr(site, 'site_name_en', '')) or 'Portfolio'
+    return f'{name} - {section.name.capitalize()}'
+
+
+def feed_url(request, section, language, kind):
+    return request.build_absolute_uri(f'/feeds/{section.name}/{language}.{kind}')
+
+
+def rss_chunks(request, section, language):
+    title = escape(feed_title(section, language))
+    yield (f'<?xml version="1.0" encoding="UTF-8"?>\n<rss version="2.0" xmlns:atom="{ATOM_NS}"><channel>'
+           f'<title>{title}</title>'
+           f'<link>{escape(settings.PUBLIC_SITE_URL)}/{language}/</link>'
+           f'<description>{title}</description>'
+           f'<language>{language}</language>'
+           f'<atom:link rel="self" type="application/rss+xml" href={quoteattr(feed_url(request, section, language, "rss"))}/>')
+    # Ленты на других языках
+    for other in LANGUAGES:
+        if other != language:
+            yield (f'<atom:link rel="alternate" hreflang="{other}" type="application/rss+xml" '
+                   f'href={quoteattr(feed_url(request, section, other, "rss"))}/>')
+    for row in feed_rows(section, language):
+        link = escape(section.url(row, language))
+        published = row['published_at'] or row['updated_at']
+        yield (f'<item><title>{escape(row[f"title_{language}"])}</title><link>{link}</link>'
+               f'<guid isPermaLink="true">{link}</guid><pubDate>{rfc2822_date(published)}</pubDate>'
+               f'<description>{escape(row[f"{section.summary}_{language}"])}</description></item>')
+    yield '</channel></rss>\n'
+
+
+def atom_chunks(request, section, language):
+    # <updated> ленты идет до записей - строк не больше FEED_ITEMS, читаем их заранее
+    rows = list(feed_rows(section, language))
+    updated = max((row['updated_at'] for row in rows), default=None) or timezone.now()
+    title = escape(feed_title(section, language))
+    self_url = feed_url(request, section, language, 'atom')
+    yield (f'<?xml version="1.0" encoding="UTF-8"?>\n<feed xmlns="{ATOM_NS}" xml:lang="{language}">'
+           f'<title>{title}</title><id>{escape(self_url)}</id>'
+           f'<link rel="self" href={quoteattr(self_url)}/>'
+           f'<link rel="alternate" href={quoteattr(f"{settings.PUBLIC_SITE_URL}/{language}/")}/>'
+           f'<updated>{rfc3339_date(updated)}</updated>'
+           f'<author><name>{title}</name></author>')
+    for row in rows:
+        link = section.url(row, language)
+        alternates = ''.join(
+            f'<link rel="alternate" hreflang="{other}" href={quoteattr(section.url(row, other))}/>'
+            for other in translated_languages(row) if other != language
+        )
+        published = row['published_at'] or row['updated_at']
+        yield (f'<entry><title>{escape(row[f"title_{language}"])}</title><id>{escape(link)}</id>'
+               f'<link rel="alternate" hreflang="{language}" href={quoteattr(link)}/>{alternates}'
+               f'<published>{rfc3339_date(published)}</published><updated>{rfc3339_date(row["updated_at"])}</updated>'
+               f'<summary>{escape(row[f"{section.summary}_{language}"])}</summary></entry>')
+    yield '</feed>\n'
+
+
+# ---------------------------------------------------------------------- views
+
+def cached_stream(request, name, resources, content_type, chunks):
+    """
+    Попадание - готовые байты из кеша. Промах - ответ отдается по мере генерации,
+    собранный текст кладется в кеш в конце; ключ - от версий ресурсов публикации
+    """
+    versions = get_versions(resources)
+    digest = hashlib.md5(f'{request.get_host()}|{versions}'.encode()).hexdigest()
+    key = f'{FEEDS_PREFIX}:{name}:{digest}'
+    content = cache.get(key)
+    if content is not None:
+        response = HttpResponse(content, content_type=content_type)
+    else:
+        def stream():
+            parts = []
+            for chunk in chunks():
+                parts.append(chunk)
+                yield chunk
+            cache.set(key, ''.join(parts), settings.API_CACHE_TIMEOUT)
+
+        response = StreamingHttpResponse(stream(), content_type=content_type)
+    return edge.set_edge_headers(request, response, EDGE_CACHE, resources)
+
+
+def get_section(name):
+    section = SECTIONS.get(name)
+    if section is None:
+        raise Http404
+    return section
+
+
+def sitemap_index(request):
+    resources = [section.resource for section in SECTIONS.values()]
+    return cached_stream(request, 'sitemap', resources, 'application/xml',
+                         lambda: sitemap_index_chunks(request))
+
+
+def sitemap_pages(request):
+    return cached_stream(request, 'sitemap-pages', [], 'application/xml', sitemap_pages_chunks)
+
+
+def sitemap_section(request, section, shard):
+    section = get_section(section)
+    if shard < 1:
+        raise Http404
+    return cached_stream(request, f'sitemap-{section.name}-{shard}', [section.resource], 'application/xml',
+                         lambda: sitemap_section_chunks(section, shard))
+
+
+def feed(request, section, language, kind):
+    section = get_section(section)
+    if language not in LANGUAGES or kind not in ('rss', 'atom'):
+        raise Http404
+    chunks = rss_chunks if kind == 'rss' else atom_chunks
+    content_type = 'application/rss+xml' if kind == 'rss' else 'application/atom+xml'
+    return cached_stream(request, f'feed-{section.name}-{language}-{kind}', [section.resource],
+                         f'{content_type}; charset=utf-8', lambda: chunks(request, section, language))
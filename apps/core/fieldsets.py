@@ -0,0 +1,120 @@
+from django.db.models import Prefetch
+from rest_framework import serializers
+
+from .localization import LocalizedField
+
+FIELDS_PARAM = 'fields'
+EXPAND_PARAM = 'expand'
+# Поля, которые остаются в ответе всегда (на них держатся счетчики и ссылки фронтенда)
+ALWAYS_INCLUDED = {'id'}
+
+
+def parse_list_param(request, name):
+    """?fields=id,title,categories.slug -> {'id', 'title', 'categories.slug'}; нет параметра - None"""
+    if request is None:
+        return None
+    value = request.query_params.get(name)
+    if value is None:
+        return None
+    return {item.strip() for item in value.split(',') if item.strip()}
+
+
+def field_path(serializer):
+    """Путь вложенного сериализатора от корня: '' для корня, 'categories' для вложенного списка"""
+    names = []
+    node = serializer
+    while node.parent is not None:
+        if not isinstance(node.parent, serializers.ListSerializer):
+            names.append(node.field_name)
+        node = node.parent
+    return '.'.join(reversed(names))
+
+
+class SparseFieldsetSerializerMixin:
+    """
+    ?fields= оставляет только перечисленные поля (вложенные - через точку: categories.slug),
+    ?expand= раскрывает объектами только перечисленные связи из Meta.expandable_fields,
+    остальные отдаются первичными ключами
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        request = self.context.get('request')
+        path = field_path(self)
+
+        requested = parse_list_param(request, FIELDS_PARAM)
+        if requested is not None:
+            prefix = f'{path}.' if path else ''
+            names = {name[len(prefix):].split('.')[0] for name in requested if name.startswith(prefix)}
+            if names or not path:
+                fields = {
+                    name: field for name, field in fields.items()
+                    if name in names or name in ALWAYS_INCLUDED
+                }
+
+        expand = parse_list_param(request, EXPAND_PARAM)
+        if expand is not None and not path:
+            for name in getattr(self.Meta, 'expandable_fields', ()):
+                if name in fields and name not in expand:
+                    many = isinstance(fields[name], serializers.ListSerializer)
+                    fields[name] = serializers.PrimaryKeyRelatedField(read_only=True, many=many)
+        return fields
+
+
+def collapsed_prefetch(prefetch):
+    """Prefetch для связи, отдаваемой только ключами: читаем лишь pk (с теми же фильтрами)"""
+    queryset = prefetch.queryset
+    if queryset is None:
+        return Prefetch(prefetch.prefetch_through)
+    if not queryset.query.where:
+        # Без фильтров аннотации (счетчики) ключам не нужны
+        queryset = queryset.model.objects.all()
+    return Prefetch(prefetch.prefetch_through, queryset=queryset.only('pk'))
+
+
+def required_columns(fields, model):
+    """Колонки модели, которые нужны выбранным полям сериализатора (для .only())"""
+    model_fields = {field.name: field for field in model._meta.concrete_fields}
+    columns = {'pk'}
+    for field in fields.values():
+        if isinstance(field, LocalizedField):
+            columns.update({f'{field.base}_{field.language}', f'{field.base}_en'})
+            continue
+        if field.source == '*' or isinstance(field, serializers.SerializerMethodField):
+            continue
+        attribute = field.source_attrs[0] if field.source_attrs else field.field_name
+        if attribute in model_fields:
+            columns.add(attribute)
+    return sorted(columns)
+
+
+class SparseFieldsetMixin:
+    """
+    Для ViewSet: под ?fields=/?expand= подгоняет select_related/prefetch_related/only().
+    relation_loaders: связь -> путь select_related (FK) или Prefetch (M2M)
+    """
+    relation_loaders = {}
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        requested = parse_list_param(self.request, FIELDS_PARAM)
+        expand = parse_list_param(self.request, EXPAND_PARAM)
+        if requested is None and expand is None:
+            return queryset
+
+        fields = self.get_serializer().fields
+        queryset = queryset.select_related(None).prefetch_related(None)
+        for name, loader in self.relation_loaders.items():
+            if name not in fields:
+                continue
+            expanded = isinstance(fields[name], serializers.BaseSerializer)
+            if isinstance(loader, Prefetch):
+                queryset = queryset.prefetch_related(loader if expanded else collapsed_prefetch(loader))
+            elif expanded:
+                queryset = queryset.select_related(loader)
+
+        if requested is not None:
+            # Колонки сортировки нужны keyset-пагинации для курсора
+            ordering = [name.lstrip('-') for name in getattr(self.paginator, 'ordering', None) or ()]
+            queryset = queryset.only(*required_columns(fields, queryset.model), *ordering)
+        return queryset
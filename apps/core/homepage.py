@@ -0,0 +1,91 @@
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from rest_framework.settings import api_settings
+
+from .localization import LANGUAGES
+from .models import SiteSettings, SEOSettings
+from .renderers import FastJSONRenderer
+from .serializers import SiteSettingsSerializer, SEOSettingsSerializer
+from .snapshots import build_request, content_hash
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_PREFIX = 'api:homepage'
+HOMEPAGE_PATH = '/api/core/homepage/'
+# Модели, из которых собирается главная: их изменение пересобирает снимок
+HOMEPAGE_MODELS = (
+    'core.sitesettings', 'core.seosettings',
+    'portfolio.project', 'portfolio.skill', 'portfolio.technology', 'portfolio.category',
+    'blog.post', 'blog.category', 'blog.tag', 'auth.user',
+)
+# Варианты снимка: без ?lang= (все языковые поля) и по одному на язык
+VARIANTS = (None, *LANGUAGES)
+EDGE_CACHE = {'s_maxage': 300, 'stale_while_revalidate': 3600}
+
+
+def snapshot_key(language):
+    return f'{SNAPSHOT_PREFIX}:{language or "all"}'
+
+
+def build_bundle(request):
+    """Все данные главной теми же сериализаторами и querysets, что и отдельные эндпоинты"""
+    from apps.blog.serializers import PostListSerializer
+    from apps.blog.views import PostViewSet
+    from apps.portfolio.serializers import ProjectListSerializer, SkillSerializer, TechnologySerializer
+    from apps.portfolio.views import ProjectViewSet, SkillViewSet, TechnologyViewSet
+
+    context = {'request': request}
+    limit = api_settings.PAGE_SIZE
+    site_settings = SiteSettings.objects.filter(is_active=True).first()
+    projects = ProjectViewSet.queryset.filter(is_featured=True).defer(
+        *ProjectViewSet.deferred_fields, *ProjectViewSet.list_deferred_fields,
+    )
+    posts = PostViewSet.queryset.filter(is_featured=True).order_by('-published_at')
+    return {
+        'site_settings': SiteSettingsSerializer(site_settings, context=context).data if site_settings else None,
+        'seo_settings': SEOSettingsSerializer(SEOSettings.objects.filter(is_active=True), many=True, context=context).data,
+        'featured_projects': ProjectListSerializer(projects[:limit], many=True, context=context).data,
+        'skills': SkillSerializer(SkillViewSet.queryset.order_by(*SkillViewSet.ordering), many=True, context=context).data,
+        'technologies': TechnologySerializer(
+            TechnologyViewSet.queryset.order_by(*TechnologyViewSet.ordering), many=True, context=context,
+        ).data,
+        'featured_posts': PostListSerializer(posts[:limit], many=True, context=context).data,
+        'generated_at': timezone.now(),
+    }
+
+
+def build_snapshot(language):
+    """
+    Собрать и сохранить вариант снимка: (данные, ETag). Запрос синтетический -
+    снимок не зависит от query string (?fields= и т.п.) того, кто попал на промах
+    """
+    data = build_bundle(build_request(HOMEPAGE_PATH, {'lang': language} if language else None))
+    # ETag - от содержимого без времени сборки: пересборка без изменений его не меняет
+    etag = f'"{content_hash(FastJSONRenderer().render({**data, "generated_at": None}))[:32]}"'
+    entry = (data, etag)
+    # Срок конечный: кеш может быть свой у каждого процесса (LocMemCache без REDIS_URL),
+    # пересборка после коммита обновляет только его - остальные догонят не позже чем через TTL
+    cache.set(snapshot_key(language), entry, timeout=settings.API_CACHE_TIMEOUT)
+    return entry
+
+
+def get_snapshot(language):
+    """Горячий путь - одно чтение кеша; снимка нет (вытеснен, первый запуск) - собираем на месте"""
+    entry = cache.get(snapshot_key(language))
+    if entry is None:
+        entry = build_snapshot(language)
+    return entry
+
+
+def rebuild_snapshots():
+    """После изменения контента: пересобрать все варианты заранее, до первого запроса"""
+    for language in VARIANTS:
+        try:
+            build_snapshot(language)
+        except Exception as e:
+            # Старый снимок не отдаем - соберется при первом запросе
+            cache.delete(snapshot_key(language))
+            logger.error(f"Homepage snapshot rebuild failed ({language or 'all'}): {str(e)}")
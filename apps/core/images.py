@@ -0,0 +1,209 @@
+import base64
+import io
+import logging
+import posixpath
+from functools import partial
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from rest_framework import serializers
+
+from .storage import ContentAddressedStorageMixin
+
+logger = logging.getLogger(__name__)
+
+# Модель -> поля-изображения; рядом с каждым хранится JSON <поле>_renditions
+IMAGE_FIELDS = {
+    'blog.post': ('thumbnail', 'cover_image'),
+    'portfolio.project': ('thumbnail', 'cover_image'),
+    'portfolio.technology': ('logo',),
+    'accounts.userprofile': ('avatar',),
+}
+# Формат -> (расширение файла, параметры Pillow)
+FORMATS = {
+    'webp': ('webp', {'method': 4}),
+    'jpeg': ('jpg', {'optimize': True, 'progressive': True}),
+}
+RENDITIONS_DIR = 'renditions'
+LQIP_WIDTH = 16
+
+
+def renditions_field(field_name):
+    return f'{field_name}_renditions'
+
+
+def image_fields(model):
+    return IMAGE_FIELDS.get(model._meta.label_lower, ())
+
+
+def rendition_name(source, width, extension):
+    """uploads/post/<uuid>.png -> uploads/post/renditions/<uuid>-640w.webp"""
+    directory, file_name = posixpath.split(source)
+    stem = posixpath.splitext(file_name)[0]
+    return posixpath.join(directory, RENDITIONS_DIR, f'{stem}-{width}w.{extension}')
+
+
+def target_widths(original_width):
+    """Ширины из IMAGE_RENDITION_WIDTHS меньше оригинала и сам оригинал: без увеличения"""
+    widths = [width for width in settings.IMAGE_RENDITION_WIDTHS if width < original_width]
+    return [*widths, original_width]
+
+
+def flatten(image):
+    """JPEG без альфа-канала: прозрачность - на белом фоне"""
+    from PIL import Image
+
+    if image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info):
+        image = image.convert('RGBA')
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel('A'))
+        return background
+    return image.convert('RGB')
+
+
+def encode(image, image_format):
+    options = FORMATS[image_format][1]
+    buffer = io.BytesIO()
+    if image_format == 'jpeg':
+        image = flatten(image)
+    elif image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA' if 'A' in image.getbands() or 'transparency' in image.info else 'RGB')
+    image.save(buffer, format=image_format.upper(), quality=settings.IMAGE_RENDITION_QUALITY, **options)
+    return buffer.getvalue()
+
+
+def lqip(image):
+    """Размытое превью шириной LQIP_WIDTH пикселей как data URI (пара сотен байт)"""
+    from PIL import Image
+
+    height = max(1, round(image.height * LQIP_WIDTH / image.width))
+    thumbnail = flatten(image).resize((LQIP_WIDTH, height), Image.Resampling.BILINEAR)
+    buffer = io.BytesIO()
+    thumbnail.save(buffer, format='JPEG', quality=40)
+    return f"data:image/jpeg;base64,{base64.b64encode(buffer.getvalue()).decode()}"
+
+
+def render_renditions(source, storage=None):
+    """
+    Варианты исходника в каждом формате IMAGE_RENDITION_FORMATS и каждой ширине:
+    файлы - рядом с оригиналом в renditions/ (в хранилище по хешу - под хешем своего
+    содержимого, повторная генерация ничего не перезаписывает), результат - JSON для <поле>_renditions
+    """
+    # Pillow нужен только при генерации: модуль импортируется на старте через signals
+    from PIL import Image, ImageOps
+
+    storage = storage or default_storage
+    with storage.open(source, 'rb') as f:
+        with Image.open(f) as original:
+            original.load()
+    # Фото с телефона: поворот по EXIF, иначе width/height перепутаны
+    original = ImageOps.exif_transpose(original)
+    variants = []
+    for width in target_widths(original.width):
+        height = max(1, round(original.height * width / original.width))
+        image = original if width == original.width else original.resize((width, height), Image.Resampling.LANCZOS)
+        for image_format in settings.IMAGE_RENDITION_FORMATS:
+            name = rendition_name(source, width, FORMATS[image_format][0])
+            if not isinstance(storage, ContentAddressedStorageMixin) and storage.exists(name):
+                storage.delete(name)
+            name = storage.save(name, ContentFile(encode(image, image_format)))
+            variants.append({'format': image_format, 'width': width, 'height': height, 'name': name})
+    return {
+        'source': source,
+        'width': original.width,
+        'height': original.height,
+        'lqip': lqip(original),
+        'variants': variants,
+    }
+
+
+def generate_renditions(label, pk, field_name, source):
+    """
+    Варианты одного поля одного объекта. JSON пишется через update() с проверкой,
+    что изображение не заменили за время обработки. Ошибка только в лог: сохранение
+    в админке не падает, команда regenerate_image_renditions догонит
+    """
+    from .cache import invalidate_objects
+
+    model = apps.get_model(label)
+    try:
+        data = render_renditions(source)
+    except Exception as e:
+        logger.error(f"Image renditions failed for {label}:{pk} {field_name}={source}: {str(e)}")
+        return None
+    updated = model._base_manager.filter(pk=pk, **{field_name: source}).update(
+        **{renditions_field(field_name): data}
+    )
+    if updated:
+        invalidate_objects(model, [pk])
+    return data
+
+
+def stale_fields(instance):
+    """Поля, у которых изображение сменилось после генерации вариантов"""
+    stale = []
+    for field_name in image_fields(type(instance)):
+        source = getattr(instance, field_name).name or ''
+        renditions = getattr(instance, renditions_field(field_name)) or {}
+        if renditions.get('source', '') != source:
+            stale.append((field_name, source))
+    return stale
+
+
+def schedule_renditions(instance):
+    """
+    После коммита: варианты для новых изображений - сразу или через Celery (IMAGE_RENDITIONS_DISPATCH).
+    Изображение удалено - варианты в JSON очищаются сразу
+    """
+    model, label = type(instance), instance._meta.label_lower
+    for field_name, source in stale_fields(instance):
+        if not source:
+            model._base_manager.filter(pk=instance.pk).update(**{renditions_field(field_name): {}})
+            setattr(instance, renditions_field(field_name), {})
+            continue
+        transaction.on_commit(partial(dispatch_renditions, label, instance.pk, field_name, source))
+
+
+def dispatch_renditions(label, pk, field_name, source):
+    if settings.IMAGE_RENDITIONS_DISPATCH != 'celery':
+        generate_renditions(label, pk, field_name, source)
+        return
+    from .tasks import generate_image_renditions
+    try:
+        generate_image_renditions.apply_async(args=[label, pk, field_name, source], retry=False)
+    except Exception as e:
+        logger.warning(f"Image worker is unavailable, rendering inline: {str(e)}")
+        generate_renditions(label, pk, field_name, source)
+
+
+class ImageRenditionsField(serializers.ReadOnlyField):
+    """
+    JSON вариантов -> готовое для <img srcset> / <picture>:
+    {"width", "height", "lqip", "srcset": {"webp": "url 320w, ...", "jpeg": ...}, "fallback": url}
+    """
+
+    def to_representation(self, value):
+        if not value or not value.get('variants'):
+            return None
+        request = self.context.get('request')
+
+        def absolute(name):
+            url = default_storage.url(name)
+            return request.build_absolute_uri(url) if request is not None else url
+
+        srcset, fallback = {}, None
+        for variant in sorted(value['variants'], key=lambda variant: variant['width']):
+            url = absolute(variant['name'])
+            srcset.setdefault(variant['format'], []).append(f"{url} {variant['width']}w")
+            if variant['format'] == 'jpeg':
+                fallback = url
+        return {
+            'width': value['width'],
+            'height': value['height'],
+            'lqip': value['lqip'],
+            'srcset': {image_format: ', '.join(urls) for image_format, urls in srcset.items()},
+            'fallback': fallback,
+        }
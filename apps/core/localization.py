@@ -0,0 +1,82 @@
+from django.utils.translation import get_language_from_request
+from rest_framework import serializers
+
+from .search import normalize_language
+from .utils import LanguageChoices
+
+LANGUAGES = LanguageChoices.values
+LANGUAGE_PARAM = 'lang'
+
+
+def get_request_language(request):
+    """
+    Язык ответа: ?lang=ru - явно, ?lang=auto (или пустой) - из Accept-Language.
+    Без параметра - None: прежний ответ со всеми _en/_ru/_he полями
+    """
+    if request is None:
+        return None
+    value = request.query_params.get(LANGUAGE_PARAM)
+    if value is None:
+        return None
+    value = value.strip().lower()
+    if value in ('', 'auto'):
+        value = getattr(request, 'LANGUAGE_CODE', None) or get_language_from_request(request)
+    return normalize_language(value)
+
+
+def unused_language_fields(serializer_class, language):
+    """Колонки других языков, которые сериализатор не покажет (английская нужна для fallback)"""
+    localized = getattr(serializer_class.Meta, 'localized_fields', ())
+    return [
+        f'{base}_{other}'
+        for base in localized
+        for other in LANGUAGES
+        if other not in (language, 'en')
+    ]
+
+
+class LocalizedField(serializers.ReadOnlyField):
+    """Одно поле на выбранном языке через MultiLanguageModel.get_field_value"""
+
+    def __init__(self, base, language, **kwargs):
+        super().__init__(source='*', **kwargs)
+        self.base = base
+        self.language = language
+
+    def to_representation(self, instance):
+        return instance.get_field_value(self.base, self.language)
+
+
+class LocalizedSerializerMixin:
+    """
+    С ?lang= поля из Meta.localized_fields (name_en/name_ru/name_he)
+    заменяются одним полем name на языке запроса с fallback на английский
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        localized = getattr(self.Meta, 'localized_fields', ())
+        language = get_request_language(self.context.get('request'))
+        if language is None or not localized:
+            return fields
+
+        result = {}
+        for name, field in fields.items():
+            base, _, suffix = name.rpartition('_')
+            if base in localized and suffix in LANGUAGES:
+                # Поле встает на место первого языкового варианта
+                result.setdefault(base, LocalizedField(base, language))
+            else:
+                result[name] = field
+        return result
+
+
+class LocalizedQuerysetMixin:
+    """Для ViewSet: с ?lang= колонки других языков не читаются из БД (defer)"""
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        language = get_request_language(self.request)
+        if language is None:
+            return queryset
+        return queryset.defer(*unused_language_fields(self.get_serializer_class(), language))
@@ -0,0 +1,192 @@
+import random
+import statistics
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.contrib.postgres.indexes import PostgresIndex
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.analytics.models import PageView, Event
+from apps.blog.models import Post, Comment
+
+BENCH_PREFIX = 'bench-'
+BENCH_USER_AGENT = 'benchmark'
+PATHS = ['/', '/blog', '/portfolio', '/contact', '/about'] + [f'/blog/post-{i}' for i in range(200)]
+COUNTRIES = ['IL', 'RU', 'US', 'DE', 'GB', 'FR', 'UA', '']
+
+
+def supported_indexes(model):
+    """Индексы из Meta.indexes, которые есть в текущей БД (GIN - только PostgreSQL)"""
+    return [
+        index for index in model._meta.indexes
+        if connection.vendor == 'postgresql' or not isinstance(index, PostgresIndex)
+    ]
+
+
+@contextmanager
+def explicit_created_at(*models):
+    """Разрешить задавать created_at в bulk_create (auto_now_add иначе перезапишет его)"""
+    fields = [model._meta.get_field('created_at') for model in models]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+def hot_querysets():
+    """Запросы, которые выполняют публичные ViewSet и аналитика"""
+    published = Post.objects.filter(status='published', is_active=True)
+    post = published.order_by('-published_at').first()
+    day_ago = timezone.now() - timedelta(days=1)
+    return {
+        'post list': lambda: published.order_by('-published_at')[:20],
+        'featured posts': lambda: published.filter(is_featured=True).order_by('-published_at')[:20],
+        'post comments': lambda: Comment.objects.filter(post=post, is_active=True, is_approved=True).order_by('-created_at'),
+        'page views list': lambda: PageView.objects.order_by('-created_at')[:20],
+        'page views by path': lambda: PageView.objects.filter(path='/blog').order_by('-created_at')[:20],
+        'page views by country': lambda: PageView.objects.filter(country='IL').order_by('-created_at')[:20],
+        'page views last day': lambda: PageView.objects.filter(created_at__gte=day_ago).order_by()[:1000],
+        'events by name': lambda: Event.objects.filter(name='click').order_by('-created_at')[:20],
+    }
+
+
+class Command(BaseCommand):
+    help = 'Бенчмарк горячих запросов: EXPLAIN и латентность без индексов и с индексами'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', action='store_true', help='Заполнить БД тестовыми данными')
+        parser.add_argument('--page-views', type=int, default=1_000_000)
+        parser.add_argument('--posts', type=int, default=50_000)
+        parser.add_argument('--repeat', type=int, default=20, help='Повторов на каждый запрос')
+        parser.add_argument('--cleanup', action='store_true', help='Удалить тестовые данные и выйти')
+        parser.add_argument('--compare', action='store_true',
+                            help='Замерить и «до»: индексы удаляются в транзакции, которая откатывается')
+        parser.add_argument('--yes', action='store_true', help='Подтвердить запись и изменение схемы текущей БД')
+
+    def handle(self, *args, **options):
+        if (options['seed'] or options['cleanup'] or options['compare']) and not options['yes']:
+            raise CommandError(
+                'Команда пишет в текущую БД или меняет ее схему - добавьте --yes, '
+                'если это отдельная БД для бенчмарка, а не продакшн'
+            )
+
+        if options['cleanup']:
+            self.cleanup()
+            return
+        if options['seed']:
+            self.seed(options['posts'], options['page_views'])
+
+        after = self.measure('С ИНДЕКСАМИ', options['repeat'])
+        if not options['compare']:
+            return
+        with self.indexes_removed([Post, Comment, PageView, Event]):
+            before = self.measure('БЕЗ ИНДЕКСОВ', options['repeat'])
+
+        self.stdout.write('\n📊 Итог (медиана, мс):')
+        for name in before:
+            speedup = before[name] / after[name] if after[name] else float('inf')
+            self.stdout.write(f'  {name:<24} {before[name]:>9.2f} → {after[name]:>9.2f}  (x{speedup:.1f})')
+
+    @contextmanager
+    def indexes_removed(self, models):
+        """
+        Индексы из Meta.indexes удаляются внутри транзакции, которая всегда откатывается:
+        DDL в PostgreSQL транзакционный, и прерванный запуск не оставит таблицы без индексов,
+        а пересоздавать их не нужно. Пока транзакция открыта, таблицы заблокированы - только отдельная БД
+        """
+        if connection.vendor != 'postgresql':
+            raise CommandError('--compare только для PostgreSQL: удаление индексов должно откатываться транзакцией')
+        with transaction.atomic():
+            with connection.schema_editor() as editor:
+                for model in models:
+                    for index in supported_indexes(model):
+                        editor.remove_index(model, index)
+            try:
+                yield
+            finally:
+                transaction.set_rollback(True)
+
+    def analyze(self):
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+    def measure(self, title, repeat):
+        self.analyze()
+        self.stdout.write(f'\n===== {title} =====')
+        results = {}
+        for name, build in hot_querysets().items():
+            self.stdout.write(f'\n▶ {name}\n{build().explain()}')
+            timings = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                list(build())
+                timings.append((time.perf_counter() - started) * 1000)
+            results[name] = statistics.median(timings)
+            self.stdout.write(f'  медиана: {results[name]:.2f} мс')
+        return results
+
+    def seed(self, posts_count, page_views_count):
+        self.stdout.write(f'🌱 Создаем {posts_count} постов и {page_views_count} просмотров...')
+        author, _ = User.objects.get_or_create(username=f'{BENCH_PREFIX}author')
+        now = timezone.now()
+        batch = 5000
+
+        for offset in range(0, posts_count, batch):
+            Post.objects.bulk_create([
+                Post(
+                    author=author,
+                    slug=f'{BENCH_PREFIX}post-{number}',
+                    title_en=f'Benchmark post {number}',
+                    content_en='Lorem ipsum',
+                    thumbnail='bench.png',
+                    status=random.choice(['published', 'published', 'draft', 'archived']),
+                    is_featured=random.random() < 0.02,
+                    published_at=now - timedelta(minutes=number),
+                )
+                for number in range(offset, min(offset + batch, posts_count))
+            ], batch_size=batch)
+
+        post_ids = list(Post.objects.filter(slug__startswith=BENCH_PREFIX).values_list('id', flat=True)[:1000])
+        with explicit_created_at(Comment, PageView, Event):
+            Comment.objects.bulk_create([
+                Comment(
+                    post_id=random.choice(post_ids), author_name='Bench', author_email='bench@example.com',
+                    content='Benchmark comment', is_approved=random.random() < 0.8,
+                    user_agent=BENCH_USER_AGENT, created_at=now - timedelta(minutes=number),
+                )
+                for number in range(min(posts_count, 50_000))
+            ], batch_size=batch)
+
+            for offset in range(0, page_views_count, batch):
+                size = min(batch, page_views_count - offset)
+                PageView.objects.bulk_create([
+                    PageView(
+                        path=random.choice(PATHS), country=random.choice(COUNTRIES),
+                        user_agent=BENCH_USER_AGENT, visitor_id=f'v{random.randint(0, 50_000)}',
+                        created_at=now - timedelta(seconds=random.randint(0, 90 * 86400)),
+                    )
+                    for _ in range(size)
+                ], batch_size=batch)
+                Event.objects.bulk_create([
+                    Event(
+                        name=random.choice(['click', 'scroll', 'submit']), category='bench',
+                        user_agent=BENCH_USER_AGENT,
+                        created_at=now - timedelta(seconds=random.randint(0, 90 * 86400)),
+                    )
+                    for _ in range(size // 10)
+                ], batch_size=batch)
+        self.stdout.write(self.style.SUCCESS('✅ Данные созданы'))
+
+    def cleanup(self):
+        PageView.objects.filter(user_agent=BENCH_USER_AGENT).delete()
+        Event.objects.filter(user_agent=BENCH_USER_AGENT).delete()
+        Post.objects.filter(slug__startswith=BENCH_PREFIX).delete()
+        User.objects.filter(username=f'{BENCH_PREFIX}author').delete()
+        self.stdout.write(self.style.SUCCESS('🗑️ Тестовые данные удалены'))
@@ -0,0 +1,135 @@
+import json
+import statistics
+import time
+import tracemalloc
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from apps.analytics.models import PageView
+from apps.analytics.serializers import PageViewSerializer
+from apps.blog.serializers import PostDetailSerializer, PostListSerializer
+from apps.blog.views import PostViewSet
+from apps.core.renderers import FastJSONRenderer, orjson
+from apps.portfolio.serializers import ProjectDetailSerializer, ProjectListSerializer
+from apps.portfolio.views import ProjectViewSet
+
+BENCH_PREFIX = 'bench-render-'
+# ~10 КБ текста на язык: порядок размера настоящих статей
+CONTENT = ('Lorem ipsum dolor sit amet, consectetur adipiscing elit. ' * 180)[:10_000]
+
+
+def payloads(request, page_size):
+    """Данные ответов, как их отдают ViewSet: сериализаторы и querysets из приложения"""
+    context = {'request': request}
+    posts = list(PostViewSet.queryset.order_by('-published_at')[:page_size])
+    projects = list(ProjectViewSet.queryset.order_by('-published_at')[:page_size])
+    page_views = list(PageView.objects.order_by('-created_at')[:100])
+    cases = {
+        'post detail': PostDetailSerializer(posts[0], context=context).data if posts else None,
+        'post list': PostListSerializer(posts, many=True, context=context).data,
+        'project detail': ProjectDetailSerializer(projects[0], context=context).data if projects else None,
+        'project list': ProjectListSerializer(projects, many=True, context=context).data,
+        'page views list': PageViewSerializer(page_views, many=True, context=context).data,
+    }
+    return {name: data for name, data in cases.items() if data}
+
+
+def measure(renderer, data, repeat):
+    """Медиана времени рендера (мкс) и пик выделенной памяти за один рендер (КБ)"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        renderer.render(data)
+        timings.append((time.perf_counter() - started) * 1e6)
+    tracemalloc.start()
+    output = renderer.render(data)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(timings), peak / 1024, output
+
+
+class Command(BaseCommand):
+    help = 'Бенчмарк JSON-рендера: DRF JSONRenderer против FastJSONRenderer (orjson) на реальных сериализаторах'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=200, help='Повторов рендера на каждый ответ')
+        parser.add_argument('--page-size', type=int, default=20)
+        parser.add_argument('--use-existing', action='store_true',
+                            help='Брать данные из текущей БД (по умолчанию - тестовые строки, откатываются в конце)')
+        parser.add_argument('--json', action='store_true', help='Вывести отчет в JSON')
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            self.stdout.write(self.style.WARNING('⚠️ orjson не установлен - FastJSONRenderer работает как JSONRenderer'))
+
+        request = Request(APIRequestFactory().get('/api/', HTTP_HOST='localhost'))
+        with transaction.atomic():
+            if not options['use_existing']:
+                self.seed(options['page_size'])
+            cases = payloads(request, options['page_size'])
+            transaction.set_rollback(True)
+
+        report = {}
+        for name, data in cases.items():
+            stdlib_us, stdlib_kb, expected = measure(JSONRenderer(), data, options['repeat'])
+            fast_us, fast_kb, output = measure(FastJSONRenderer(), data, options['repeat'])
+            report[name] = {
+                'bytes': len(expected),
+                'json_us': round(stdlib_us, 1),
+                'fast_us': round(fast_us, 1),
+                'speedup': round(stdlib_us / fast_us, 1) if fast_us else None,
+                'json_peak_kb': round(stdlib_kb, 1),
+                'fast_peak_kb': round(fast_kb, 1),
+                'identical': output == expected,
+            }
+
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+
+        self.stdout.write(f"{'ответ':<16} {'байт':>9} {'json, мкс':>10} {'orjson, мкс':>12} {'x':>6} "
+                          f"{'json, КБ':>9} {'orjson, КБ':>11}  совпадает")
+        for name, row in report.items():
+            self.stdout.write(
+                f"{name:<16} {row['bytes']:>9} {row['json_us']:>10.1f} {row['fast_us']:>12.1f} "
+                f"{row['speedup'] or 0:>6.1f} {row['json_peak_kb']:>9.1f} {row['fast_peak_kb']:>11.1f}  "
+                f"{'✅' if row['identical'] else '❌'}"
+            )
+
+    def seed(self, count):
+        from apps.blog.models import Category, Post, Tag
+        from apps.portfolio.models import Project, Technology
+
+        author = User.objects.create(username=f'{BENCH_PREFIX}author', first_name='Bench')
+        categories = [Category.objects.create(slug=f'{BENCH_PREFIX}cat-{i}', name_en=f'Category {i}') for i in range(3)]
+        tags = [Tag.objects.create(slug=f'{BENCH_PREFIX}tag-{i}', name_en=f'Tag {i}') for i in range(5)]
+        technologies = [Technology.objects.create(slug=f'{BENCH_PREFIX}tech-{i}', name=f'Tech {i}') for i in range(5)]
+        now = timezone.now()
+        for number in range(count):
+            post = Post.objects.create(
+                author=author, slug=f'{BENCH_PREFIX}post-{number}', status='published',
+                title_en=f'Benchmark post {number}', title_ru=f'Пост {number}', title_he=f'פוסט {number}',
+                excerpt_en=CONTENT[:300], content_en=CONTENT, content_ru=CONTENT, content_he=CONTENT,
+                thumbnail='bench.png', published_at=now - timedelta(minutes=number),
+            )
+            post.categories.set(categories)
+            post.tags.set(tags)
+            project = Project.objects.create(
+                slug=f'{BENCH_PREFIX}project-{number}', status='published',
+                title_en=f'Benchmark project {number}', description_en=CONTENT[:1000],
+                content_en=CONTENT, content_ru=CONTENT, content_he=CONTENT,
+                thumbnail='bench.png', published_at=now - timedelta(minutes=number),
+            )
+            project.technologies.set(technologies)
+        PageView.objects.bulk_create([
+            PageView(path=f'/blog/post-{number}', user_agent='benchmark', query_params={'utm_source': 'bench'},
+                     visitor_id=f'v{number}', language='en', country='IL')
+            for number in range(100)
+        ])
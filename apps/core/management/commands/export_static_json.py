@@ -0,0 +1,25 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from apps.core.static_export import StaticExporter
+
+
+class Command(BaseCommand):
+    help = 'Экспорт публичных ответов API (списки и детальные страницы, по языкам) в JSON-файлы с манифестом'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--root', default='', help='Каталог экспорта (по умолчанию STATIC_EXPORT_ROOT)')
+        parser.add_argument('--resource', action='append', default=[],
+                            help='Только файлы, зависящие от ресурса (blog.post, blog.post:slug=x); можно несколько раз')
+
+    def handle(self, *args, **options):
+        root = options['root'] or settings.STATIC_EXPORT_ROOT
+        if not root:
+            raise CommandError('Укажите --root или STATIC_EXPORT_ROOT')
+        exporter = StaticExporter(root)
+        if options['resource']:
+            stats = exporter.export_changed(options['resource'])
+        else:
+            stats = exporter.export_all()
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {root}: записано {stats['written']}, без изменений {stats['unchanged']}, удалено {stats['deleted']}"
+        ))
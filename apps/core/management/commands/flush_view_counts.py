@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from apps.core.counters import view_counter
+
+
+class Command(BaseCommand):
+    help = 'Сбрасывает буфер просмотров в БД пакетными UPDATE'
+
+    def handle(self, *args, **options):
+        updated = view_counter.flush()
+        self.stdout.write(self.style.SUCCESS(f'✅ Обновлено строк: {updated}'))
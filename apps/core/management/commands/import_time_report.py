@@ -0,0 +1,105 @@
+import json
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Строка вывода python -X importtime: "import time:   self |  cumulative | module"
+IMPORT_TIME_RE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|\s*(\S+)')
+
+BOOT_SCRIPT = '''
+import time
+started = time.perf_counter()
+import django
+django.setup()
+from django.core.wsgi import get_wsgi_application
+application = get_wsgi_application()
+# URLconf иначе импортируется первым запросом - его стоимость тоже часть холодного старта
+from django.urls import get_resolver
+get_resolver().url_patterns
+{warmup}
+import sys
+sys.stderr.write(f"boot time: {{(time.perf_counter() - started) * 1e6:.0f}}\\n")
+'''
+
+
+def parse_import_times(output):
+    """Разобрать stderr -X importtime: модуль -> (собственное время, с вложенными), мкс"""
+    modules = {}
+    boot_us = None
+    for line in output.splitlines():
+        if line.startswith('boot time:'):
+            boot_us = float(line.split(':')[1])
+            continue
+        match = IMPORT_TIME_RE.match(line)
+        if match:
+            self_us, cumulative_us, module = match.groups()
+            modules[module] = {'self_us': int(self_us), 'cumulative_us': int(cumulative_us)}
+    return modules, boot_us
+
+
+class Command(BaseCommand):
+    help = 'Отчет о стоимости импорта модулей при холодном старте (python -X importtime)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--settings-module', default=None,
+                            help='Профиль загрузки (по умолчанию - текущий DJANGO_SETTINGS_MODULE)')
+        parser.add_argument('--limit', type=int, default=25, help='Сколько модулей показать')
+        parser.add_argument('--sort', choices=['self', 'cumulative'], default='cumulative')
+        parser.add_argument('--by-package', action='store_true', help='Суммировать собственное время по пакетам')
+        parser.add_argument('--warmup', action='store_true', help='Учесть предкомпиляцию URL (config.boot.warm_up)')
+        parser.add_argument('--json', action='store_true', help='Вывести отчет в JSON (для сравнения в CI)')
+
+    def handle(self, *args, **options):
+        settings_module = options['settings_module'] or os.environ.get('DJANGO_SETTINGS_MODULE')
+        script = BOOT_SCRIPT.format(
+            warmup='from config.boot import warm_up; warm_up()' if options['warmup'] else ''
+        )
+        # Отдельный процесс: в текущем все уже импортировано
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', script],
+            cwd=settings.BASE_DIR,
+            env={**os.environ, 'DJANGO_SETTINGS_MODULE': settings_module},
+            capture_output=True,
+            text=True,
+        )
+        modules, boot_us = parse_import_times(result.stderr)
+        if result.returncode != 0 or boot_us is None:
+            raise CommandError(f'Загрузка {settings_module} завершилась ошибкой:\n{result.stderr[-2000:]}')
+
+        if options['by_package']:
+            packages = defaultdict(int)
+            for module, timing in modules.items():
+                packages[module.split('.')[0]] += timing['self_us']
+            rows = sorted(
+                ({'module': package, 'self_us': total, 'cumulative_us': total} for package, total in packages.items()),
+                key=lambda row: row['self_us'], reverse=True,
+            )
+        else:
+            key = f"{options['sort']}_us"
+            rows = sorted(
+                ({'module': module, **timing} for module, timing in modules.items()),
+                key=lambda row: row[key], reverse=True,
+            )
+        rows = rows[:options['limit']]
+
+        report = {
+            'settings': settings_module,
+            'boot_ms': round(boot_us / 1000, 1),
+            'modules_imported': len(modules),
+            'imports_ms': round(sum(timing['self_us'] for timing in modules.values()) / 1000, 1),
+            'top': rows,
+        }
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+
+        self.stdout.write(f"⏱️ {settings_module}: загрузка {report['boot_ms']} мс, "
+                          f"модулей {report['modules_imported']}, импорт {report['imports_ms']} мс\n")
+        self.stdout.write(f"{'self, мс':>10} {'всего, мс':>10}  модуль")
+        for row in rows:
+            self.stdout.write(f"{row['self_us'] / 1000:>10.1f} {row['cumulative_us'] / 1000:>10.1f}  {row['module']}")
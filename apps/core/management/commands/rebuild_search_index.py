@@ -0,0 +1,15 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from apps.core.search import SEARCHABLE_MODELS, is_postgres, update_search_vectors
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает tsvector-колонки постов и проектов (PostgreSQL)'
+
+    def handle(self, *args, **options):
+        if not is_postgres():
+            self.stdout.write(self.style.WARNING('⚠️ Не PostgreSQL - используется простой поиск, индекс не нужен'))
+            return
+        for label in SEARCHABLE_MODELS:
+            updated = update_search_vectors(apps.get_model(label))
+            self.stdout.write(self.style.SUCCESS(f'✅ {label}: {updated}'))
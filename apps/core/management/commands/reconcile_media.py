@@ -0,0 +1,67 @@
+import posixpath
+from datetime import timedelta
+
+from django.apps import apps
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.db import models
+from django.utils import timezone
+from apps.core.images import IMAGE_FIELDS, renditions_field
+
+
+def referenced_names():
+    """Все имена файлов из БД: FileField/ImageField всех моделей, исходники и варианты из *_renditions"""
+    names = set()
+    for model in apps.get_models():
+        file_fields = [field.name for field in model._meta.concrete_fields if isinstance(field, models.FileField)]
+        if not file_fields:
+            continue
+        json_fields = [renditions_field(field_name) for field_name in IMAGE_FIELDS.get(model._meta.label_lower, ())]
+        for row in model._base_manager.values_list(*file_fields, *json_fields).iterator(chunk_size=1000):
+            names.update(row[:len(file_fields)])
+            for renditions in row[len(file_fields):]:
+                if renditions:
+                    names.add(renditions.get('source'))
+                    names.update(variant['name'] for variant in renditions.get('variants', ()))
+    names.discard(None)
+    names.discard('')
+    return names
+
+
+def walk(storage, path):
+    directories, files = storage.listdir(path)
+    for file_name in files:
+        yield posixpath.join(path, file_name)
+    for directory in directories:
+        yield from walk(storage, posixpath.join(path, directory))
+
+
+class Command(BaseCommand):
+    help = ('Ищет в хранилище медиа файлы, на которые не ссылается ни одна строка '
+            '(после удаления объектов, замены изображений и старые варианты); --delete удаляет их')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', default='', help='Только каталог хранилища (по умолчанию все)')
+        parser.add_argument('--min-age', type=float, default=24,
+                            help='Часы: свежие файлы не трогаем - строка с ними может быть еще не сохранена')
+        parser.add_argument('--delete', action='store_true', help='Удалить найденные файлы (по умолчанию только отчет)')
+
+    def handle(self, *args, **options):
+        storage = default_storage
+        # Сначала ссылки, потом обход: файл, загруженный между ними, отсеет --min-age
+        referenced = referenced_names()
+        cutoff = timezone.now() - timedelta(hours=options['min_age'])
+        orphans = total = 0
+        for name in walk(storage, options['path']):
+            if name in referenced or storage.get_modified_time(name) > cutoff:
+                continue
+            orphans += 1
+            total += storage.size(name)
+            if options['delete']:
+                storage.delete(name)
+            self.stdout.write(f"{'🗑️' if options['delete'] else '•'} {name}")
+
+        action = 'удалено' if options['delete'] else 'найдено'
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Ссылок в БД: {len(referenced)}, без ссылок {action}: {orphans} ({total} байт)'
+        ))
@@ -0,0 +1,89 @@
+import os
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import django
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from apps.core.cache import invalidate_objects
+from apps.core.images import IMAGE_FIELDS, render_renditions, renditions_field
+
+
+def setup_worker():
+    """Процесс пула: при spawn Django еще не настроен; соединения с БД воркеру не нужны"""
+    django.setup()
+
+
+def render_source(source):
+    """В процессе пула: только Pillow и хранилище, строки обновляет родитель"""
+    try:
+        return source, render_renditions(source), None
+    except Exception as e:
+        return source, None, str(e)
+
+
+class Command(BaseCommand):
+    help = 'Генерирует недостающие (или все, --force) варианты изображений WebP/JPEG и LQIP в пуле процессов'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--model', action='append', default=[],
+                            help=f"Только модель ({', '.join(IMAGE_FIELDS)}); можно несколько раз")
+        parser.add_argument('--force', action='store_true', help='Перегенерировать и готовые варианты')
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Число процессов')
+
+    def handle(self, *args, **options):
+        labels = options['model'] or list(IMAGE_FIELDS)
+        unknown = set(labels) - set(IMAGE_FIELDS)
+        if unknown:
+            raise CommandError(f"Неизвестные модели: {', '.join(sorted(unknown))}")
+
+        # Исходник -> строки, которые на него ссылаются: один файл обрабатывается один раз
+        targets = defaultdict(list)
+        for label in labels:
+            for source, target in self.backlog(label, options['force']):
+                targets[source].append(target)
+        if not targets:
+            self.stdout.write(self.style.SUCCESS('✅ Все варианты на месте'))
+            return
+
+        updated, failed = defaultdict(set), 0
+        for source, data, error in self.render(sorted(targets), options['workers']):
+            if error:
+                failed += 1
+                self.stdout.write(self.style.WARNING(f'⚠️ {source}: {error}'))
+                continue
+            for label, pk, field_name in targets[source]:
+                model = apps.get_model(label)
+                # Изображение заменили, пока шла обработка - строку не трогаем
+                if model._base_manager.filter(pk=pk, **{field_name: source}).update(
+                        **{renditions_field(field_name): data}):
+                    updated[label].add(pk)
+        for label, pks in updated.items():
+            invalidate_objects(apps.get_model(label), pks)
+            self.stdout.write(self.style.SUCCESS(f'✅ {label}: {len(pks)}'))
+        if failed:
+            self.stdout.write(self.style.WARNING(f'⚠️ Не удалось обработать: {failed}'))
+
+    def backlog(self, label, force):
+        """Поля с изображением, у которых нет вариантов или они от другого файла"""
+        model = apps.get_model(label)
+        fields = IMAGE_FIELDS[label]
+        columns = [*fields, *(renditions_field(field_name) for field_name in fields)]
+        for row in model._base_manager.order_by('pk').values('pk', *columns).iterator(chunk_size=1000):
+            for field_name in fields:
+                source = row[field_name]
+                renditions = row[renditions_field(field_name)] or {}
+                if source and (force or renditions.get('source') != source):
+                    yield source, (label, row['pk'], field_name)
+
+    def render(self, sources, workers):
+        if workers <= 1 or len(sources) == 1:
+            yield from map(render_source, sources)
+            return
+        # Дочерние процессы не должны унаследовать открытое соединение родителя
+        connections.close_all()
+        with ProcessPoolExecutor(max_workers=workers, initializer=setup_worker) as executor:
+            futures = [executor.submit(render_source, source) for source in sources]
+            for future in as_completed(futures):
+                yield future.result()
@@ -0,0 +1,25 @@
+import logging
+
+from django.core.management.base import BaseCommand
+
+from apps.core.purge_server import PurgeServer
+
+
+class Command(BaseCommand):
+    help = 'Локальная замена API очистки CDN (EDGE_PURGE_URL=http://127.0.0.1:<port>/purge)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1')
+        parser.add_argument('--port', type=int, default=8787)
+        parser.add_argument('--token', default='', help='Ожидаемый Bearer-токен (EDGE_PURGE_TOKEN)')
+
+    def handle(self, *args, **options):
+        logging.getLogger('apps.core.purge_server').setLevel(logging.INFO)
+        server = PurgeServer(options['host'], options['port'], options['token'])
+        self.stdout.write(self.style.SUCCESS(f'🧹 Purge server: {server.url}'))
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
@@ -2,10 +2,11 @@ from django.db import models
 from django.utils.translation import gettext_lazy as _
 import os
 import uuid
+from .counters import view_counter
 
 
 def get_image_upload_path(instance, filename):
-    """Генерирует путь для загрузки изображений"""
+    """Генерирует путь для загрузки изображений; в хранилище по хешу итоговое имя - sha256 содержимого"""
     ext = filename.split('.')[-1]
     filename = f"{uuid.uuid4()}.{ext}"
     return os.path.join('uploads', instance.__class__.__name__.lower(), filename)
@@ -70,9 +71,9 @@ class MultiLanguageModel(models.Model):
         abstract = True
     
     def get_field_value(self, field_name, language='en'):
-        """Получить значение поля на указанном языке"""
+        """Получить значение поля на указанном языке (пустое или отсутствующее - английское)"""
         localized_field = f"{field_name}_{language}"
-        return getattr(self, localized_field, getattr(self, f"{field_name}_en", ''))
+        return getattr(self, localized_field, None) or getattr(self, f"{field_name}_en", '')
 
 
 class PublishableModel(models.Model):
@@ -107,9 +108,11 @@ class ViewableModel(models.Model):
         abstract = True
 
     def increment_views(self):
-        """Увеличить счетчик просмотров"""
-        self.views_count += 1
-        self.save(update_fields=['views_count'])
+        """
+        Засчитать просмотр через view_counter (буфер или UPDATE сразу, VIEW_COUNTER_BACKEND).
+        Возвращает число просмотров, еще не попавших в views_count этого объекта
+        """
+        return view_counter.increment_for(type(self), self.pk)
 
 
 class FeaturedModel(models.Model):
@@ -0,0 +1,30 @@
+from django.db import migrations
+
+
+class PostgresAddIndex(migrations.AddIndex):
+    """
+    AddIndex только для PostgreSQL (GIN и т.п.); на SQLite для разработки
+    индекс остается в состоянии миграций, но в БД не создается
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+
+
+def fill_search_vectors(label):
+    """RunPython: заполнить search_* колонки для уже существующих строк"""
+    def forwards(apps, schema_editor):
+        from apps.core.search import SEARCH_CONFIGS, SEARCHABLE_MODELS, build_search_vector
+        if schema_editor.connection.vendor != 'postgresql':
+            return
+        model = apps.get_model(label)
+        model.objects.update(**{
+            f'search_{language}': build_search_vector(SEARCHABLE_MODELS[label], language)
+            for language in SEARCH_CONFIGS
+        })
+    return forwards
@@ -0,0 +1,203 @@
+import base64
+import binascii
+import json
+from functools import reduce
+from operator import or_
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q, QuerySet
+from rest_framework.exceptions import NotFound
+from rest_framework.filters import OrderingFilter
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+from .search import is_ranked_search
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset-пагинация по (created_at, id): страница - это WHERE по ключу последней
+    строки + LIMIT, без OFFSET и без COUNT(*). Курсор непрозрачный (base64 JSON).
+    Общее количество - только по ?with_count=true.
+
+    Если клиент задал свой ?ordering=, ищет по ?search= (порядок по релевантности)
+    или пагинируется не QuerySet, используется обычная PageNumberPagination
+    """
+    ordering = ('-created_at', '-id')
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    count_query_param = 'with_count'
+    # False - keyset только если клиент прислал ?cursor= (пустой - первая страница),
+    # иначе прежний ответ с page/count для обратной совместимости
+    keyset_by_default = True
+    invalid_cursor_message = 'Invalid cursor'
+
+    def __init__(self):
+        self.fallback = None
+
+    def use_keyset(self, queryset, request):
+        if not isinstance(queryset, QuerySet):
+            return False
+        if request.query_params.get(OrderingFilter.ordering_param) or is_ranked_search(request):
+            return False
+        return self.keyset_by_default or self.cursor_query_param in request.query_params
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if not self.use_keyset(queryset, request):
+            self.fallback = PageNumberPagination()
+            return self.fallback.paginate_queryset(queryset, request, view)
+
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        position, reverse = self.decode_cursor(request)
+
+        queryset = queryset.order_by(*self.ordering)
+        self.count = queryset.count() if self.include_count(request) else None
+
+        if reverse:
+            queryset = queryset.reverse()
+        if position is not None:
+            queryset = queryset.filter(self.after(queryset.model, position, reverse))
+
+        # Одна лишняя строка показывает, есть ли еще страница в этом направлении
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+
+        self.has_next = has_more if not reverse else True
+        self.has_previous = position is not None and (has_more if reverse else True)
+        self.page = rows
+        return rows
+
+    def get_paginated_response(self, data):
+        if self.fallback is not None:
+            return self.fallback.get_paginated_response(data)
+        payload = {
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        }
+        if self.count is not None:
+            payload = {'count': self.count, **payload}
+        return Response(payload)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'count': {'type': 'integer', 'description': f'Только с ?{self.count_query_param}=true'},
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                'name': self.cursor_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Непрозрачный курсор страницы (из next/previous)',
+                'schema': {'type': 'string'},
+            },
+            {
+                'name': self.page_size_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Размер страницы',
+                'schema': {'type': 'integer'},
+            },
+            {
+                'name': self.count_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Вернуть общее количество (дополнительный COUNT)',
+                'schema': {'type': 'boolean'},
+            },
+        ]
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(max(size, 1), self.max_page_size)
+
+    def include_count(self, request):
+        return request.query_params.get(self.count_query_param, '').lower() in ('1', 'true', 'yes')
+
+    @staticmethod
+    def field_name(ordering_field):
+        return ordering_field.lstrip('-')
+
+    def after(self, model, position, reverse):
+        """(a, b) после (x, y) в порядке ordering: a < x OR (a = x AND b < y)"""
+        fields = [self.field_name(field) for field in self.ordering]
+        try:
+            values = [model._meta.get_field(name).to_python(value) for name, value in zip(fields, position)]
+        except (TypeError, ValueError, ValidationError):
+            # Корректный base64 JSON, но значения не того типа: {"p": [123, 1]}
+            raise NotFound(self.invalid_cursor_message)
+        conditions = []
+        for index, ordering_field in enumerate(self.ordering):
+            descending = ordering_field.startswith('-') != reverse
+            lookup = f'{fields[index]}__{"lt" if descending else "gt"}'
+            conditions.append(Q(**dict(zip(fields[:index], values[:index])), **{lookup: values[index]}))
+        return reduce(or_, conditions)
+
+    def position_of(self, instance):
+        position = []
+        for field in self.ordering:
+            value = getattr(instance, self.field_name(field))
+            position.append(value.isoformat() if hasattr(value, 'isoformat') else value)
+        return position
+
+    def encode_cursor(self, position, reverse):
+        cursor = json.dumps({'p': position, 'r': int(reverse)}, separators=(',', ':'))
+        encoded = base64.urlsafe_b64encode(cursor.encode()).decode().rstrip('=')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            cursor = json.loads(base64.urlsafe_b64decode(encoded + '=' * (-len(encoded) % 4)))
+            position, reverse = cursor['p'], bool(cursor['r'])
+        except (TypeError, ValueError, KeyError, binascii.Error):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.position_of(self.page[-1]), reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            # Ушли за конец списка - назад на первую страницу
+            return replace_query_param(self.base_url, self.cursor_query_param, '')
+        return self.encode_cursor(self.position_of(self.page[0]), reverse=True)
+
+
+class CommentPagination(KeysetPagination):
+    """Комментарии: keyset по ?cursor=, без него - прежние номера страниц"""
+    keyset_by_default = False
+
+
+class PublishedPagination(KeysetPagination):
+    """Опубликованный контент: keyset по (published_at, id) по ?cursor="""
+    ordering = ('-published_at', '-id')
+    keyset_by_default = False
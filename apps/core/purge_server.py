@@ -0,0 +1,72 @@
+import json
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+
+class PurgeRequestHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        try:
+            tags = json.loads(self.rfile.read(length) or b'{}').get('tags', [])
+        except (ValueError, AttributeError):
+            self.send_error(400, 'Expected JSON {"tags": [...]}')
+            return
+        if self.server.token and self.headers.get('Authorization') != f'Bearer {self.server.token}':
+            self.send_error(403)
+            return
+
+        with self.server.lock:
+            self.server.purged.append(tags)
+        logger.info(f"Purged keys: {' '.join(tags)}")
+        body = json.dumps({'purged': len(tags)}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+
+class PurgeServer(ThreadingHTTPServer):
+    """
+    Локальная замена API очистки CDN: принимает POST {"tags": [...]} и запоминает ключи.
+    Для тестов и разработки без сети: with PurgeServer() as server: ... server.url
+    """
+    daemon_threads = True
+
+    def __init__(self, host='127.0.0.1', port=0, token=''):
+        super().__init__((host, port), PurgeRequestHandler)
+        self.token = token
+        self.purged = []
+        self.lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}/purge'
+
+    @property
+    def keys(self):
+        with self.lock:
+            return {key for tags in self.purged for key in tags}
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
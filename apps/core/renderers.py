@@ -0,0 +1,56 @@
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # необязательная зависимость: без нее - стандартный json DRF
+    orjson = None
+
+# Типы вне JSON (lazy-переводы, Decimal, timedelta, QuerySet...) - тем же кодом, что и у DRF;
+# datetime тоже через него: DRF пишет UTC как 'Z', а не '+00:00'
+encode_default = JSONEncoder().default
+
+# DRF экранирует разделители строк JavaScript - повторяем, чтобы ответ был побайтно тем же
+LINE_SEPARATORS = (('\u2028'.encode(), b'\\u2028'), ('\u2029'.encode(), b'\\u2029'))
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer на orjson: тот же компактный UTF-8 ответ, но в разы быстрее.
+    Без orjson, с отступами (Accept: application/json; indent=4), с нестандартными
+    COMPACT_JSON/UNICODE_JSON или на типах, которые orjson не кодирует, - обычный рендер DRF
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None or not self.compact or self.ensure_ascii:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(
+                data, default=encode_default,
+                option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS,
+            )
+        except TypeError:
+            # Например, int больше 64 бит
+            return super().render(data, accepted_media_type, renderer_context)
+        for raw, escaped in LINE_SEPARATORS:
+            if raw in ret:
+                ret = ret.replace(raw, escaped)
+        return ret
+
+
+class FastJSONParser(JSONParser):
+    """JSONParser на orjson (тело в UTF-8, как требует RFC 8259; иначе - парсер DRF)"""
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = (parser_context or {}).get('encoding', 'utf-8')
+        if orjson is None or encoding.lower().replace('_', '-') not in ('utf-8', 'utf8'):
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f'JSON parse error - {exc}')
@@ -0,0 +1,131 @@
+from functools import reduce
+from operator import or_
+
+from django.apps import apps
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connection
+from django.db.models import F, Q, Value
+from rest_framework.filters import BaseFilterBackend, OrderingFilter, SearchFilter
+
+# Конфигурации PostgreSQL для языков сайта (для иврита нет стеммера - simple)
+SEARCH_CONFIGS = {
+    'en': 'english',
+    'ru': 'russian',
+    'he': 'simple',
+}
+
+# Что индексируем: модель -> {базовое поле: вес}
+SEARCHABLE_MODELS = {
+    'blog.post': {'title': 'A', 'subtitle': 'B', 'excerpt': 'B', 'content': 'C'},
+    'portfolio.project': {'title': 'A', 'subtitle': 'B', 'description': 'B', 'content': 'C'},
+}
+
+
+def is_postgres():
+    return connection.vendor == 'postgresql'
+
+
+def normalize_language(language):
+    language = (language or 'en')[:2].lower()
+    return language if language in SEARCH_CONFIGS else 'en'
+
+
+def build_search_vector(weights, language):
+    """SearchVector по полям одного языка с весами A/B/C"""
+    config = SEARCH_CONFIGS[language]
+    vectors = [
+        SearchVector(f'{field}_{language}', weight=weight, config=config)
+        for field, weight in weights.items()
+    ]
+    return reduce(lambda left, right: left + right, vectors)
+
+
+def update_search_vectors(model, pks=None):
+    """Пересчитать сохраненные search_* колонки (только PostgreSQL)"""
+    if not is_postgres():
+        return 0
+    weights = SEARCHABLE_MODELS[model._meta.label_lower]
+    queryset = model.objects.all() if pks is None else model.objects.filter(pk__in=pks)
+    return queryset.update(**{
+        f'search_{language}': build_search_vector(weights, language)
+        for language in SEARCH_CONFIGS
+    })
+
+
+def published_queryset(label):
+    model = apps.get_model(label)
+    queryset = model.objects.filter(status='published')
+    if label == 'blog.post':
+        queryset = queryset.filter(is_active=True)
+    return queryset
+
+
+def full_text_filter(queryset, query, language):
+    """Фильтр по полнотекстовому индексу (PostgreSQL) или icontains (SQLite для разработки)"""
+    weights = SEARCHABLE_MODELS[queryset.model._meta.label_lower]
+    if is_postgres():
+        search_query = SearchQuery(query, config=SEARCH_CONFIGS[language], search_type='websearch')
+        return queryset.filter(**{f'search_{language}': search_query}).annotate(
+            rank=SearchRank(F(f'search_{language}'), search_query)
+        )
+    condition = reduce(or_, [Q(**{f'{field}_{language}__icontains': query}) for field in weights])
+    return queryset.filter(condition).annotate(rank=Value(1.0))
+
+
+def search(query, language='en', limit=20):
+    """Ранжированный поиск сразу по постам блога и проектам портфолио"""
+    language = normalize_language(language)
+    results = []
+    for label in SEARCHABLE_MODELS:
+        queryset = full_text_filter(published_queryset(label), query, language)
+        rows = queryset.order_by('-rank').values(
+            'id', 'slug', 'rank', 'title_en', title=F(f'title_{language}'),
+        )[:limit]
+        for row in rows:
+            results.append({
+                'type': label.split('.')[1],
+                'id': row['id'],
+                'slug': row['slug'],
+                'title': row['title'] or row['title_en'],
+                'rank': float(row['rank']),
+            })
+    results.sort(key=lambda result: result['rank'], reverse=True)
+    return results[:limit]
+
+
+class FullTextSearchFilter(BaseFilterBackend):
+    """
+    Замена SearchFilter для постов и проектов: ?search= идет по tsvector + GIN,
+    язык - из ?lang= (по умолчанию en). Вне PostgreSQL работает как SearchFilter
+    """
+    search_param = SearchFilter.search_param
+
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, '').strip()
+        if not query:
+            return queryset
+        if not is_postgres():
+            return SearchFilter().filter_queryset(request, queryset, view)
+        language = normalize_language(request.query_params.get('lang'))
+        return full_text_filter(queryset, query, language)
+
+    def get_schema_operation_parameters(self, view):
+        return SearchFilter().get_schema_operation_parameters(view)
+
+
+def is_ranked_search(request):
+    """?search= по tsvector: у строк есть rank, порядок - по релевантности"""
+    return bool(request.query_params.get(FullTextSearchFilter.search_param, '').strip()) and is_postgres()
+
+
+class RankedOrderingFilter(OrderingFilter):
+    """
+    OrderingFilter для списков с FullTextSearchFilter: при ?search= без ?ordering=
+    сначала релевантность, затем обычный порядок view.ordering
+    """
+
+    def get_default_ordering(self, view):
+        ordering = super().get_default_ordering(view)
+        if is_ranked_search(view.request):
+            return ('-rank', *(ordering or ()))
+        return ordering
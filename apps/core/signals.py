@@ -0,0 +1,125 @@
+from django.apps import apps
+from django.db.models.signals import pre_save, post_save, post_delete, m2m_changed
+from .cache import is_cached_model, is_ignored_save, invalidate_instance, invalidate_objects
+from .feeds import SECTIONS, invalidate_published
+from .homepage import HOMEPAGE_MODELS, rebuild_snapshots
+from .images import IMAGE_FIELDS, schedule_renditions
+from .models import SEOSettings, SiteSettings
+from .search import SEARCHABLE_MODELS, update_search_vectors
+from .site_config import refresh_site_config
+from .snapshots import on_commit_once
+
+
+def remember_cached_lookups(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Запоминаем старый slug, чтобы сбросить кеш и по прежнему адресу"""
+    if raw or not instance.pk or not hasattr(instance, 'slug') or is_ignored_save(sender, update_fields):
+        return
+    old_slug = sender._base_manager.filter(pk=instance.pk).values_list('slug', flat=True).first()
+    if old_slug and old_slug != instance.slug:
+        instance._previous_cache_resources = [f'{sender._meta.label_lower}:slug={old_slug}']
+
+
+def invalidate_cached_responses(sender, instance, update_fields=None, **kwargs):
+    """Сбрасываем версии кеша для списка модели и страницы объекта"""
+    if is_ignored_save(sender, update_fields):
+        return
+    invalidate_instance(instance, getattr(instance, '_previous_cache_resources', ()))
+
+
+def invalidate_cached_relations(sender, instance, action, model, pk_set, **kwargs):
+    """Изменение связей (категории, теги, технологии) меняет обе стороны"""
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    invalidate_instance(instance, [model._meta.label_lower])
+    if pk_set:
+        invalidate_objects(model, pk_set)
+
+
+def refresh_search_vectors(sender, instance, raw=False, **kwargs):
+    """Пересчитываем tsvector-колонки объекта после сохранения"""
+    if not raw:
+        update_search_vectors(sender, [instance.pk])
+
+
+def refresh_homepage_snapshot(sender, raw=False, action=None, update_fields=None, **kwargs):
+    """Снимок главной пересобирается один раз после коммита, сколько бы сигналов ни пришло"""
+    if raw or (action is not None and action not in ('post_add', 'post_remove', 'post_clear')):
+        return
+    if is_ignored_save(sender, update_fields):
+        return
+    on_commit_once(rebuild_snapshots)
+
+
+def remember_publication_status(sender, instance, raw=False, **kwargs):
+    """Был ли объект опубликован до сохранения: снятие с публикации тоже меняет sitemap и ленты"""
+    if raw or not instance.pk:
+        instance._was_published = False
+        return
+    instance._was_published = sender._base_manager.filter(pk=instance.pk, status='published').exists()
+
+
+def refresh_published_feeds(sender, instance, raw=False, **kwargs):
+    """sitemap и ленты сбрасываются на публикацию, снятие и правку опубликованного - не на черновики"""
+    if raw:
+        return
+    if instance.status == 'published' or getattr(instance, '_was_published', False):
+        invalidate_published(sender)
+
+
+def connect_feed_signals():
+    for section in SECTIONS.values():
+        pre_save.connect(remember_publication_status, sender=section.model)
+        post_save.connect(refresh_published_feeds, sender=section.model)
+        post_delete.connect(refresh_published_feeds, sender=section.model)
+
+
+def refresh_site_settings(sender, raw=False, **kwargs):
+    """Снимок настроек этого процесса - сразу после коммита; другие воркеры увидят новую версию"""
+    if not raw:
+        on_commit_once(refresh_site_config)
+
+
+def connect_site_config_signals():
+    for model in (SiteSettings, SEOSettings):
+        post_save.connect(refresh_site_settings, sender=model)
+        post_delete.connect(refresh_site_settings, sender=model)
+
+
+def refresh_image_renditions(sender, instance, raw=False, **kwargs):
+    """Новое изображение - варианты WebP/JPEG после коммита, вне запроса админки при Celery"""
+    if not raw:
+        schedule_renditions(instance)
+
+
+def connect_image_signals():
+    for label in IMAGE_FIELDS:
+        post_save.connect(refresh_image_renditions, sender=apps.get_model(label))
+
+
+def connect_homepage_signals():
+    for label in HOMEPAGE_MODELS:
+        model = apps.get_model(label)
+        post_save.connect(refresh_homepage_snapshot, sender=model)
+        post_delete.connect(refresh_homepage_snapshot, sender=model)
+        for field in model._meta.local_many_to_many:
+            m2m_changed.connect(refresh_homepage_snapshot, sender=field.remote_field.through)
+
+
+def connect_search_signals():
+    for label in SEARCHABLE_MODELS:
+        post_save.connect(refresh_search_vectors, sender=apps.get_model(label))
+
+
+def connect_cache_signals():
+    """
+    Подписываемся только на кешируемые модели: глобальный post_delete
+    отключил бы быстрое удаление (fast delete) для аналитики и остальных таблиц
+    """
+    for model in apps.get_models():
+        if not is_cached_model(model):
+            continue
+        pre_save.connect(remember_cached_lookups, sender=model)
+        post_save.connect(invalidate_cached_responses, sender=model)
+        post_delete.connect(invalidate_cached_responses, sender=model)
+        for field in model._meta.local_many_to_many:
+            m2m_changed.connect(invalidate_cached_relations, sender=field.remote_field.through)
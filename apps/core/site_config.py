@@ -0,0 +1,120 @@
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import JsonResponse
+from django.utils.translation import get_language_from_request
+
+from .localization import LANGUAGE_PARAM
+from .models import SEOSettings, SiteSettings
+from .search import normalize_language
+
+# Отдельный ключ, не версии кеша ответов: вытеснение ключа не должно перечитывать снимок на каждом запросе
+VERSION_KEY = 'api:site-config:version'
+DEFAULT_MAINTENANCE_MESSAGE = 'The site is under maintenance. Please try again later.'
+
+
+class SiteConfig:
+    """Снимок активных SiteSettings и SEOSettings; объекты только для чтения"""
+
+    def __init__(self, site_settings, seo_settings):
+        self.site_settings = site_settings
+        self.seo_settings = seo_settings
+
+    @property
+    def current(self):
+        """Действующие настройки сайта - первая активная запись"""
+        return self.site_settings[0] if self.site_settings else None
+
+    @property
+    def maintenance_mode(self):
+        return bool(self.current and self.current.is_maintenance_mode)
+
+    def maintenance_message(self, language):
+        current = self.current
+        if current is None:
+            return DEFAULT_MAINTENANCE_MESSAGE
+        return (getattr(current, f'maintenance_message_{language}', '')
+                or current.maintenance_message_en or DEFAULT_MAINTENANCE_MESSAGE)
+
+
+class SiteConfigHolder:
+    """
+    Процессный кеш настроек. Версия в общем кеше сверяется не чаще SITE_CONFIG_CHECK_INTERVAL
+    (одно чтение кеша, без БД); другая версия - снимок перечитывается двумя запросами.
+    Ключ версии вытеснен - снимок живет до SITE_CONFIG_MAX_AGE
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.config = None
+        self.version = None
+        self.loaded_at = self.checked_at = 0.0
+
+    def get(self):
+        config, now = self.config, time.monotonic()
+        if config is not None and now - self.checked_at < settings.SITE_CONFIG_CHECK_INTERVAL:
+            return config
+        with self.lock:
+            # Версия - до чтения БД: сохранение во время загрузки перечитается на следующей проверке
+            version = cache.get(VERSION_KEY)
+            if (self.config is None or now - self.loaded_at >= settings.SITE_CONFIG_MAX_AGE
+                    or (version is not None and version != self.version)):
+                self.config = self.load()
+                self.version = version
+                self.loaded_at = now
+            self.checked_at = now
+            return self.config
+
+    def load(self):
+        return SiteConfig(
+            list(SiteSettings.objects.filter(is_active=True).order_by('pk')),
+            list(SEOSettings.objects.filter(is_active=True)),
+        )
+
+    def reset(self):
+        with self.lock:
+            self.config = self.version = None
+            self.loaded_at = self.checked_at = 0.0
+
+
+site_config = SiteConfigHolder()
+
+
+def get_site_config():
+    return site_config.get()
+
+
+def refresh_site_config():
+    """После коммита сохранения: новая версия для остальных воркеров, этот процесс перечитывает сразу"""
+    cache.set(VERSION_KEY, time.time_ns() // 1000, timeout=None)
+    site_config.reset()
+    site_config.get()
+
+
+class MaintenanceModeMiddleware:
+    """
+    Пока в SiteSettings включен is_maintenance_mode - все запросы к /api/ получают 503
+    с сообщением на языке запроса. Флаг берется из процессного снимка, без БД
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        path = request.path_info
+        if not path.startswith('/api/') or path.startswith(settings.MAINTENANCE_EXEMPT_PATHS):
+            return self.get_response(request)
+        config = get_site_config()
+        if not config.maintenance_mode:
+            return self.get_response(request)
+
+        language = normalize_language(request.GET.get(LANGUAGE_PARAM) or get_language_from_request(request))
+        response = JsonResponse(
+            {'detail': config.maintenance_message(language), 'maintenance': True},
+            status=503, json_dumps_params={'ensure_ascii': False},
+        )
+        response['Retry-After'] = str(settings.MAINTENANCE_RETRY_AFTER)
+        response['Cache-Control'] = 'no-store'
+        return response
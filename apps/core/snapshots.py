@@ -0,0 +1,62 @@
+import hashlib
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+from django.test import RequestFactory
+from rest_framework.request import Request
+
+
+LOCAL_HOSTS = ('localhost', '127.0.0.1', '::1')
+
+
+def require_public_api_url():
+    """
+    Для того, что публикуется (статический экспорт): вне DEBUG адрес localhost - ошибка
+    настройки, иначе в файлы для CDN попадут ссылки http://localhost:8000/media/...
+    """
+    url = urlsplit(settings.PUBLIC_API_URL)
+    if not settings.DEBUG and url.hostname in LOCAL_HOSTS:
+        raise ImproperlyConfigured(f'PUBLIC_API_URL={settings.PUBLIC_API_URL}: укажите публичный адрес API')
+    return url
+
+
+def build_http_request(path, params=None):
+    """
+    Запрос для сборки ответа вне HTTP (сигналы, команды): хост и схема из PUBLIC_API_URL,
+    чтобы ссылки на изображения были такими же абсолютными, как в живых ответах
+    """
+    url = urlsplit(settings.PUBLIC_API_URL)
+    request = RequestFactory().get(
+        path, params or {}, HTTP_HOST=url.netloc, secure=url.scheme == 'https',
+    )
+    request.LANGUAGE_CODE = settings.LANGUAGE_CODE
+    # Атрибут, а не заголовок: клиент снаружи его не подделает
+    request.is_snapshot = True
+    return request
+
+
+def build_request(path, params=None):
+    return Request(build_http_request(path, params))
+
+
+def is_snapshot_request(request):
+    """Ответ собирается для снимка/экспорта: без кеша ответов и без счетчика просмотров"""
+    return getattr(request, 'is_snapshot', False)
+
+
+def content_hash(payload):
+    """sha256 содержимого: ETag снимка и запись в манифесте"""
+    return hashlib.sha256(payload).hexdigest()
+
+
+def on_commit_once(func, using=None):
+    """
+    transaction.on_commit, но не больше одного раза за транзакцию:
+    сохранение поста с категориями и тегами дает несколько сигналов подряд
+    """
+    connection = transaction.get_connection(using)
+    if connection.in_atomic_block and any(entry[1] is func for entry in connection.run_on_commit):
+        return
+    transaction.on_commit(func, using)
@@ -0,0 +1,291 @@
+import json
+import logging
+import os
+import re
+import threading
+from functools import lru_cache
+from pathlib import Path
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .localization import LANGUAGES
+from .snapshots import build_http_request, content_hash, on_commit_once, require_public_api_url
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = 'manifest.json'
+# Файлы: без ?lang= (все языковые поля) - all/, по одному каталогу на язык
+VARIANTS = (None, *LANGUAGES)
+# Публичные ViewSet: списки (включая @action вроде featured) и детальная страница каждого объекта
+VIEWSETS = (
+    ('/api/blog/categories/', 'apps.blog.views.CategoryViewSet'),
+    ('/api/blog/tags/', 'apps.blog.views.TagViewSet'),
+    ('/api/blog/posts/', 'apps.blog.views.PostViewSet'),
+    ('/api/portfolio/categories/', 'apps.portfolio.views.CategoryViewSet'),
+    ('/api/portfolio/technologies/', 'apps.portfolio.views.TechnologyViewSet'),
+    ('/api/portfolio/projects/', 'apps.portfolio.views.ProjectViewSet'),
+    ('/api/portfolio/skills/', 'apps.portfolio.views.SkillViewSet'),
+    ('/api/core/site-settings/', 'apps.core.views.SiteSettingsViewSet'),
+    ('/api/core/seo-settings/', 'apps.core.views.SEOSettingsViewSet'),
+)
+PAGE_FILE = re.compile(r'page/\d+/index\.json$')
+
+_pending = threading.local()
+
+
+class Endpoint:
+    """ViewSet под своим URL: какие файлы из него получаются и от каких ресурсов они зависят"""
+
+    def __init__(self, path, viewset):
+        self.path = path
+        self.viewset = viewset
+        self.label = viewset.queryset.model._meta.label_lower
+        self.lookup_field = viewset.lookup_field
+        self.lookup_url_kwarg = viewset.lookup_url_kwarg or viewset.lookup_field
+        self.list_actions = {'list': path}
+        for extra in viewset.get_extra_actions():
+            if not extra.detail and 'get' in extra.mapping:
+                self.list_actions[extra.__name__] = f'{path}{extra.url_path}/'
+        # Те же ресурсы, что в версиях кеша и Surrogate-Key ответа
+        self.list_resources = {self.label, *viewset.cache_dependencies}
+        self.detail_dependencies = set(viewset.cache_dependencies) - {self.label}
+        self._views = {}
+
+    def view(self, action):
+        if action not in self._views:
+            self._views[action] = self.viewset.as_view({'get': action})
+        return self._views[action]
+
+    def lookups(self):
+        return [str(value) for value in self.viewset.queryset.values_list(self.lookup_field, flat=True).iterator()]
+
+    def changed_lookups(self, resources):
+        """Объекты, затронутые изменением: по своему ресурсу или все - если поменялась связанная модель"""
+        if resources & self.detail_dependencies:
+            return set(self.lookups())
+        prefix = f'{self.label}:{self.lookup_field}='
+        return {resource[len(prefix):] for resource in resources if resource.startswith(prefix)}
+
+
+class Page:
+    """Отдельная функция-view (главная): один файл на язык"""
+
+    def __init__(self, path, view, resources):
+        self.path = path
+        self.view = view
+        self.resources = set(resources)
+
+
+@lru_cache(maxsize=None)
+def endpoints():
+    return tuple(Endpoint(path, import_string(viewset)) for path, viewset in VIEWSETS)
+
+
+@lru_cache(maxsize=None)
+def pages():
+    from .homepage import HOMEPAGE_MODELS, HOMEPAGE_PATH
+    from .views import homepage
+    return (Page(HOMEPAGE_PATH, homepage, HOMEPAGE_MODELS),)
+
+
+def query_params(language, page=None):
+    params = {}
+    if language:
+        params['lang'] = language
+    if page and page > 1:
+        params['page'] = page
+    return params
+
+
+def file_name(path, language, page=None):
+    """/api/blog/posts/?lang=ru&page=2 -> ru/api/blog/posts/page/2/index.json"""
+    suffix = f'page/{page}/' if page and page > 1 else ''
+    return f"{language or 'all'}{path}{suffix}index.json"
+
+
+def next_page(data):
+    """Номер следующей страницы из ссылки next пагинатора"""
+    next_url = data.get('next') if isinstance(data, dict) else None
+    if not next_url:
+        return None
+    page = parse_qs(urlsplit(next_url).query).get('page')
+    return int(page[0]) if page else None
+
+
+class StaticExporter:
+    """
+    Рендер публичных ответов API в каталог JSON-файлов с манифестом sha256.
+    Файл переписывается, только если изменилось содержимое; ответ стал 404
+    (объект снят с публикации, сменил slug) - файл удаляется
+    """
+
+    def __init__(self, root=None):
+        require_public_api_url()
+        self.root = Path(root or settings.STATIC_EXPORT_ROOT)
+        self.files = self.load_manifest()
+        self.seen = set()
+        self.stats = {'written': 0, 'unchanged': 0, 'deleted': 0}
+
+    def load_manifest(self):
+        try:
+            with open(self.root / MANIFEST_NAME, 'rb') as f:
+                return json.load(f)['files']
+        except (OSError, ValueError, KeyError):
+            return {}
+
+    def save_manifest(self):
+        manifest = {'generated_at': timezone.now().isoformat(), 'files': dict(sorted(self.files.items()))}
+        self.write(MANIFEST_NAME, json.dumps(manifest, ensure_ascii=False, indent=2).encode())
+
+    def write(self, name, content):
+        """Через временный файл: CDN/веб-сервер не увидит наполовину записанный JSON"""
+        path = self.root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f'.{path.name}.tmp')
+        tmp_path.write_bytes(content)
+        os.replace(tmp_path, path)
+
+    def render(self, view, path, language, page=None, **kwargs):
+        """Ответ той же view, что обслуживает API; None - если не 200"""
+        request = build_http_request(path, query_params(language, page))
+        response = view(request, **kwargs)
+        if response.status_code != 200:
+            return None
+        response.render()
+        return response
+
+    def store(self, name, path, language, page, response):
+        self.seen.add(name)
+        content = response.content
+        digest = content_hash(content)
+        entry = self.files.get(name)
+        if entry and entry['sha256'] == digest and (self.root / name).exists():
+            self.stats['unchanged'] += 1
+        else:
+            self.write(name, content)
+            self.stats['written'] += 1
+        query = urlencode(query_params(language, page))
+        self.files[name] = {
+            'url': f'{path}?{query}' if query else path,
+            'sha256': digest,
+            'bytes': len(content),
+            'resources': response.get(settings.EDGE_SURROGATE_KEY_HEADER, '').split(),
+        }
+
+    def remove(self, name):
+        if self.files.pop(name, None) is None and not (self.root / name).exists():
+            return
+        (self.root / name).unlink(missing_ok=True)
+        self.stats['deleted'] += 1
+
+    def export_list(self, endpoint, action, language):
+        """Все страницы списка; страниц стало меньше - лишние файлы удаляются"""
+        path = endpoint.list_actions[action]
+        page = 1
+        while page:
+            response = self.render(endpoint.view(action), path, language, page)
+            if response is None:
+                break
+            self.store(file_name(path, language, page), path, language, page, response)
+            page = next_page(response.data)
+        prefix = file_name(path, language)[:-len('index.json')]
+        for name in list(self.files):
+            if name.startswith(prefix) and PAGE_FILE.fullmatch(name[len(prefix):]) and name not in self.seen:
+                self.remove(name)
+
+    def export_detail(self, endpoint, lookup, language):
+        path = f'{endpoint.path}{lookup}/'
+        name = file_name(path, language)
+        response = self.render(endpoint.view('retrieve'), path, language, **{endpoint.lookup_url_kwarg: lookup})
+        if response is None:
+            self.remove(name)
+        else:
+            self.store(name, path, language, None, response)
+
+    def export_page(self, page, language):
+        response = self.render(page.view, page.path, language)
+        if response is not None:
+            self.store(file_name(page.path, language), page.path, language, None, response)
+
+    def export_all(self):
+        """Полный экспорт; файлы, которых больше нет в API, удаляются"""
+        for endpoint in endpoints():
+            lookups = endpoint.lookups()
+            for language in VARIANTS:
+                for action in endpoint.list_actions:
+                    self.export_list(endpoint, action, language)
+                for lookup in lookups:
+                    self.export_detail(endpoint, lookup, language)
+        for page in pages():
+            for language in VARIANTS:
+                self.export_page(page, language)
+        for name in set(self.files) - self.seen:
+            self.remove(name)
+        self.save_manifest()
+        return self.stats
+
+    def export_changed(self, resources):
+        """
+        Инкрементально: только списки и объекты, чьи ресурсы (blog.post, blog.post:slug=x, ...)
+        изменились - те же ключи, по которым сбрасывается кеш ответов и очищается CDN
+        """
+        resources = set(resources)
+        for endpoint in endpoints():
+            list_changed = bool(resources & endpoint.list_resources)
+            lookups = endpoint.changed_lookups(resources)
+            for language in VARIANTS:
+                if list_changed:
+                    for action in endpoint.list_actions:
+                        self.export_list(endpoint, action, language)
+                for lookup in sorted(lookups):
+                    self.export_detail(endpoint, lookup, language)
+        for page in pages():
+            if resources & page.resources:
+                for language in VARIANTS:
+                    self.export_page(page, language)
+        self.save_manifest()
+        return self.stats
+
+
+def export_changed(resources):
+    """Ошибка экспорта только в лог: сохранение в админке не падает, следующий экспорт догонит"""
+    try:
+        stats = StaticExporter().export_changed(resources)
+    except Exception as e:
+        logger.error(f"Static export failed for {len(resources)} resources: {str(e)}")
+        return None
+    logger.info(f"Static export: {stats}")
+    return stats
+
+
+def queue_export(resources):
+    """
+    Копим ресурсы транзакции: пост с категориями и тегами дает несколько инвалидаций,
+    а экспорт нужен один - после коммита. Без STATIC_EXPORT_ROOT экспорт выключен
+    """
+    if not getattr(settings, 'STATIC_EXPORT_ROOT', ''):
+        return
+    if not hasattr(_pending, 'resources'):
+        _pending.resources = set()
+    _pending.resources.update(resources)
+    on_commit_once(flush_pending)
+
+
+def flush_pending():
+    """Вызывается после коммита: сразу или через Celery (STATIC_EXPORT_DISPATCH)"""
+    resources = sorted(getattr(_pending, 'resources', ()))
+    _pending.resources = set()
+    if not resources or not getattr(settings, 'STATIC_EXPORT_ROOT', ''):
+        return
+    if settings.STATIC_EXPORT_DISPATCH != 'celery':
+        export_changed(resources)
+        return
+    from .tasks import export_static_changes
+    try:
+        export_static_changes.apply_async(args=[resources], retry=False)
+    except Exception as e:
+        logger.warning(f"Export worker is unavailable, exporting inline: {str(e)}")
+        export_changed(resources)
@@ -0,0 +1,81 @@
+import hashlib
+import posixpath
+import re
+
+from django.conf import settings
+from django.core.files.base import File
+from django.core.files.storage import FileSystemStorage
+from django.views.static import serve
+
+try:
+    from storages.backends.s3boto3 import S3Boto3Storage
+except ImportError:  # необязательная зависимость: без django-storages - только локальная ФС
+    S3Boto3Storage = None
+
+# Имя файла - хеш содержимого: по одному URL всегда одни и те же байты
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+CONTENT_NAME = re.compile(r'(?:^|/)[0-9a-f]{2}/(?P<digest>[0-9a-f]{64})(?:\.\w+)?$')
+
+
+def content_digest(content):
+    """sha256 файла по кускам, без чтения целиком в память; позиция возвращается в начало"""
+    digest = hashlib.sha256()
+    content.seek(0)
+    for chunk in content.chunks():
+        digest.update(chunk)
+    content.seek(0)
+    return digest.hexdigest()
+
+
+def content_name(digest, original_name):
+    """<MEDIA_CONTENT_PREFIX>/ab/<sha256>.<ext>: расширение от имени загрузки (для Content-Type)"""
+    extension = posixpath.splitext(original_name)[1].lower()
+    return posixpath.join(settings.MEDIA_CONTENT_PREFIX, digest[:2], f'{digest}{extension}')
+
+
+def is_content_addressed(name):
+    return bool(CONTENT_NAME.search(name or ''))
+
+
+class ContentAddressedStorageMixin:
+    """
+    Файл сохраняется под хешем содержимого, а не под именем из upload_to.
+    Такой же файл уже есть - повторная загрузка только возвращает его имя, без записи
+    """
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, 'chunks'):
+            content = File(content, name)
+        name = content_name(content_digest(content), name)
+        if self.exists(name):
+            return name
+        return super().save(name, content, max_length=max_length)
+
+
+class ContentAddressedFileSystemStorage(ContentAddressedStorageMixin, FileSystemStorage):
+    """Локальная ФС (разработка, тесты, один сервер)"""
+
+
+if S3Boto3Storage is not None:
+    class ContentAddressedS3Storage(ContentAddressedStorageMixin, S3Boto3Storage):
+        """
+        S3 и совместимые (MinIO, R2 - через endpoint_url): объекты с Cache-Control immutable,
+        URL без подписи - иначе у одного файла каждый раз новый адрес и кеш браузера/CDN не работает
+        """
+
+        def get_default_settings(self):
+            return {
+                **super().get_default_settings(),
+                'querystring_auth': False,
+                'object_parameters': {'CacheControl': IMMUTABLE_CACHE_CONTROL},
+            }
+
+
+def serve_media(request, path, document_root=None):
+    """django.views.static.serve для разработки: файлы по хешу - с immutable"""
+    response = serve(request, path, document_root=document_root)
+    if response.status_code == 200 and is_content_addressed(path):
+        response['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+    return response
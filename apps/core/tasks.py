@@ -0,0 +1,30 @@
+from celery import shared_task
+
+from .counters import view_counter
+from .edge import purge_keys
+
+
+@shared_task
+def flush_view_counts():
+    """Периодически сбрасывает буфер просмотров в БД"""
+    return view_counter.flush()
+
+
+@shared_task
+def purge_edge_keys(keys):
+    """Очистка CDN по surrogate-ключам после изменения контента"""
+    return purge_keys(keys)
+
+
+@shared_task
+def export_static_changes(resources):
+    """Инкрементальный статический экспорт после изменения контента"""
+    from .static_export import export_changed
+    return export_changed(resources)
+
+
+@shared_task
+def generate_image_renditions(label, pk, field_name, source):
+    """Варианты WebP/JPEG и LQIP для загруженного изображения"""
+    from .images import generate_renditions
+    return generate_renditions(label, pk, field_name, source) is not None
@@ -1,3 +1,808 @@
-from django.test import TestCase
+import json
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from io import BytesIO, StringIO
+from unittest.mock import patch
 
-# Create your tests here.
+from PIL import Image
+
+from django.contrib.auth.models import User, update_last_login
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.db import DatabaseError
+from django.db.models.signals import post_delete, pre_save
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.serializers import BaseSerializer
+from rest_framework.test import APIClient, APIRequestFactory
+
+from apps.analytics.models import PageView
+from apps.blog.models import Post, Tag
+from apps.portfolio.models import Project
+from .models import SiteSettings
+from .cache import RESPONSE_PREFIX, get_stats
+from .counters import RedisViewBuffer, ViewCounter
+from .homepage import rebuild_snapshots
+from .purge_server import PurgeServer
+from .renderers import FastJSONParser, FastJSONRenderer
+from .search import RankedOrderingFilter
+from .site_config import VERSION_KEY, refresh_site_config
+from .storage import IMMUTABLE_CACHE_CONTROL, serve_media
+from .static_export import MANIFEST_NAME, StaticExporter, flush_pending
+from . import timing
+from .timing import RequestTimings
+
+
+class ServerTimingTest(TestCase):
+    """Server-Timing отдается только для попавших в выборку запросов"""
+
+    def setUp(self):
+        self.client = APIClient(HTTP_HOST='localhost')
+        cache.clear()
+
+    @override_settings(SERVER_TIMING_SAMPLE_RATE=1.0)
+    def test_sampled_request_has_metrics(self):
+        with self.assertLogs('apps.core.timing', 'INFO') as logs:
+            response = self.client.get('/api/blog/categories/')
+        header = response['Server-Timing']
+        # Метрики одного запроса не должны попасть в общий кеш CDN
+        self.assertEqual(response['Cache-Control'], 'private, max-age=0')
+        self.assertIn('db;dur=', header)
+        self.assertIn('desc="0 hits, 1 misses"', header)
+        self.assertIn('serialize;dur=', header)
+        self.assertIn('"path": "/api/blog/categories/"', logs.output[0])
+
+        # Повтор - из кеша ответов, без сериализации
+        header = self.client.get('/api/blog/categories/')['Server-Timing']
+        self.assertIn('desc="1 hits, 0 misses"', header)
+        self.assertNotIn('serialize', header)
+
+    @override_settings(SERVER_TIMING_SAMPLE_RATE=0)
+    def test_not_sampled_request_has_no_header(self):
+        response = self.client.get('/api/blog/categories/')
+        self.assertNotIn('Server-Timing', response)
+        self.assertIn('s-maxage=', response['Cache-Control'])
+
+    def test_pool_threads_report_into_request(self):
+        def call_api():
+            with timing.measure('http'):
+                time.sleep(0.01)
+
+        timings = RequestTimings()
+        token = timing._current.set(timings)
+        try:
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                for future in [timing.submit(executor, call_api) for _ in range(2)]:
+                    future.result()
+        finally:
+            timing._current.reset(token)
+        # Оба потока видят замер запроса и не блокируют друг друга
+        self.assertGreaterEqual(timings.durations['http'], 0.02)
+
+    def test_serializer_classes_are_not_patched(self):
+        self.assertFalse(hasattr(BaseSerializer.data.fget, 'timed'))
+
+
+class ConditionalGetTest(TestCase):
+    """ETag/Last-Modified: повторный запрос получает 304 без сериализации"""
+
+    def setUp(self):
+        self.client = APIClient(HTTP_HOST='localhost')
+        cache.clear()
+        refresh_site_config()
+        author = User.objects.create(username='author')
+        self.post = Post.objects.create(
+            author=author, slug='post', title_en='Post', content_en='Content',
+            status='published', thumbnail='post.png',
+        )
+
+    @override_settings(SERVER_TIMING_SAMPLE_RATE=1.0)
+    def test_list_not_modified(self):
+        response = self.client.get('/api/blog/posts/')
+        etag = response['ETag']
+        self.assertTrue(etag.startswith('W/"'))
+        # У списка только ETag (в нем число строк): max(updated_at) не видит удалений
+        self.assertNotIn('Last-Modified', response)
+
+        # Ответ в кеше - 304 без запросов к БД
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/blog/posts/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        # Ответа в кеше нет - один запрос валидатора и никакой сериализации
+        get = cache.get
+
+        def evicted(key, *args, **kwargs):
+            return None if key.startswith(RESPONSE_PREFIX) else get(key, *args, **kwargs)
+
+        with patch.object(cache, 'get', evicted), self.assertNumQueries(1):
+            response = self.client.get('/api/blog/posts/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertNotIn('serialize', response['Server-Timing'])
+
+    def test_detail_changes_after_update(self):
+        response = self.client.get('/api/blog/posts/post/')
+        etag, last_modified = response['ETag'], response['Last-Modified']
+        response = self.client.get('/api/blog/posts/post/', HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.post.title_en = 'Updated'
+            self.post.save()
+        response = self.client.get('/api/blog/posts/post/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(response.json()['title_en'], 'Updated')
+
+    def test_missing_or_malformed_lookup_is_404(self):
+        for url in ('/api/portfolio/skills/abc/', '/api/portfolio/projects/pr1/', '/api/blog/posts/missing/'):
+            self.assertEqual(self.client.get(url).status_code, 404, url)
+            # Несуществующий объект не бывает "не изменился"
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH='*').status_code, 404, url)
+        self.assertEqual(self.client.get('/api/blog/posts/post/', HTTP_IF_NONE_MATCH='*').status_code, 304)
+
+    def test_list_ignores_if_modified_since(self):
+        older = Post.objects.create(
+            author=self.post.author, slug='older', title_en='Older', content_en='Content',
+            status='published', thumbnail='post.png',
+        )
+        Post.objects.filter(pk=older.pk).update(updated_at=self.post.updated_at - timedelta(days=1))
+        since = self.client.get('/api/blog/posts/post/')['Last-Modified']
+        # Снятие с публикации старого поста не двигает max(updated_at) списка
+        Post.objects.filter(pk=older.pk).update(status='draft')
+        cache.clear()
+        response = self.client.get('/api/blog/posts/', HTTP_IF_MODIFIED_SINCE=since)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([post['slug'] for post in response.json()['results']], ['post'])
+
+
+@override_settings(SERVER_TIMING_SAMPLE_RATE=0)  # ответ из выборки Server-Timing получает private
+class EdgeCacheTest(TestCase):
+    """Cache-Control и surrogate-ключи в ответах, очистка CDN после изменения"""
+
+    def setUp(self):
+        self.client = APIClient(HTTP_HOST='localhost')
+        cache.clear()
+        author = User.objects.create(username='author')
+        self.post = Post.objects.create(
+            author=author, slug='post', title_en='Post', content_en='Content',
+            status='published', thumbnail='post.png',
+        )
+        self.project = Project.objects.create(
+            slug='project', title_en='Project', description_en='Description', status='published',
+        )
+
+    def test_public_response_has_edge_headers(self):
+        response = self.client.get('/api/blog/posts/')
+        self.assertEqual(response['Cache-Control'], 'public, max-age=0, s-maxage=60, stale-while-revalidate=600')
+        keys = response['Surrogate-Key'].split()
+        self.assertIn('blog.post', keys)
+        self.assertIn('blog.category', keys)
+
+        response = self.client.get('/api/blog/posts/post/comments/')
+        self.assertNotIn('Surrogate-Key', response)
+
+    def test_counted_detail_is_not_edge_cached(self):
+        # Попадание в CDN не дошло бы до счетчика просмотров
+        for path in ('/api/blog/posts/post/', f'/api/portfolio/projects/{self.project.pk}/'):
+            response = self.client.get(path)
+            self.assertEqual(response.status_code, 200, path)
+            self.assertEqual(response['Cache-Control'], 'private, max-age=0', path)
+            self.assertNotIn('Surrogate-Key', response)
+            response = self.client.get(path, HTTP_IF_NONE_MATCH=response['ETag'])
+            self.assertEqual(response.status_code, 304)
+            self.assertEqual(response['Cache-Control'], 'private, max-age=0', path)
+
+    def test_save_purges_keys(self):
+        with PurgeServer(token='secret') as server, \
+                override_settings(EDGE_PURGE_URL=server.url, EDGE_PURGE_TOKEN='secret'):
+            with self.captureOnCommitCallbacks(execute=True):
+                self.post.title_en = 'Updated'
+                self.post.save()
+        self.assertTrue({'blog.post', f'blog.post:pk={self.post.pk}', 'blog.post:slug=post'} <= server.keys)
+
+
+class FastJSONRendererTest(TestCase):
+    """orjson-рендер отдает те же байты, что и JSONRenderer DRF"""
+
+    data = {
+        'created_at': timezone.make_aware(datetime(2024, 5, 1, 12, 30, 15, 123456), dt_timezone.utc),
+        'date': date(2024, 5, 1),
+        'price': Decimal('9.90'),
+        'id': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+        'label': gettext_lazy('Title'),
+        'text': 'Привет\u2028мир',
+        1: [1.5, None, True],
+    }
+
+    def test_same_bytes_as_drf(self):
+        self.assertEqual(FastJSONRenderer().render(self.data), JSONRenderer().render(self.data))
+        # Отступы - обычный рендер
+        indented = FastJSONRenderer().render(self.data, 'application/json; indent=2')
+        self.assertEqual(indented, JSONRenderer().render(self.data, 'application/json; indent=2'))
+
+    def test_fallback_without_orjson(self):
+        with patch('apps.core.renderers.orjson', None):
+            self.assertEqual(FastJSONRenderer().render(self.data), JSONRenderer().render(self.data))
+
+    def test_parser(self):
+        self.assertEqual(FastJSONParser().parse(BytesIO('{"a": "ü"}'.encode())), {'a': 'ü'})
+        with self.assertRaises(ParseError):
+            FastJSONParser().parse(BytesIO(b'{"a": }'))
+
+
+class HomepageSnapshotTest(TestCase):
+    """Главная одним ответом из снимка; изменение контента пересобирает снимок один раз"""
+
+    def setUp(self):
+        self.client = APIClient(HTTP_HOST='localhost')
+        cache.clear()
+        refresh_site_config()
+        # bulk_create - без сигналов: в TestCase все идет одной транзакцией,
+        # и пересборка из setUp поглотила бы пересборку из теста
+        author, = User.objects.bulk_create([User(username='author')])
+        self.post, = Post.objects.bulk_create([Post(
+            author=author, slug='post', title_en='Post', title_ru='Пост', content_en='Content',
+            status='published', thumbnail='post.png', is_featured=True, published_at=timezone.now(),
+        )])
+        Project.objects.bulk_create([Project(
+            slug='project', title_en='Project', description_en='Description',
+            status='published', thumbnail='project.png', is_featured=True, published_at=timezone.now(),
+        )])
+
+    def test_bundle_is_served_from_snapshot(self):
+        data = self.client.get('/api/core/homepage/').json()
+        self.assertEqual(
+            set(data), {'site_settings', 'seo_settings', 'featured_projects', 'skills',
+                        'technologies', 'featured_posts', 'generated_at'},
+        )
+        self.assertEqual(data['featured_posts'][0]['title_en'], 'Post')
+        self.assertEqual(data['featured_projects'][0]['slug'], 'project')
+
+        ru = self.client.get('/api/core/homepage/', {'lang': 'ru'}).json()
+        self.assertEqual(ru['featured_posts'][0]['title'], 'Пост')
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/core/homepage/', {'lang': 'ru'})
+            response = self.client.get('/api/core/homepage/', {'lang': 'ru'}, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_save_rebuilds_snapshot_once(self):
+        self.client.get('/api/core/homepage/')
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            self.post.title_en = 'Updated'
+            self.post.save()
+            self.post.tags.set([Tag.objects.create(slug='tag', name_en='Tag')])
+        self.assertEqual(callbacks.count(rebuild_snapshots), 1)
+
+        with self.assertNumQueries(0):
+            data = self.client.get('/api/core/homepage/').json()
+        self.assertEqual(data['featured_posts'][0]['title_en'], 'Updated')
+
+    def test_login_does_not_rebuild_snapshot(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            update_last_login(None, self.post.author)
+        self.assertNotIn(rebuild_snapshots, callbacks)
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.post.author.first_name = 'Author'
+            self.post.author.save()
+        self.assertIn(rebuild_snapshots, callbacks)
+
+    def test_snapshot_expires(self):
+        with patch('apps.core.homepage.cache.set') as cache_set:
+            rebuild_snapshots()
+        self.assertTrue(all(call.kwargs['timeout'] > 0 for call in cache_set.call_args_list))
+
+
+class StaticExportTest(TestCase):
+    """Экспорт ответов API в файлы; изменение поста переписывает только его файлы"""
+
+    def setUp(self):
+        cache.clear()
+        self.root = tempfile.TemporaryDirectory()
+        self.addCleanup(self.root.cleanup)
+        self.settings_override = override_settings(
+            STATIC_EXPORT_ROOT=self.root.name, STATIC_EXPORT_DISPATCH='sync', PUBLIC_API_URL='https://portfolio-api.vercel.app',
+        )
+        self.settings_override.enable()
+        self.addCleanup(self.settings_override.disable)
+        author, = User.objects.bulk_create([User(username='author')])
+        self.post, = Post.objects.bulk_create([Post(
+            author=author, slug='post', title_en='Post', title_ru='Пост', content_en='Content',
+            status='published', thumbnail='post.png', published_at=timezone.now(),
+        )])
+        self.project, = Project.objects.bulk_create([Project(
+            slug='project', title_en='Project', description_en='Description',
+            status='published', thumbnail='project.png', published_at=timezone.now(),
+        )])
+
+    def read(self, name):
+        with open(f'{self.root.name}/{name}', 'rb') as f:
+            return json.load(f)
+
+    def test_exported_urls_use_public_host(self):
+        StaticExporter().export_all()
+        thumbnail = self.read('all/api/blog/posts/post/index.json')['thumbnail']
+        self.assertTrue(thumbnail.startswith('https://portfolio-api.vercel.app/media/'), thumbnail)
+
+    @override_settings(PUBLIC_API_URL='http://localhost:8000')
+    def test_refuses_localhost_outside_debug(self):
+        with self.assertRaises(ImproperlyConfigured):
+            StaticExporter()
+        with override_settings(DEBUG=True):
+            StaticExporter()
+
+    def test_full_export_writes_files_and_manifest(self):
+        stats = StaticExporter().export_all()
+        self.assertGreater(stats['written'], 0)
+        self.assertEqual(self.read('all/api/blog/posts/index.json')['results'][0]['title_en'], 'Post')
+        self.assertEqual(self.read('ru/api/blog/posts/post/index.json')['title'], 'Пост')
+        self.assertEqual(self.read('he/api/portfolio/projects/featured/index.json')['count'], 0)
+        manifest = self.read(MANIFEST_NAME)['files']
+        entry = manifest['ru/api/blog/posts/post/index.json']
+        self.assertEqual(entry['url'], '/api/blog/posts/post/?lang=ru')
+        self.assertIn('blog.post:slug=post', entry['resources'])
+        self.assertIn('all/api/core/homepage/index.json', manifest)
+        # Экспорт не считается просмотром
+        self.assertEqual(Post.objects.get().views_count, 0)
+
+        stats = StaticExporter().export_all()
+        # Без изменений переписывается только главная (в ней время сборки)
+        self.assertEqual(stats['written'], len(['all', 'en', 'ru', 'he']))
+        self.assertEqual(stats['deleted'], 0)
+
+    def test_change_rewrites_only_affected_files(self):
+        StaticExporter().export_all()
+        project_file = f'all/api/portfolio/projects/{self.project.pk}/index.json'
+        project = self.read(MANIFEST_NAME)['files'][project_file]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.post.title_en = 'Updated'
+            self.post.save()
+        self.assertEqual(self.read('all/api/blog/posts/post/index.json')['title_en'], 'Updated')
+        self.assertEqual(self.read('en/api/blog/posts/index.json')['results'][0]['title'], 'Updated')
+        self.assertEqual(self.read(MANIFEST_NAME)['files'][project_file], project)
+
+        # Снят с публикации - детальный файл удаляется, список пустеет.
+        # В TestCase транзакция не коммитится и flush_pending уже в очереди - вызываем сами
+        self.post.status = 'draft'
+        self.post.save()
+        flush_pending()
+        files = self.read(MANIFEST_NAME)['files']
+        self.assertNotIn('all/api/blog/posts/post/index.json', files)
+        self.assertEqual(self.read('all/api/blog/posts/index.json')['count'], 0)
+
+    def test_login_does_not_reexport(self):
+        with patch('apps.core.static_export.export_changed') as export_changed, \
+                self.captureOnCommitCallbacks(execute=True):
+            update_last_login(None, self.post.author)
+        export_changed.assert_not_called()
+
+        with patch('apps.core.static_export.export_changed') as export_changed, \
+                self.captureOnCommitCallbacks(execute=True):
+            self.post.author.first_name = 'Author'
+            self.post.author.save()
+        self.assertIn('auth.user', export_changed.call_args.args[0])
+
+
+class FeedsTest(TestCase):
+    """sitemap и ленты из values(), с hreflang; кеш сбрасывается публикацией, а не правкой черновика"""
+
+    def setUp(self):
+        self.client = APIClient(HTTP_HOST='localhost')
+        cache.clear()
+        refresh_site_config()
+        author = User.objects.create(username='author')
+        self.post = Post.objects.create(
+            author=author, slug='post', title_en='Post', title_ru='Пост', excerpt_ru='Кратко',
+            content_en='Content', status='published', thumbnail='post.png', published_at=timezone.now(),
+        )
+        self.draft = Post.objects.create(
+            author=author, slug='draft', title_en='Draft', content_en='Content', thumbnail='post.png',
+        )
+
+    def get_text(self, path):
+        response = self.client.get(path)
+        self.assertEqual(response.status_code, 200)
+        content = b''.join(response.streaming_content) if response.streaming else response.content
+        return content.decode()
+
+    def test_sitemap_and_feeds(self):
+        index = self.get_text('/sitemap.xml')
+        self.assertIn('http://localhost/sitemap-posts-1.xml', index)
+        self.assertIn('http://localhost/sitemap-projects-1.xml', index)
+
+        urls = self.get_text('/sitemap-posts-1.xml')
+        self.assertIn('<loc>http://localhost:3000/ru/blog/post/</loc>', urls)
+        self.assertIn('hreflang="x-default" href="http://localhost:3000/en/blog/post/"', urls)
+        self.assertNotIn('/he/blog/post/', urls)
+        self.assertNotIn('draft', urls)
+
+        rss = self.get_text('/feeds/posts/ru.rss')
+        self.assertIn('<title>Пост</title>', rss)
+        self.assertIn('<description>Кратко</description>', rss)
+        atom = self.get_text('/feeds/posts/en.atom')
+        self.assertIn('hreflang="ru" href="http://localhost:3000/ru/blog/post/"', atom)
+        self.assertEqual(self.client.get('/feeds/posts/de.rss').status_code, 404)
+
+        # Повтор - из кеша, без БД
+        with self.assertNumQueries(0):
+            self.assertEqual(self.get_text('/feeds/posts/ru.rss'), rss)
+
+    def test_publish_invalidates_drafts_do_not(self):
+        self.get_text('/feeds/posts/en.rss')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.draft.title_en = 'Still a draft'
+            self.draft.save()
+        with self.assertNumQueries(0):
+            self.get_text('/feeds/posts/en.rss')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.draft.status = 'published'
+            self.draft.published_at = timezone.now()
+            self.draft.save()
+        self.assertIn('Still a draft', self.get_text('/feeds/posts/en.rss'))
+
+
+
+class SiteConfigTest(TestCase):
+    """Настройки из снимка процесса; режим обслуживания - 503 без запросов к БД"""
+
+    def setUp(self):
+        self.client = APIClient(HTTP_HOST='localhost')
+        cache.clear()
+        self.addCleanup(refresh_site_config)
+        # bulk_create - без сигналов: иначе обновление снимка из setUp поглотило бы обновление из теста
+        self.settings, = SiteSettings.objects.bulk_create([SiteSettings(
+            site_name_en='Site', email='site@example.com',
+            maintenance_message_en='Back soon', maintenance_message_ru='Скоро вернемся',
+        )])
+        refresh_site_config()
+
+    def test_settings_are_served_without_queries(self):
+        self.client.get('/api/core/site-settings/')
+        cache.delete_many([key for key in cache._cache if RESPONSE_PREFIX in key])
+        with self.assertNumQueries(0):
+            response = self.client.get(f'/api/core/site-settings/{self.settings.pk}/')
+        self.assertEqual(response.json()['site_name_en'], 'Site')
+        self.assertEqual(self.client.get('/api/core/site-settings/0/').status_code, 404)
+
+    def test_maintenance_mode_short_circuits_api(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.settings.is_maintenance_mode = True
+            self.settings.save()
+
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/blog/posts/', {'lang': 'ru'})
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json(), {'detail': 'Скоро вернемся', 'maintenance': True})
+        self.assertEqual(response['Retry-After'], '300')
+        response = self.client.get('/api/portfolio/projects/', HTTP_ACCEPT_LANGUAGE='he')
+        self.assertEqual(response.json()['detail'], 'Back soon')
+        self.assertEqual(self.client.get('/api/health/').status_code, 200)
+
+        # Выключили в другом воркере: здесь снимок перечитается по новой версии в кеше
+        SiteSettings.objects.filter(pk=self.settings.pk).update(is_maintenance_mode=False)
+        cache.set(VERSION_KEY, 'other-worker', timeout=None)
+        with override_settings(SITE_CONFIG_CHECK_INTERVAL=0):
+            self.assertEqual(self.client.get('/api/blog/posts/').status_code, 200)
+
+
+class ImageRenditionsTest(TestCase):
+    """Варианты изображений по ширинам без увеличения; srcset в API; команда догоняет старые строки"""
+
+    def setUp(self):
+        self.client = APIClient(HTTP_HOST='localhost')
+        cache.clear()
+        refresh_site_config()
+        self.media = tempfile.TemporaryDirectory()
+        self.addCleanup(self.media.cleanup)
+        self.settings_override = override_settings(MEDIA_ROOT=self.media.name, IMAGE_RENDITIONS_DISPATCH='sync')
+        self.settings_override.enable()
+        self.addCleanup(self.settings_override.disable)
+        buffer = BytesIO()
+        Image.new('RGBA', (1000, 500), (200, 40, 40, 128)).save(buffer, format='PNG')
+        self.source = default_storage.save('uploads/post/photo.png', ContentFile(buffer.getvalue()))
+        author, = User.objects.bulk_create([User(username='author')])
+        self.post, = Post.objects.bulk_create([Post(
+            author=author, slug='post', title_en='Post', content_en='Content',
+            status='published', thumbnail=self.source, published_at=timezone.now(),
+        )])
+
+    def test_save_generates_renditions(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.post.save()
+        self.post.refresh_from_db()
+        renditions = self.post.thumbnail_renditions
+        self.assertEqual((renditions['source'], renditions['width'], renditions['height']), (self.source, 1000, 500))
+        self.assertTrue(renditions['lqip'].startswith('data:image/jpeg;base64,'))
+        widths = sorted({variant['width'] for variant in renditions['variants']})
+        self.assertEqual(widths, [320, 640, 960, 1000])
+        for variant in renditions['variants']:
+            self.assertTrue(default_storage.exists(variant['name']))
+        with default_storage.open(renditions['variants'][0]['name']) as f, Image.open(f) as image:
+            self.assertEqual(image.size, (320, 160))
+
+        data = self.client.get('/api/blog/posts/post/').json()
+        thumbnail = data['thumbnail_renditions']
+        self.assertEqual(thumbnail['srcset']['webp'].count('w,'), 3)
+        self.assertTrue(thumbnail['srcset']['webp'].startswith('http://localhost/media/content/'))
+        self.assertTrue(thumbnail['fallback'].endswith('.jpg'))
+        self.assertIsNone(data['cover_image_renditions'])
+
+    def test_command_processes_backlog(self):
+        out = StringIO()
+        call_command('regenerate_image_renditions', workers=1, stdout=out)
+        self.assertIn('blog.post: 1', out.getvalue())
+        self.assertEqual(Post.objects.get().thumbnail_renditions['source'], self.source)
+
+        out = StringIO()
+        call_command('regenerate_image_renditions', workers=1, stdout=out)
+        self.assertIn('Все варианты на месте', out.getvalue())
+
+    def test_boot_does_not_import_pillow(self):
+        # Отдельный процесс: в этом Pillow уже загружен тестами
+        code = (
+            'import sys, django; django.setup(); import apps.core.signals; '
+            'print(any(name.startswith("PIL") for name in sys.modules))'
+        )
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.strip(), 'False')
+
+
+class ContentAddressedStorageTest(TestCase):
+    """Файлы по хешу содержимого: дубликат не записывается, URL immutable, сироты находятся"""
+
+    def setUp(self):
+        self.media = tempfile.TemporaryDirectory()
+        self.addCleanup(self.media.cleanup)
+        self.settings_override = override_settings(MEDIA_ROOT=self.media.name)
+        self.settings_override.enable()
+        self.addCleanup(self.settings_override.disable)
+
+    def test_identical_uploads_share_one_file(self):
+        first = default_storage.save('uploads/post/a.PNG', ContentFile(b'image'))
+        second = default_storage.save('uploads/project/b.png', ContentFile(b'image'))
+        other = default_storage.save('uploads/post/c.png', ContentFile(b'other'))
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, other)
+        self.assertRegex(first, r'^content/[0-9a-f]{2}/[0-9a-f]{64}\.png$')
+        self.assertEqual(len(default_storage.listdir(first.rsplit('/', 1)[0])[1]), 1)
+
+        response = serve_media(APIRequestFactory().get(f'/media/{first}'), first, document_root=self.media.name)
+        self.assertEqual(response['Cache-Control'], IMMUTABLE_CACHE_CONTROL)
+
+    def test_reconcile_finds_files_without_rows(self):
+        author, = User.objects.bulk_create([User(username='author')])
+        kept = default_storage.save('uploads/post/kept.png', ContentFile(b'kept'))
+        orphan = default_storage.save('uploads/post/orphan.png', ContentFile(b'orphan'))
+        variant = default_storage.save('uploads/post/variant.webp', ContentFile(b'variant'))
+        Post.objects.bulk_create([Post(
+            author=author, slug='post', title_en='Post', content_en='Content', thumbnail=kept,
+            thumbnail_renditions={'source': kept, 'variants': [{'name': variant}]},
+        )])
+
+        out = StringIO()
+        call_command('reconcile_media', min_age=0, stdout=out)
+        self.assertIn(orphan, out.getvalue())
+        self.assertTrue(default_storage.exists(orphan))
+
+        call_command('reconcile_media', min_age=0, delete=True, stdout=StringIO())
+        self.assertFalse(default_storage.exists(orphan))
+        self.assertTrue(default_storage.exists(kept))
+        self.assertTrue(default_storage.exists(variant))
+
+
+class FakeRedis:
+    """Хеши Redis в памяти: только команды, которые использует RedisViewBuffer"""
+
+    def __init__(self):
+        self.hashes = {}
+
+    def hincrby(self, name, key, amount):
+        values = self.hashes.setdefault(name, {})
+        values[key.encode()] = str(int(values.get(key.encode(), 0)) + amount).encode()
+        return int(values[key.encode()])
+
+    def hgetall(self, name):
+        return dict(self.hashes.get(name, {}))
+
+    def rename(self, source, target):
+        import redis
+        if source not in self.hashes:
+            raise redis.ResponseError('no such key')
+        self.hashes[target] = self.hashes.pop(source)
+
+    def delete(self, name):
+        self.hashes.pop(name, None)
+
+    def scan_iter(self, match):
+        return [name.encode() for name in list(self.hashes) if name.startswith(match.rstrip('*'))]
+
+    def pipeline(self):
+        return self
+
+    def execute(self):
+        return []
+
+
+class ViewCounterTest(TestCase):
+    """Буфер подтверждается после записи в БД; без Redis просмотр пишется сразу"""
+
+    def setUp(self):
+        author, = User.objects.bulk_create([User(username='author')])
+        self.post, = Post.objects.bulk_create([Post(
+            author=author, slug='post', title_en='Post', content_en='Content', thumbnail='post.png',
+        )])
+
+    @override_settings(VIEW_COUNTER_BACKEND='memory', VIEW_COUNTER_FLUSH_INTERVAL=3600)
+    def test_flush_writes_buffered_views(self):
+        counter = ViewCounter()
+        counter.increment_for(Post, self.post.pk)
+        self.assertEqual(counter.increment_for(Post, self.post.pk), 2)
+        self.assertEqual(counter.flush(), 1)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.views_count, 2)
+        self.assertEqual(counter.flush(), 0)
+
+    @override_settings(VIEW_COUNTER_BACKEND='memory', VIEW_COUNTER_FLUSH_INTERVAL=3600)
+    def test_failed_flush_restores_buffer(self):
+        counter = ViewCounter()
+        counter.increment_for(Post, self.post.pk)
+        with patch('apps.core.counters.invalidate_objects', side_effect=DatabaseError), \
+                self.assertRaises(DatabaseError):
+            counter.flush()
+        counter.increment_for(Post, self.post.pk)
+        counter.flush()
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.views_count, 2)
+
+    @override_settings(VIEW_COUNTER_BACKEND='direct')
+    def test_direct_backend_updates_row(self):
+        counter = ViewCounter()
+        self.assertEqual(counter.increment_for(Post, self.post.pk), 0)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.views_count, 1)
+        self.assertEqual(counter.flush(), 0)
+
+    @override_settings(VIEW_COUNTER_BACKEND='direct')
+    def test_increment_views_on_project(self):
+        project, = Project.objects.bulk_create([Project(slug='project', title_en='Project', thumbnail='p.png')])
+        self.assertEqual(project.increment_views(), 0)
+        project.refresh_from_db()
+        self.assertEqual(project.views_count, 1)
+
+    @override_settings(VIEW_COUNTER_BACKEND='memory', VIEW_COUNTER_FLUSH_INTERVAL=3600)
+    def test_increment_views_goes_through_buffer(self):
+        with patch('apps.core.models.view_counter', ViewCounter()) as counter:
+            project, = Project.objects.bulk_create([Project(slug='project', title_en='Project', thumbnail='p.png')])
+            self.assertEqual(project.increment_views(), 1)
+            self.assertEqual(project.increment_views(), 2)
+            counter.flush()
+        project.refresh_from_db()
+        self.assertEqual(project.views_count, 2)
+
+    def test_redis_recovers_abandoned_flush(self):
+        buffer = RedisViewBuffer.__new__(RedisViewBuffer)
+        buffer._redis, buffer.lease = FakeRedis(), 300
+        buffer.incr('blog.post:1')
+        # Процесс забрал хеш и умер до ack/restore
+        stale = f'{RedisViewBuffer.FLUSHING_PREFIX}{int(time.time()) - 600}:dead'
+        buffer._redis.rename(RedisViewBuffer.HASH_KEY, stale)
+        fresh = f'{RedisViewBuffer.FLUSHING_PREFIX}{int(time.time())}:running'
+        buffer._redis.hashes[fresh] = {b'blog.post:2': b'5'}
+        buffer.incr('blog.post:1')
+
+        token, pending = buffer.drain()
+        # Зависший хеш вернулся в буфер; идущий сейчас сброс другого процесса не тронут
+        self.assertEqual(pending, {'blog.post:1': 2})
+        buffer.ack(token)
+        self.assertEqual(set(buffer._redis.hashes), {fresh})
+
+    @override_settings(VIEW_COUNTER_BACKEND='direct')
+    def test_conditional_get_is_counted(self):
+        Post.objects.filter(pk=self.post.pk).update(status='published', published_at=timezone.now())
+        client = APIClient(HTTP_HOST='localhost')
+        cache.clear()
+        first = client.get('/api/blog/posts/post/')
+        self.assertEqual(first.json()['views_count'], 0)
+        # Повторный визит с ETag: 304 без тела, но просмотр засчитан
+        self.assertEqual(client.get('/api/blog/posts/post/', HTTP_IF_NONE_MATCH=first['ETag']).status_code, 304)
+        # ?fields= без id - pk по slug
+        client.get('/api/blog/posts/post/', {'fields': 'title'})
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.views_count, 3)
+
+
+class CachedResponseTest(TestCase):
+    """Промах, попадание без запросов к БД, сброс версии после сохранения"""
+
+    def setUp(self):
+        self.client = APIClient(HTTP_HOST='localhost')
+        cache.clear()
+        refresh_site_config()
+        self.tag, = Tag.objects.bulk_create([Tag(slug='django', name_en='Django')])
+
+    def test_hit_miss_and_invalidation(self):
+        self.assertEqual(self.client.get('/api/blog/tags/').json()['results'][0]['name_en'], 'Django')
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get('/api/blog/tags/').json()['results'][0]['name_en'], 'Django')
+        self.assertEqual(get_stats(['blog.tag'])['blog.tag'], {'hits': 1, 'misses': 1, 'hit_ratio': 0.5})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.tag.name_en = 'Django REST'
+            self.tag.save()
+        self.assertEqual(self.client.get('/api/blog/tags/').json()['results'][0]['name_en'], 'Django REST')
+        self.assertEqual(get_stats(['blog.tag'])['blog.tag']['misses'], 2)
+
+    def test_uncached_models_have_no_receivers(self):
+        # Лишний SELECT на каждое сохранение и потерянный fast delete для аналитики
+        self.assertFalse(pre_save.has_listeners(PageView))
+        self.assertFalse(post_delete.has_listeners(PageView))
+        self.assertTrue(pre_save.has_listeners(Tag))
+
+
+class SearchTest(TestCase):
+    """Общий поиск /api/search/, ?search= в списках и порядок по релевантности"""
+
+    def setUp(self):
+        self.client = APIClient(HTTP_HOST='localhost')
+        cache.clear()
+        refresh_site_config()
+        author, = User.objects.bulk_create([User(username='author')])
+        Post.objects.bulk_create([
+            Post(author=author, slug=f'django-{index}', title_en=f'Django {index}', content_en='Content',
+                 status='published', thumbnail='post.png', published_at=timezone.now())
+            for index in range(3)
+        ] + [
+            Post(author=author, slug='draft', title_en='Django draft', content_en='Content',
+                 status='draft', thumbnail='post.png'),
+        ])
+        Project.objects.bulk_create([Project(
+            slug='project', title_en='Django project', description_en='Description',
+            status='published', thumbnail='project.png', published_at=timezone.now(),
+        )])
+
+    def search(self, **params):
+        response = self.client.get('/api/search/', params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()['results']
+
+    def test_posts_and_projects_without_drafts(self):
+        results = self.search(q='django')
+        self.assertEqual(sorted(result['type'] for result in results), ['post', 'post', 'post', 'project'])
+        self.assertNotIn('draft', {result['slug'] for result in results})
+        self.assertEqual(self.search(q='   '), [])
+
+    def test_limit_is_clamped(self):
+        self.assertEqual(len(self.search(q='django', limit=-5)), 1)
+        self.assertEqual(len(self.search(q='django', limit=0)), 1)
+        self.assertEqual(len(self.search(q='django', limit='abc')), 4)
+
+    def test_list_search_filter(self):
+        results = self.client.get('/api/blog/posts/', {'search': 'django 1'}).json()['results']
+        self.assertEqual([post['slug'] for post in results], ['django-1'])
+
+    def test_ranked_ordering(self):
+        view = type('View', (), {'ordering': ['-published_at']})()
+        factory = APIRequestFactory()
+        view.request = Request(factory.get('/', {'search': 'django'}))
+        with patch('apps.core.search.is_postgres', return_value=True):
+            self.assertEqual(RankedOrderingFilter().get_default_ordering(view), ('-rank', '-published_at'))
+            view.request = Request(factory.get('/'))
+            self.assertEqual(RankedOrderingFilter().get_default_ordering(view), ['-published_at'])
+        # Вне PostgreSQL rank нет - обычный порядок
+        view.request = Request(factory.get('/', {'search': 'django'}))
+        self.assertEqual(RankedOrderingFilter().get_default_ordering(view), ['-published_at'])
@@ -0,0 +1,168 @@
+import json
+import logging
+import random
+import threading
+import time
+from collections import defaultdict
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar, copy_context
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+_current = ContextVar('request_timings', default=None)
+# Метрики, которые уже замеряются в этом потоке/контексте: вложенные блоки не считаем дважды
+_measuring = ContextVar('measuring', default=frozenset())
+
+
+class RequestTimings:
+    """Метрики одного запроса: длительности (сек) и счетчики по именам"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.durations = defaultdict(float)
+        self.counts = defaultdict(int)
+        # Блоки из потоков пула (submit) дописывают в тот же объект
+        self._lock = threading.Lock()
+
+    def add(self, name, seconds):
+        with self._lock:
+            self.durations[name] += seconds
+
+    @property
+    def total(self):
+        return time.perf_counter() - self.started
+
+    def as_dict(self):
+        data = {f'{name}_ms': round(seconds * 1000, 2) for name, seconds in self.durations.items()}
+        data.update(self.counts)
+        data['total_ms'] = round(self.total * 1000, 2)
+        return data
+
+    def header(self):
+        """Значение Server-Timing: метрика;dur=мс;desc="..." через запятую"""
+        metrics = []
+        if self.counts['db_queries']:
+            metrics.append(f'db;dur={self.durations["db"] * 1000:.2f};desc="{self.counts["db_queries"]} queries"')
+        if self.counts['cache_hits'] or self.counts['cache_misses']:
+            metrics.append(
+                f'cache;dur={self.durations["cache"] * 1000:.2f};'
+                f'desc="{self.counts["cache_hits"]} hits, {self.counts["cache_misses"]} misses"'
+            )
+        for name in ('serialize', 'http'):
+            if name in self.durations:
+                metrics.append(f'{name};dur={self.durations[name] * 1000:.2f}')
+        metrics.append(f'total;dur={self.total * 1000:.2f}')
+        return ', '.join(metrics)
+
+
+@contextmanager
+def measure(name):
+    """Добавить время блока к метрике текущего запроса (вне замера - ничего не делает)"""
+    timings = _current.get()
+    # Вложенные блоки той же метрики (сериализатор внутри сериализатора) не считаем дважды
+    active = _measuring.get()
+    if timings is None or name in active:
+        yield
+        return
+    token = _measuring.set(active | {name})
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(name, time.perf_counter() - started)
+        _measuring.reset(token)
+
+
+def submit(executor, fn, *args, **kwargs):
+    """
+    executor.submit в копии текущего контекста: потоки пула не наследуют ContextVar,
+    без копии внешние вызовы из них не попадали бы в замер запроса
+    """
+    return executor.submit(copy_context().run, fn, *args, **kwargs)
+
+
+def count(name, amount=1):
+    timings = _current.get()
+    if timings is not None:
+        timings.counts[name] += amount
+
+
+class QueryTimer:
+    """connection.execute_wrapper: число SQL-запросов и время в БД"""
+
+    def __init__(self, timings):
+        self.timings = timings
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.timings.durations['db'] += time.perf_counter() - started
+            self.timings.counts['db_queries'] += 1
+
+
+class TimedSerializerMixin:
+    """
+    Замер сериализации DRF для Server-Timing: только сериализаторы этого ViewSet
+    и только в запросах из выборки - классы сериализаторов не меняются
+    """
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        if _current.get() is not None:
+            to_representation = serializer.to_representation
+
+            def timed_representation(instance):
+                with measure('serialize'):
+                    return to_representation(instance)
+
+            serializer.to_representation = timed_representation
+        return serializer
+
+
+def is_shared_cacheable(response):
+    cache_control = response.get('Cache-Control', '').lower()
+    return 'public' in cache_control or 's-maxage' in cache_control
+
+
+class ServerTimingMiddleware:
+    """
+    Для доли запросов (SERVER_TIMING_SAMPLE_RATE) собирает SQL, кеш, сериализацию
+    и внешние вызовы, отдает их в Server-Timing и пишет строку лога в JSON
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        rate = getattr(settings, 'SERVER_TIMING_SAMPLE_RATE', 0)
+        if rate <= 0 or random.random() >= rate:
+            return self.get_response(request)
+
+        timings = RequestTimings()
+        token = _current.set(timings)
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(QueryTimer(timings)))
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+
+        response['Server-Timing'] = timings.header()
+        # Иначе CDN сохранит ответ с метриками этого запроса и раздаст их всем.
+        # Для браузера ничего не меняется (max-age=0 и так), CDN просто не сохранит этот ответ
+        if is_shared_cacheable(response):
+            response['Cache-Control'] = 'private, max-age=0'
+        record = {
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            **timings.as_dict(),
+        }
+        logger.info(f"request_timing {json.dumps(record)}")
+        return response
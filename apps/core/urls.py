@@ -8,5 +8,7 @@ router.register(r'seo-settings', views.SEOSettingsViewSet)
 
 urlpatterns = [
     path('health/', views.health_check, name='health_check'),
+    path('cache-stats/', views.cache_stats, name='cache_stats'),
+    path('homepage/', views.homepage, name='homepage'),
     path('', include(router.urls)),
 ]
@@ -1,17 +1,95 @@
+from django.http import Http404
 from rest_framework import viewsets
-from rest_framework.decorators import api_view
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
 from rest_framework.response import Response
+from . import homepage as homepage_snapshot
+from .cache import CachedResponseMixin, get_stats
+from .conditional import is_not_modified, not_modified_response, set_validators
+from .edge import set_edge_headers
+from .localization import get_request_language
+from .search import search as full_text_search
 from .models import SiteSettings, SEOSettings
 from .serializers import SiteSettingsSerializer, SEOSettingsSerializer
+from .site_config import get_site_config, site_config
+from .snapshots import is_snapshot_request
 
 @api_view(['GET'])
 def health_check(request):
     return Response({'status': 'ok', 'message': 'API is working'})
 
-class SiteSettingsViewSet(viewsets.ReadOnlyModelViewSet):
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def cache_stats(request):
+    """Попадания/промахи кеша ответов API по моделям"""
+    return Response(get_stats(CachedResponseMixin.cached_labels()))
+
+@api_view(['GET'])
+def homepage(request):
+    """Все данные главной одним ответом: заранее собранный снимок, горячий путь - одно чтение кеша"""
+    language = get_request_language(request)
+    # Экспорт собирает заново: снимок в кеше может быть еще не пересобран после коммита
+    if is_snapshot_request(request):
+        data, etag = homepage_snapshot.build_snapshot(language)
+    else:
+        data, etag = homepage_snapshot.get_snapshot(language)
+    if is_not_modified(request, etag, None):
+        response = not_modified_response(etag, None)
+    else:
+        response = set_validators(Response(data), etag, None)
+    return set_edge_headers(request, response, homepage_snapshot.EDGE_CACHE, homepage_snapshot.HOMEPAGE_MODELS)
+
+@api_view(['GET'])
+def search(request):
+    """Поиск по постам блога и проектам портфолио: ?q=...&lang=en|ru|he"""
+    query = request.query_params.get('q', '').strip()
+    if not query:
+        return Response({'query': query, 'results': []})
+    try:
+        limit = max(1, min(int(request.query_params.get('limit', 20)), 50))
+    except ValueError:
+        limit = 20
+    results = full_text_search(query, request.query_params.get('lang', 'en'), limit)
+    return Response({'query': query, 'results': results})
+
+class SiteConfigViewSetMixin:
+    """
+    Настройки отдаются из процессного снимка (site_config): ни списку, ни объекту,
+    ни ETag не нужна БД. queryset класса остается для реестра кеша и экспорта
+    """
+    config_attr = None
+    filter_backends = []
+
+    def get_queryset(self):
+        # Экспорт читает БД: снимок процесса может обновиться позже на этом же коммите
+        config = site_config.load() if is_snapshot_request(self.request) else get_site_config()
+        return getattr(config, self.config_attr)
+
+    def get_object(self):
+        lookup = str(self.kwargs[self.lookup_url_kwarg or self.lookup_field])
+        for obj in self.get_queryset():
+            if str(obj.pk) == lookup:
+                return obj
+        raise Http404
+
+    def get_validators(self):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        if lookup_url_kwarg in self.kwargs:
+            try:
+                return self.get_object().updated_at, None
+            except Http404:
+                return None, None
+        objects = self.get_queryset()
+        return max((obj.updated_at for obj in objects), default=None), len(objects)
+
+class SiteSettingsViewSet(SiteConfigViewSetMixin, CachedResponseMixin, viewsets.ReadOnlyModelViewSet):
+    edge_cache = {'s_maxage': 600, 'stale_while_revalidate': 86400}
     queryset = SiteSettings.objects.filter(is_active=True)
     serializer_class = SiteSettingsSerializer
+    config_attr = 'site_settings'
 
-class SEOSettingsViewSet(viewsets.ReadOnlyModelViewSet):
+class SEOSettingsViewSet(SiteConfigViewSetMixin, CachedResponseMixin, viewsets.ReadOnlyModelViewSet):
+    edge_cache = {'s_maxage': 600, 'stale_while_revalidate': 86400}
     queryset = SEOSettings.objects.filter(is_active=True)
     serializer_class = SEOSettingsSerializer
+    config_attr = 'seo_settings'
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.7 on 2026-10-18 15:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("portfolio", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="project",
+            index=models.Index(
+                condition=models.Q(("status", "published")),
+                fields=["-published_at", "order"],
+                name="portfolio_project_pub_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="skill",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["category", "position"],
+                name="portfolio_skill_active_idx",
+            ),
+        ),
+    ]
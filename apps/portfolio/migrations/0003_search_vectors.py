@@ -0,0 +1,58 @@
+# Generated by Django 4.2.7 on 2026-10-18 15:58
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+from apps.core.operations import PostgresAddIndex, fill_search_vectors
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("portfolio", "0002_hot_path_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="project",
+            name="search_en",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="project",
+            name="search_he",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="project",
+            name="search_ru",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        PostgresAddIndex(
+            model_name="project",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_en"], name="portfolio_proj_search_en_idx"
+            ),
+        ),
+        PostgresAddIndex(
+            model_name="project",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_ru"], name="portfolio_proj_search_ru_idx"
+            ),
+        ),
+        PostgresAddIndex(
+            model_name="project",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_he"], name="portfolio_proj_search_he_idx"
+            ),
+        ),
+        migrations.RunPython(
+            fill_search_vectors("portfolio.project"), migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 4.2.7 on 2026-10-18 16:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("portfolio", "0003_search_vectors"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="project",
+            index=models.Index(
+                condition=models.Q(("is_featured", True), ("status", "published")),
+                fields=["-published_at", "order"],
+                name="portfolio_project_feat_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 4.2.7 on 2026-10-18 16:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("portfolio", "0004_featured_index"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="project",
+            index=models.Index(
+                condition=models.Q(("status", "published")),
+                fields=["updated_at"],
+                name="portfolio_project_upd_idx",
+            ),
+        ),
+    ]
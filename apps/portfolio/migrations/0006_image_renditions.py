@@ -0,0 +1,27 @@
+# Generated by Django 4.2.7 on 2026-10-18 16:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("portfolio", "0005_updated_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="project",
+            name="cover_image_renditions",
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.AddField(
+            model_name="project",
+            name="thumbnail_renditions",
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.AddField(
+            model_name="technology",
+            name="logo_renditions",
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
@@ -1,4 +1,7 @@
 from django.db import models
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
+from django.db.models import Q
 from django.utils.translation import gettext_lazy as _
 from django.utils import timezone
 from apps.core.models import (
@@ -10,11 +13,12 @@ from apps.core.models import (
     PublishableModel, 
     ViewableModel, 
     FeaturedModel,
+    MultiLanguageModel,
     get_image_upload_path
 )
 
 
-class Category(TimeStampedModel, SlugModel, OrderableModel, ActiveModel):
+class Category(TimeStampedModel, SlugModel, OrderableModel, ActiveModel, MultiLanguageModel):
     """Категория проектов"""
     name_en = models.CharField(max_length=100, verbose_name=_('Name (EN)'))
     name_ru = models.CharField(max_length=100, blank=True, verbose_name=_('Name (RU)'))
@@ -36,7 +40,7 @@ class Category(TimeStampedModel, SlugModel, OrderableModel, ActiveModel):
         return self.name_en
 
 
-class Technology(TimeStampedModel, SlugModel, OrderableModel, ActiveModel):
+class Technology(TimeStampedModel, SlugModel, OrderableModel, ActiveModel, MultiLanguageModel):
     """Технология, используемая в проектах"""
     name = models.CharField(max_length=100, verbose_name=_('Name'))
     description_en = models.TextField(blank=True, verbose_name=_('Description (EN)'))
@@ -45,6 +49,7 @@ class Technology(TimeStampedModel, SlugModel, OrderableModel, ActiveModel):
     
     icon = models.CharField(max_length=50, blank=True, verbose_name=_('Icon'))
     logo = models.ImageField(upload_to=get_image_upload_path, blank=True, null=True, verbose_name=_('Logo'))
+    logo_renditions = models.JSONField(default=dict, blank=True, editable=False)
     color = models.CharField(max_length=20, blank=True, verbose_name=_('Color'))
     
     website = models.URLField(blank=True, verbose_name=_('Website'))
@@ -59,7 +64,7 @@ class Technology(TimeStampedModel, SlugModel, OrderableModel, ActiveModel):
         return self.name
 
 
-class Project(TimeStampedModel, SlugModel, SEOModel, PublishableModel, ViewableModel, FeaturedModel):
+class Project(TimeStampedModel, SlugModel, SEOModel, PublishableModel, ViewableModel, FeaturedModel, MultiLanguageModel):
     """Проект в портфолио"""
     title_en = models.CharField(max_length=200, verbose_name=_('Title (EN)'))
     title_ru = models.CharField(max_length=200, blank=True, verbose_name=_('Title (RU)'))
@@ -79,6 +84,9 @@ class Project(TimeStampedModel, SlugModel, SEOModel, PublishableModel, ViewableM
     
     thumbnail = models.ImageField(upload_to=get_image_upload_path, verbose_name=_('Thumbnail'))
     cover_image = models.ImageField(upload_to=get_image_upload_path, blank=True, null=True, verbose_name=_('Cover Image'))
+    # Варианты WebP/JPEG по ширинам и LQIP, заполняются сигналом apps.core.signals
+    thumbnail_renditions = models.JSONField(default=dict, blank=True, editable=False)
+    cover_image_renditions = models.JSONField(default=dict, blank=True, editable=False)
     
     categories = models.ManyToManyField(Category, related_name='projects', verbose_name=_('Categories'))
     technologies = models.ManyToManyField(Technology, related_name='projects', verbose_name=_('Technologies'))
@@ -96,11 +104,35 @@ class Project(TimeStampedModel, SlugModel, SEOModel, PublishableModel, ViewableM
     is_active = models.BooleanField(default=True, verbose_name=_('Is Active'))
     
     order = models.PositiveIntegerField(default=0, verbose_name=_('Order'))
+    
+    # Полнотекстовый поиск (PostgreSQL), обновляется сигналом apps.core.signals
+    search_en = SearchVectorField(null=True, editable=False)
+    search_ru = SearchVectorField(null=True, editable=False)
+    search_he = SearchVectorField(null=True, editable=False)
 
     class Meta:
         verbose_name = _('Project')
         verbose_name_plural = _('Projects')
         ordering = ['-published_at', 'order']
+        indexes = [
+            models.Index(
+                fields=['-published_at', 'order'], name='portfolio_project_pub_idx',
+                condition=Q(status='published'),
+            ),
+            # Витрина /projects/featured/ с пагинацией
+            models.Index(
+                fields=['-published_at', 'order'], name='portfolio_project_feat_idx',
+                condition=Q(status='published', is_featured=True),
+            ),
+            # ETag списка: max(updated_at) + COUNT по индексу (apps.core.conditional)
+            models.Index(
+                fields=['updated_at'], name='portfolio_project_upd_idx',
+                condition=Q(status='published'),
+            ),
+            GinIndex(fields=['search_en'], name='portfolio_proj_search_en_idx'),
+            GinIndex(fields=['search_ru'], name='portfolio_proj_search_ru_idx'),
+            GinIndex(fields=['search_he'], name='portfolio_proj_search_he_idx'),
+        ]
 
     def __str__(self):
         return self.title_en
@@ -111,7 +143,7 @@ class Project(TimeStampedModel, SlugModel, SEOModel, PublishableModel, ViewableM
         super().save(*args, **kwargs)
 
 
-class Skill(TimeStampedModel, SlugModel, OrderableModel, ActiveModel):
+class Skill(TimeStampedModel, SlugModel, OrderableModel, ActiveModel, MultiLanguageModel):
     """Навык или умение"""
     name_en = models.CharField(max_length=100, verbose_name=_('Name (EN)'))
     name_ru = models.CharField(max_length=100, blank=True, verbose_name=_('Name (RU)'))
@@ -140,6 +172,9 @@ class Skill(TimeStampedModel, SlugModel, OrderableModel, ActiveModel):
         verbose_name = _('Skill')
         verbose_name_plural = _('Skills')
         ordering = ['category', 'position']
+        indexes = [
+            models.Index(fields=['category', 'position'], name='portfolio_skill_active_idx', condition=Q(is_active=True)),
+        ]
 
     def __str__(self):
         return self.name_en
\ No newline at end of file
@@ -1,25 +1,73 @@
 from rest_framework import serializers
+from apps.core.fieldsets import SparseFieldsetSerializerMixin
+from apps.core.images import ImageRenditionsField
+from apps.core.localization import LocalizedSerializerMixin
 from .models import Category, Technology, Project, Skill
 
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(SparseFieldsetSerializerMixin, LocalizedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Category
         fields = '__all__'
+        localized_fields = ['name', 'description']
+
+class TechnologySerializer(SparseFieldsetSerializerMixin, LocalizedSerializerMixin, serializers.ModelSerializer):
+    logo_renditions = ImageRenditionsField()
 
-class TechnologySerializer(serializers.ModelSerializer):
     class Meta:
         model = Technology
         fields = '__all__'
+        localized_fields = ['description']
+
+class CategorySummarySerializer(SparseFieldsetSerializerMixin, LocalizedSerializerMixin, serializers.ModelSerializer):
+    """Категория в карточке проекта"""
+    class Meta:
+        model = Category
+        fields = ['id', 'slug', 'name_en', 'name_ru', 'name_he', 'icon', 'color']
+        localized_fields = ['name']
 
-class ProjectSerializer(serializers.ModelSerializer):
+class TechnologySummarySerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
+    """Технология в карточке проекта"""
+    logo_renditions = ImageRenditionsField()
+
+    class Meta:
+        model = Technology
+        fields = ['id', 'slug', 'name', 'icon', 'logo', 'logo_renditions', 'color']
+
+class ProjectListSerializer(SparseFieldsetSerializerMixin, LocalizedSerializerMixin, serializers.ModelSerializer):
+    """Карточка проекта для списков: без content_* и SEO-полей"""
+    categories = CategorySummarySerializer(many=True, read_only=True)
+    technologies = TechnologySummarySerializer(many=True, read_only=True)
+    thumbnail_renditions = ImageRenditionsField()
+    cover_image_renditions = ImageRenditionsField()
+
+    class Meta:
+        model = Project
+        fields = [
+            'id', 'slug', 'title_en', 'title_ru', 'title_he',
+            'subtitle_en', 'subtitle_ru', 'subtitle_he',
+            'description_en', 'description_ru', 'description_he',
+            'thumbnail', 'cover_image', 'thumbnail_renditions', 'cover_image_renditions',
+            'categories', 'technologies',
+            'project_url', 'github_url', 'is_ongoing', 'is_featured',
+            'published_at', 'views_count', 'order'
+        ]
+        localized_fields = ['title', 'subtitle', 'description']
+        expandable_fields = ['categories', 'technologies']
+
+class ProjectDetailSerializer(SparseFieldsetSerializerMixin, LocalizedSerializerMixin, serializers.ModelSerializer):
     categories = CategorySerializer(many=True, read_only=True)
     technologies = TechnologySerializer(many=True, read_only=True)
+    thumbnail_renditions = ImageRenditionsField()
+    cover_image_renditions = ImageRenditionsField()
     
     class Meta:
         model = Project
-        fields = '__all__'
+        exclude = ['search_en', 'search_ru', 'search_he']
+        localized_fields = ['title', 'subtitle', 'description', 'content']
+        expandable_fields = ['categories', 'technologies']
 
-class SkillSerializer(serializers.ModelSerializer):
+class SkillSerializer(SparseFieldsetSerializerMixin, LocalizedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Skill
         fields = '__all__'
+        localized_fields = ['name', 'description']
@@ -1,3 +1,57 @@
+from django.core.cache import cache
 from django.test import TestCase
+from rest_framework.test import APIClient
+from apps.core.site_config import refresh_site_config
+from .models import Category, Technology, Project
 
-# Create your tests here.
+
+class ProjectQueriesTest(TestCase):
+    """Список проектов - постоянное число запросов, в карточках только активные связи"""
+
+    def setUp(self):
+        self.client = APIClient(HTTP_HOST='localhost')
+        cache.clear()
+        self.category = Category.objects.create(slug='web', name_en='Web')
+        self.hidden = Category.objects.create(slug='hidden', name_en='Hidden', is_active=False)
+        self.technology = Technology.objects.create(slug='django', name='Django')
+        # Снимок настроек процесса (режим обслуживания) - заранее, вне подсчета запросов
+        refresh_site_config()
+
+    def add_projects(self, count, **kwargs):
+        for number in range(Project.objects.count(), Project.objects.count() + count):
+            project = Project.objects.create(
+                slug=f'project-{number}', title_en=f'Project {number}', description_en='Description',
+                content_en='Long content', status='published', thumbnail='project.png', **kwargs,
+            )
+            project.categories.add(self.category, self.hidden)
+            project.technologies.add(self.technology)
+
+    def get_list(self, path='/api/portfolio/projects/'):
+        cache.clear()
+        response = self.client.get(path)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_list_query_count_does_not_depend_on_size(self):
+        self.add_projects(2)
+        # валидатор ETag + COUNT + страница + категории + технологии
+        with self.assertNumQueries(5):
+            self.get_list()
+
+        self.add_projects(8)
+        with self.assertNumQueries(5):
+            data = self.get_list()
+
+        project = data['results'][0]
+        self.assertNotIn('content_en', project)
+        self.assertEqual([category['slug'] for category in project['categories']], ['web'])
+
+    def test_featured_is_paginated(self):
+        self.add_projects(3, is_featured=True)
+        self.add_projects(2)
+        data = self.get_list('/api/portfolio/projects/featured/')
+        self.assertEqual(data['count'], 3)
+        self.assertEqual(len(data['results']), 3)
+
+        detail = self.client.get(f"/api/portfolio/projects/{data['results'][0]['id']}/").json()
+        self.assertEqual(detail['content_en'], 'Long content')
@@ -1,12 +1,22 @@
 from rest_framework import viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from django.db.models import Prefetch
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
+from apps.core.search import FullTextSearchFilter, RankedOrderingFilter
 from .models import Category, Technology, Project, Skill
-from .serializers import CategorySerializer, TechnologySerializer, ProjectSerializer, SkillSerializer
+from .serializers import (
+    CategorySerializer, TechnologySerializer, ProjectListSerializer,
+    ProjectDetailSerializer, SkillSerializer
+)
+from apps.core.cache import CachedResponseMixin, cache_response
+from apps.core.counters import ViewCountingMixin
+from apps.core.fieldsets import SparseFieldsetMixin
+from apps.core.localization import LocalizedQuerysetMixin
 
-class CategoryViewSet(viewsets.ReadOnlyModelViewSet):
+class CategoryViewSet(SparseFieldsetMixin, LocalizedQuerysetMixin, CachedResponseMixin, viewsets.ReadOnlyModelViewSet):
+    edge_cache = {'s_maxage': 3600, 'stale_while_revalidate': 86400}
     queryset = Category.objects.filter(is_active=True)
     serializer_class = CategorySerializer
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
@@ -14,7 +24,8 @@ class CategoryViewSet(viewsets.ReadOnlyModelViewSet):
     ordering_fields = ['position', 'created_at']
     ordering = ['position']
 
-class TechnologyViewSet(viewsets.ReadOnlyModelViewSet):
+class TechnologyViewSet(SparseFieldsetMixin, LocalizedQuerysetMixin, CachedResponseMixin, viewsets.ReadOnlyModelViewSet):
+    edge_cache = {'s_maxage': 3600, 'stale_while_revalidate': 86400}
     queryset = Technology.objects.filter(is_active=True)
     serializer_class = TechnologySerializer
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
@@ -22,22 +33,56 @@ class TechnologyViewSet(viewsets.ReadOnlyModelViewSet):
     ordering_fields = ['position', 'created_at']
     ordering = ['position']
 
-class ProjectViewSet(viewsets.ReadOnlyModelViewSet):
-    queryset = Project.objects.filter(status='published')
-    serializer_class = ProjectSerializer
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+class ProjectViewSet(ViewCountingMixin, SparseFieldsetMixin, LocalizedQuerysetMixin, CachedResponseMixin, viewsets.ReadOnlyModelViewSet):
+    cache_dependencies = ('portfolio.category', 'portfolio.technology')
+    edge_cache = {'s_maxage': 300, 'stale_while_revalidate': 3600}
+    # В проекте показываем только активные категории и технологии
+    relation_loaders = {
+        'categories': Prefetch('categories', queryset=Category.objects.filter(is_active=True)),
+        'technologies': Prefetch('technologies', queryset=Technology.objects.filter(is_active=True)),
+    }
+    queryset = Project.objects.filter(status='published').prefetch_related(
+        relation_loaders['categories'], relation_loaders['technologies'],
+    )
+    # tsvector-колонки не нужны ни одному ответу, тексты страницы и SEO - только детальному
+    deferred_fields = ['search_en', 'search_ru', 'search_he']
+    list_deferred_fields = [
+        'content_en', 'content_ru', 'content_he',
+        'client_name', 'client_website', 'start_date', 'end_date',
+        'meta_title', 'meta_description', 'meta_keywords',
+    ]
+    serializer_class = ProjectListSerializer
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter, RankedOrderingFilter]
     filterset_fields = ['categories', 'technologies', 'is_featured']
     search_fields = ['title_en', 'title_ru', 'title_he', 'description_en']
     ordering_fields = ['published_at', 'order']
     ordering = ['-published_at', 'order']
 
+    def get_serializer_class(self):
+        if self.action == 'retrieve':
+            return ProjectDetailSerializer
+        return ProjectListSerializer
+
+    def get_queryset(self):
+        queryset = super().get_queryset().defer(*self.deferred_fields)
+        if self.action != 'retrieve':
+            queryset = queryset.defer(*self.list_deferred_fields)
+        return queryset
+
     @action(detail=False, methods=['get'])
+    @cache_response
     def featured(self, request):
-        featured_projects = self.queryset.filter(is_featured=True)
+        featured_projects = self.get_queryset().filter(is_featured=True)
+        page = self.paginate_queryset(featured_projects)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
         serializer = self.get_serializer(featured_projects, many=True)
         return Response(serializer.data)
 
-class SkillViewSet(viewsets.ReadOnlyModelViewSet):
+class SkillViewSet(SparseFieldsetMixin, LocalizedQuerysetMixin, CachedResponseMixin, viewsets.ReadOnlyModelViewSet):
+    edge_cache = {'s_maxage': 3600, 'stale_while_revalidate': 86400}
     queryset = Skill.objects.filter(is_active=True)
     serializer_class = SkillSerializer
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
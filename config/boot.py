@@ -0,0 +1,30 @@
+"""
+Прогрев при холодном старте serverless-функции: то, что Django иначе
+делает лениво на первом запросе, выполняется один раз при загрузке модуля
+"""
+from django.urls import URLPattern, URLResolver, get_resolver
+
+
+def compile_patterns(patterns):
+    """Скомпилировать регулярные выражения всех маршрутов (Django компилирует их при первом resolve)"""
+    compiled = 0
+    for pattern in patterns:
+        pattern.pattern.regex
+        compiled += 1
+        if isinstance(pattern, URLResolver):
+            compiled += compile_patterns(pattern.url_patterns)
+        elif isinstance(pattern, URLPattern):
+            pattern.lookup_str
+    return compiled
+
+
+def precompile_urls():
+    """Импортировать все URLconf и заполнить reverse-словари корневого резолвера"""
+    resolver = get_resolver()
+    compiled = compile_patterns(resolver.url_patterns)
+    resolver._populate()
+    return compiled
+
+
+def warm_up():
+    return precompile_urls()
@@ -47,7 +47,9 @@ LOCAL_APPS = [
 INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
 
 MIDDLEWARE = [
+    'apps.core.timing.ServerTimingMiddleware',  # первым - чтобы total включал весь стек
     'corsheaders.middleware.CorsMiddleware',
+    'apps.core.site_config.MaintenanceModeMiddleware',  # после CORS - фронтенд увидит 503, а не ошибку CORS
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -144,6 +146,25 @@ STATICFILES_DIRS = [
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# 🔧 ХРАНИЛИЩЕ МЕДИА: имя файла - sha256 содержимого (дубликаты не хранятся, URL кешируются навсегда).
+# filesystem - MEDIA_ROOT; s3 - django-storages (S3 или совместимое: MinIO, R2 через AWS_S3_ENDPOINT_URL)
+MEDIA_STORAGE = config('MEDIA_STORAGE', default='filesystem')
+MEDIA_CONTENT_PREFIX = 'content'
+STORAGES = {
+    'default': {'BACKEND': 'apps.core.storage.ContentAddressedFileSystemStorage'},
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+}
+if MEDIA_STORAGE == 's3':
+    STORAGES['default'] = {
+        'BACKEND': 'apps.core.storage.ContentAddressedS3Storage',
+        'OPTIONS': {
+            'bucket_name': config('AWS_STORAGE_BUCKET_NAME', default=''),
+            'endpoint_url': config('AWS_S3_ENDPOINT_URL', default=None),
+            'region_name': config('AWS_S3_REGION_NAME', default=None),
+            'custom_domain': config('AWS_S3_CUSTOM_DOMAIN', default=None),
+        },
+    }
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
@@ -155,8 +176,14 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticatedOrReadOnly',
     ],
+    # orjson, если установлен; без него - тот же JSONRenderer/JSONParser DRF
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        'apps.core.renderers.FastJSONRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'apps.core.renderers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
@@ -166,6 +193,10 @@ REST_FRAMEWORK = {
         'rest_framework.filters.OrderingFilter',
     ],
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    # Публичный прием аналитики без авторизации - ограничиваем по IP
+    'DEFAULT_THROTTLE_RATES': {
+        'analytics_collect': config('ANALYTICS_COLLECT_RATE', default='60/min'),
+    },
 }
 
 # JWT Settings
@@ -227,6 +258,117 @@ CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = TIME_ZONE
+CELERY_BEAT_SCHEDULE = {
+    'flush-view-counts': {
+        'task': 'apps.core.tasks.flush_view_counts',
+        'schedule': 60.0,
+    },
+    'flush-analytics': {
+        'task': 'apps.analytics.tasks.flush_analytics',
+        'schedule': 10.0,
+    },
+    'rollup-daily-statistics': {
+        'task': 'apps.analytics.tasks.rollup_daily_statistics',
+        'schedule': 15 * 60.0,
+    },
+    'deliver-contact-notifications': {
+        'task': 'apps.contacts.tasks.deliver_contact_notifications',
+        'schedule': 30.0,
+    },
+    'send-due-newsletters': {
+        'task': 'apps.contacts.tasks.send_due_newsletters',
+        'schedule': 60.0,
+    },
+}
+
+# 🔧 КЕШ (Redis через django-redis, если задан REDIS_URL; иначе - локальная память)
+CACHE_REDIS_URL = config('REDIS_URL', default='')
+if CACHE_REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django_redis.cache.RedisCache',
+            'LOCATION': CACHE_REDIS_URL,
+            'OPTIONS': {
+                'CLIENT_CLASS': 'django_redis.client.DefaultClient',
+                'IGNORE_EXCEPTIONS': True,  # Redis недоступен - работаем как при промахе
+            },
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'vitaly-portfolio',
+        }
+    }
+
+# 🔧 SITESETTINGS/SEOSETTINGS: снимок в памяти процесса, версия в кеше сверяется не чаще раза в N сек
+SITE_CONFIG_CHECK_INTERVAL = config('SITE_CONFIG_CHECK_INTERVAL', default=1.0, cast=float)
+SITE_CONFIG_MAX_AGE = 300  # сек; страховка, если ключ версии вытеснен из кеша
+# Режим обслуживания: 503 на /api/, кроме проверок здоровья
+MAINTENANCE_EXEMPT_PATHS = ('/api/health/', '/api/core/health/')
+MAINTENANCE_RETRY_AFTER = 300  # сек
+
+# Время жизни закешированных ответов API (сек); инвалидация - по сигналам моделей
+API_CACHE_TIMEOUT = config('API_CACHE_TIMEOUT', default=300, cast=int)
+
+# 🔧 СЧЕТЧИК ПРОСМОТРОВ: redis - общий буфер воркеров, сброс пачками; без Redis - direct (UPDATE сразу).
+# memory - буфер в процессе, только для разработки: сброс командой/задачей из другого процесса его не видит
+VIEW_COUNTER_BACKEND = config('VIEW_COUNTER_BACKEND', default='redis' if CACHE_REDIS_URL else 'direct')
+VIEW_COUNTER_REDIS_URL = config('REDIS_URL', default='redis://localhost:6379/0')
+VIEW_COUNTER_FLUSH_INTERVAL = config('VIEW_COUNTER_FLUSH_INTERVAL', default=60, cast=int)
+VIEW_COUNTER_FLUSH_LEASE = 300  # сек; хеш незавершенного сброса старше - процесс упал, просмотры возвращаются в буфер
+
+# 🔧 ОЧЕРЕДЬ АНАЛИТИКИ: redis - общая очередь, запись пачкой по размеру или по времени;
+# без Redis - direct (пачка запроса пишется сразу); memory - только для разработки
+ANALYTICS_QUEUE_BACKEND = config('ANALYTICS_QUEUE_BACKEND', default='redis' if CACHE_REDIS_URL else 'direct')
+ANALYTICS_QUEUE_REDIS_URL = config('REDIS_URL', default='redis://localhost:6379/0')
+ANALYTICS_BATCH_SIZE = config('ANALYTICS_BATCH_SIZE', default=500, cast=int)
+ANALYTICS_FLUSH_INTERVAL = config('ANALYTICS_FLUSH_INTERVAL', default=10, cast=int)
+# Страна и город - из заголовков прокси (Vercel), а не из тела запроса
+ANALYTICS_COUNTRY_HEADER = config('ANALYTICS_COUNTRY_HEADER', default='HTTP_X_VERCEL_IP_COUNTRY')
+ANALYTICS_CITY_HEADER = config('ANALYTICS_CITY_HEADER', default='HTTP_X_VERCEL_IP_CITY')
+
+# 🔧 OUTBOX УВЕДОМЛЕНИЙ (celery - воркер будится после коммита; command - только deliver_notifications/beat)
+CONTACT_NOTIFICATIONS_DISPATCH = config('CONTACT_NOTIFICATIONS_DISPATCH', default='celery')
+CONTACT_NOTIFICATION_MAX_ATTEMPTS = config('CONTACT_NOTIFICATION_MAX_ATTEMPTS', default=6, cast=int)
+CONTACT_NOTIFICATION_RETRY_BASE = 30  # сек, задержка удваивается с каждой попыткой
+CONTACT_NOTIFICATION_RETRY_MAX = 3600
+CONTACT_NOTIFICATION_SENDING_TIMEOUT = 300  # через сколько зависшая отправка возвращается в очередь
+
+# 🔧 РАССЫЛКА: пачки фиксированного размера по пулу постоянных SMTP-соединений
+NEWSLETTER_BATCH_SIZE = config('NEWSLETTER_BATCH_SIZE', default=100, cast=int)
+NEWSLETTER_SMTP_CONNECTIONS = config('NEWSLETTER_SMTP_CONNECTIONS', default=3, cast=int)
+NEWSLETTER_STALE_AFTER = 600  # сек без прогресса - рассылка считается прерванной и возобновляется
+NEWSLETTER_MAX_ATTEMPTS = config('NEWSLETTER_MAX_ATTEMPTS', default=5, cast=int)  # попыток открыть SMTP до failed
+
+# 🔧 SERVER-TIMING: доля запросов с замером SQL/кеша/сериализации/внешних вызовов (0 - выключено)
+SERVER_TIMING_SAMPLE_RATE = config('SERVER_TIMING_SAMPLE_RATE', default=0.05, cast=float)
+
+# Публичный адрес API: абсолютные ссылки в ответах, собранных вне запроса (снимки, экспорт)
+PUBLIC_API_URL = config('PUBLIC_API_URL', default='http://localhost:8000')
+# Публичный адрес фронтенда: ссылки в sitemap и RSS/Atom (/<lang>/blog/<slug>/)
+PUBLIC_SITE_URL = config('PUBLIC_SITE_URL', default='http://localhost:3000')
+SITEMAP_SHARD_SIZE = 10000  # объектов на шард; до 3 <url> на объект - в пределах лимита 50 000
+FEED_ITEMS = 50
+
+# 🔧 CDN (Vercel Edge): Cache-Control с s-maxage у публичных ViewSet и очистка по surrogate-ключам
+EDGE_SURROGATE_KEY_HEADER = config('EDGE_SURROGATE_KEY_HEADER', default='Surrogate-Key')
+EDGE_PURGE_URL = config('EDGE_PURGE_URL', default='')  # пусто - очистка выключена
+EDGE_PURGE_TOKEN = config('EDGE_PURGE_TOKEN', default='')
+EDGE_PURGE_TIMEOUT = 5  # сек
+EDGE_PURGE_DISPATCH = config('EDGE_PURGE_DISPATCH', default='sync')  # sync - сразу после коммита, celery - воркером
+
+# 🔧 СТАТИЧЕСКИЙ ЭКСПОРТ: публичные ответы API JSON-файлами для CDN (пусто - выключен)
+STATIC_EXPORT_ROOT = config('STATIC_EXPORT_ROOT', default='')
+# celery - воркером (без брокера - сразу); sync - сразу после коммита, в запросе, который сохранил объект
+STATIC_EXPORT_DISPATCH = config('STATIC_EXPORT_DISPATCH', default='celery')
+
+# 🔧 ИЗОБРАЖЕНИЯ: варианты WebP/JPEG по ширинам для srcset и LQIP-заглушка
+IMAGE_RENDITION_WIDTHS = (320, 640, 960, 1280)  # шире оригинала не увеличиваем
+IMAGE_RENDITION_FORMATS = ('webp', 'jpeg')
+IMAGE_RENDITION_QUALITY = 80
+IMAGE_RENDITIONS_DISPATCH = config('IMAGE_RENDITIONS_DISPATCH', default='sync')  # sync - сразу после коммита, celery - воркером
 
 # Email настройки
 DEFAULT_FROM_EMAIL = 'noreply@vitalyportfolio.com'
@@ -4,6 +4,9 @@ import dj_database_url  # ✅ ДОБАВЛЯЕМ для Docker
 # Debug settings
 DEBUG = True
 
+# В разработке Server-Timing у каждого запроса
+SERVER_TIMING_SAMPLE_RATE = config('SERVER_TIMING_SAMPLE_RATE', default=1.0, cast=float)
+
 # ALLOWED_HOSTS = [
 #     'vitaly-portfolio-backend-production.up.railway.app',
 #     '.railway.app',
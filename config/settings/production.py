@@ -1,17 +1,26 @@
 # config/settings/production.py
 from .base import *
 import os
+from urllib.parse import urlsplit
+
 from decouple import config
 
 DEBUG = False
 SECRET_KEY = config('SECRET_KEY', default='django-insecure-temporary-key')
 
+# ✅ ПУБЛИЧНЫЙ АДРЕС API (абсолютные ссылки в снимке главной и статическом экспорте).
+# Vercel сам задает адрес развертывания; явный PUBLIC_API_URL важнее
+VERCEL_HOST = config('VERCEL_PROJECT_PRODUCTION_URL', default='') or config('VERCEL_URL', default='')
+PUBLIC_API_URL = config('PUBLIC_API_URL', default=f'https://{VERCEL_HOST}' if VERCEL_HOST else PUBLIC_API_URL)
+
 # ✅ ALLOWED_HOSTS
 ALLOWED_HOSTS = [
     '.vercel.app',
     'localhost',
     '127.0.0.1',
 ]
+# Снимки и экспорт собирают запрос с хостом PUBLIC_API_URL (свой домен API)
+ALLOWED_HOSTS.append(urlsplit(PUBLIC_API_URL).hostname)
 
 # config/settings/production.py
 CORS_ALLOWED_ORIGINS = [
@@ -40,7 +49,7 @@ DATABASES = {
 # ✅ СТАТИЧЕСКИЕ ФАЙЛЫ - ОТКЛЮЧАЕМ ДЛЯ VERCEL
 STATIC_URL = '/static/'
 STATIC_ROOT = None
-STATICFILES_STORAGE = 'django.contrib.staticfiles.storage.StaticFilesStorage'
+STORAGES = {**STORAGES, 'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'}}
 
 # ✅ МЕДИА ФАЙЛЫ - ОТКЛЮЧАЕМ ДЛЯ VERCEL
 MEDIA_URL = '/media/'
@@ -76,4 +85,12 @@ LOGGING = {
         'handlers': ['console'],
         'level': 'INFO',
     },
+    'loggers': {
+        # Строки request_timing {...} от ServerTimingMiddleware
+        'apps.core.timing': {
+            'handlers': ['console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+    },
 }
\ No newline at end of file
@@ -0,0 +1,32 @@
+# config/settings/serverless.py
+# Профиль загрузки для Vercel (api/index.py): только то, что нужно API во время запроса
+from urllib.parse import urlsplit
+
+from django.core.exceptions import ImproperlyConfigured
+from .production import *
+from decouple import config
+
+# Не участвуют в обработке запросов: команды разработки, генерация схемы,
+# modeltranslation (поля *_en/_ru/_he объявлены вручную, translation.py нет)
+SERVERLESS_EXCLUDED_APPS = [
+    'django_extensions',
+    'drf_spectacular',
+    'modeltranslation',
+]
+
+# Админка: autodiscover импортирует admin.py всех приложений - включаем только по флагу
+SERVERLESS_ADMIN = config('SERVERLESS_ADMIN', default=False, cast=bool)
+if not SERVERLESS_ADMIN:
+    SERVERLESS_EXCLUDED_APPS.append('django.contrib.admin')
+
+INSTALLED_APPS = [app for app in INSTALLED_APPS if app not in SERVERLESS_EXCLUDED_APPS]
+
+# Схема drf_spectacular на Vercel не отдается
+REST_FRAMEWORK = {**REST_FRAMEWORK, 'DEFAULT_SCHEMA_CLASS': 'rest_framework.schemas.openapi.AutoSchema'}
+
+# Компилировать маршруты при загрузке функции, а не на первом запросе
+PRECOMPILE_URLS = config('PRECOMPILE_URLS', default=True, cast=bool)
+
+# Снимки главной собираются с адресом PUBLIC_API_URL: localhost попал бы в ссылки на изображения
+if urlsplit(PUBLIC_API_URL).hostname in ('localhost', '127.0.0.1'):
+    raise ImproperlyConfigured('PUBLIC_API_URL (или VERCEL_URL) должен быть публичным адресом API')
@@ -1,8 +1,11 @@
-from django.contrib import admin
+from django.apps import apps
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
 from django.http import JsonResponse
+from apps.core import feeds
+from apps.core.storage import serve_media
+from apps.core.views import search
 
 # ✅ HEALTH CHECK
 def health_check(request):
@@ -16,7 +19,11 @@ def api_root(request):
         "status": "active",
         "endpoints": {
             "health": "/api/health/",
+            "search": "/api/search/",
             "core": "/api/core/",
+            "homepage": "/api/core/homepage/",
+            "sitemap": "/sitemap.xml",
+            "feeds": "/feeds/<posts|projects>/<en|ru|he>.<rss|atom>",
             "accounts": "/api/accounts/",
             "portfolio": "/api/portfolio/",
             "blog": "/api/blog/",
@@ -28,13 +35,18 @@ def api_root(request):
     })
 
 urlpatterns = [
-    path('admin/', admin.site.urls),
-    
     # ✅ ГЛАВНАЯ СТРАНИЦА API
     path('', api_root, name='api_root'),
     
     # ✅ HEALTH CHECK
     path('api/health/', health_check, name='health_check'),
+    path('api/search/', search, name='search'),
+
+    # ✅ SITEMAP И ЛЕНТЫ
+    path('sitemap.xml', feeds.sitemap_index, name='sitemap'),
+    path('sitemap-pages.xml', feeds.sitemap_pages, name='sitemap_pages'),
+    path('sitemap-<str:section>-<int:shard>.xml', feeds.sitemap_section, name='sitemap_section'),
+    path('feeds/<str:section>/<str:language>.<str:kind>', feeds.feed, name='feed'),
     
     # ✅ ВАШИ API МАРШРУТЫ
     path('api/core/', include('apps.core.urls')),
@@ -45,7 +57,12 @@ urlpatterns = [
     path('api/analytics/', include('apps.analytics.urls')),
 ]
 
+# ✅ АДМИНКА (в serverless-профиле может быть отключена)
+if apps.is_installed('django.contrib.admin'):
+    from django.contrib import admin
+    urlpatterns.insert(0, path('admin/', admin.site.urls))
+
 # ✅ СТАТИЧЕСКИЕ ФАЙЛЫ (только для разработки)
 if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+    urlpatterns += static(settings.MEDIA_URL, view=serve_media, document_root=settings.MEDIA_ROOT)
     urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
\ No newline at end of file